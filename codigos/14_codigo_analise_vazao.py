@@ -1,32 +1,147 @@
-import csv
-from datetime import datetime
 import numpy as np # Importa a biblioteca NumPy para cálculos numéricos eficientes
 import matplotlib.pyplot as plt # Importa a biblioteca Matplotlib para gerar gráficos
 
-def ler_dados_vazao(nome_arquivo):
+FORMATO_TIMESTAMP = '%Y-%m-%d %H:%M:%S' # Formato fixo da primeira coluna (19 caracteres)
+LARGURA_TIMESTAMP = 19
+LARGURA_MAXIMA_VAZAO = 32 # Maior campo de vazão aceito (caracteres)
+
+def interpretar_bloco_vazao(bloco, primeira_linha=2):
+    """
+    Converte um bloco de linhas completas do CSV ('AAAA-MM-DD HH:MM:SS,vazao')
+    em arrays, sem laço do Python por linha.
+
+    O bloco é visto como um array de bytes: as posições das quebras de linha
+    dão o início de cada linha, os dígitos do timestamp (largura fixa) são
+    lidos por indexação e combinados em datetime64[s], e o campo de vazão é
+    copiado para uma matriz de bytes de largura fixa e convertido para
+    float64 de uma vez (astype).
+
+    Args:
+        bloco (bytes): Linhas completas, cada uma terminada por '\\n'.
+        primeira_linha (int, opcional): Número da primeira linha do bloco no arquivo (para mensagens de erro).
+
+    Returns:
+        tuple: (timestamps, vazoes), arrays datetime64[s] e float64.
+    """
+    dados = np.frombuffer(bloco, dtype=np.uint8)
+    fins = np.flatnonzero(dados == ord('\n'))
+    inicios = np.concatenate(([0], fins[:-1] + 1))
+    fins = fins - (dados[np.maximum(fins - 1, 0)] == ord('\r')) # Aceita quebras de linha do Windows
+    nao_vazias = fins > inicios
+    inicios, fins = inicios[nao_vazias], fins[nao_vazias]
+    numeros_linha = primeira_linha + np.flatnonzero(nao_vazias)
+    if len(inicios) == 0:
+        return np.array([], dtype='datetime64[s]'), np.array([], dtype=np.float64)
+
+    def erro(linhas_invalidas, motivo):
+        linha = int(numeros_linha[np.flatnonzero(linhas_invalidas)[0]])
+        return ValueError(f"linha {linha}: {motivo}")
+
+    if np.any(fins - inicios < LARGURA_TIMESTAMP + 2):
+        raise erro(fins - inicios < LARGURA_TIMESTAMP + 2, "linha incompleta (esperado 'AAAA-MM-DD HH:MM:SS,vazao')")
+
+    # Timestamp: matriz (n, 19) de caracteres, com separadores em posições fixas
+    caracteres = dados[inicios[:, None] + np.arange(LARGURA_TIMESTAMP + 1)]
+    separadores = {4: '-', 7: '-', 10: ' ', 13: ':', 16: ':', 19: ','}
+    posicoes_digitos = [i for i in range(LARGURA_TIMESTAMP) if i not in separadores]
+    digitos = caracteres[:, posicoes_digitos].astype(np.int64) - ord('0')
+    invalidas = np.any((digitos < 0) | (digitos > 9), axis=1)
+    for posicao, separador in separadores.items():
+        invalidas |= caracteres[:, posicao] != ord(separador)
+    if np.any(invalidas):
+        raise erro(invalidas, f"timestamp fora do formato '{FORMATO_TIMESTAMP}'")
+
+    def numero(primeiro, n_digitos):
+        valor = np.zeros(len(digitos), dtype=np.int64)
+        for i in range(primeiro, primeiro + n_digitos):
+            valor = 10 * valor + digitos[:, i]
+        return valor
+    ano, mes, dia = numero(0, 4), numero(4, 2), numero(6, 2)
+    hora, minuto, segundo = numero(8, 2), numero(10, 2), numero(12, 2)
+
+    meses = ((ano - 1970) * 12 + (mes - 1)).astype('datetime64[M]')
+    datas = meses.astype('datetime64[D]') + (dia - 1)
+    invalidas = (mes < 1) | (mes > 12) | (dia < 1) | (datas.astype('datetime64[M]') != meses) | \
+                (hora > 23) | (minuto > 59) | (segundo > 59)
+    if np.any(invalidas):
+        raise erro(invalidas, "data ou hora inexistente")
+    timestamps = datas.astype('datetime64[s]') + (hora * 3600 + minuto * 60 + segundo)
+
+    # Vazão: do fim do timestamp até a próxima vírgula (colunas extras são ignoradas) ou o fim da linha
+    inicio_vazao = inicios + LARGURA_TIMESTAMP + 1
+    virgulas = np.flatnonzero(dados == ord(','))
+    proximas = np.searchsorted(virgulas, inicio_vazao)
+    fim_vazao = np.minimum(fins, np.append(virgulas, len(dados))[proximas])
+    larguras = fim_vazao - inicio_vazao
+    if np.any(larguras > LARGURA_MAXIMA_VAZAO):
+        raise erro(larguras > LARGURA_MAXIMA_VAZAO, "campo de vazão muito longo")
+    largura = max(int(larguras.max()), 1)
+    colunas = np.arange(largura)
+    campos = np.where(colunas < larguras[:, None],
+                      dados[np.minimum(inicio_vazao[:, None] + colunas, len(dados) - 1)], 0).astype(np.uint8)
+    # Bytes nulos à direita são descartados pelo tipo 'S', então cada linha vira o texto do seu campo
+    texto_vazoes = campos.view(f'S{largura}').ravel()
+    try:
+        vazoes = texto_vazoes.astype(np.float64)
+    except ValueError:
+        invalidas = np.array([not _e_numero(texto) for texto in texto_vazoes])
+        raise erro(invalidas, f"vazão inválida: {texto_vazoes[invalidas][0].decode(errors='replace')!r}") from None
+    return timestamps, vazoes
+
+def _e_numero(texto):
+    """Indica se o texto (bytes) é convertível em float (apenas para localizar erros)."""
+    try:
+        float(texto)
+        return True
+    except ValueError:
+        return False
+
+def ler_dados_vazao(nome_arquivo, tamanho_bloco=2**23):
     """
     Lê dados de vazão de um arquivo CSV.
 
+    O arquivo é lido em blocos de tamanho_bloco bytes (terminados na última
+    quebra de linha completa) e cada bloco é convertido de forma vetorizada
+    por interpretar_bloco_vazao; a memória temporária fica limitada ao
+    tamanho do bloco, qualquer que seja o tamanho do arquivo.
+
     Args:
         nome_arquivo (str): O nome do arquivo CSV.
+        tamanho_bloco (int, opcional): Bytes lidos por vez (padrão: 8 MB).
 
     Returns:
-        tuple: Uma tupla contendo duas listas (timestamps, vazoes), ou (None, None) em caso de erro.
+        tuple: Uma tupla contendo dois arrays (timestamps em datetime64[s], vazoes em float64),
+        ou (None, None) em caso de erro.
     """
-    timestamps = []
-    vazoes = []
+    partes_timestamps, partes_vazoes = [], []
     try:
-        with open(nome_arquivo, 'r') as arquivo_csv:
-            leitor_csv = csv.reader(arquivo_csv)
-            next(leitor_csv)  # Pular o cabeçalho
-            for linha in leitor_csv:
-                timestamp_str = linha[0]
-                vazao = float(linha[1])
-                # Converte a string do timestamp para um objeto datetime
-                timestamp = datetime.strptime(timestamp_str, '%Y-%m-%d %H:%M:%S')
-                timestamps.append(timestamp)
-                vazoes.append(vazao)
-        return timestamps, vazoes
+        with open(nome_arquivo, 'rb') as arquivo_csv:
+            arquivo_csv.readline() # Pular o cabeçalho
+            proxima_linha = 2 # Número (no arquivo) da primeira linha do próximo bloco
+            resto = b''
+            while True:
+                bloco = arquivo_csv.read(tamanho_bloco)
+                if not bloco:
+                    if resto.strip(): # Última linha sem quebra de linha no fim
+                        resto += b'\n'
+                    else:
+                        break
+                else:
+                    bloco = resto + bloco
+                    ultima_quebra = bloco.rfind(b'\n')
+                    if ultima_quebra < 0: # Linha maior que o bloco: continua lendo
+                        resto = bloco
+                        continue
+                    bloco, resto = bloco[:ultima_quebra + 1], bloco[ultima_quebra + 1:]
+                if not bloco:
+                    bloco, resto = resto, b''
+                timestamps, vazoes = interpretar_bloco_vazao(bloco, proxima_linha)
+                partes_timestamps.append(timestamps)
+                partes_vazoes.append(vazoes)
+                proxima_linha += bloco.count(b'\n')
+        if not partes_vazoes:
+            return np.array([], dtype='datetime64[s]'), np.array([], dtype=np.float64)
+        return np.concatenate(partes_timestamps), np.concatenate(partes_vazoes)
     except FileNotFoundError:
         print(f"Erro: Arquivo não encontrado: {nome_arquivo}")
         return None, None
@@ -36,28 +151,28 @@ def ler_dados_vazao(nome_arquivo):
 
 def vazao_media(vazoes):
     """Calcula a vazão média de uma lista de vazões."""
-    if not vazoes:
+    if len(vazoes) == 0:
         return 0
     # Usa np.mean para calcular a média de forma eficiente
     return np.mean(vazoes)
 
 def vazao_desvio_padrao(vazoes):
     """Calcula o desvio padrão de uma lista de vazões."""
-    if not vazoes:
+    if len(vazoes) == 0:
         return 0
     # Usa np.std para calcular o desvio padrão de forma eficiente
     return np.std(vazoes)
 
 def vazao_mediana(vazoes):
     """Calcula a mediana de uma lista de vazões."""
-    if not vazoes:
+    if len(vazoes) == 0:
         return 0
     # Usa np.median para calcular a mediana de forma eficiente
     return np.median(vazoes)
 
 def vazao_maxima(timestamps, vazoes):
     """Encontra a vazão máxima e o timestamp em que ocorreu."""
-    if not vazoes:
+    if len(vazoes) == 0:
         return None, None
     # Encontra o índice da vazão máxima
     idx_max = np.argmax(vazoes)
@@ -65,7 +180,7 @@ def vazao_maxima(timestamps, vazoes):
 
 def vazao_minima(timestamps, vazoes):
     """Encontra a vazão mínima e o timestamp em que ocorreu."""
-    if not vazoes:
+    if len(vazoes) == 0:
         return None, None
     # Encontra o índice da vazão mínima
     idx_min = np.argmin(vazoes)
@@ -76,14 +191,14 @@ def gerar_grafico_vazao(timestamps, vazoes, media, desvio_padrao, maxima_vazao,
     Gera um gráfico da vazão versus tempo com estatísticas destacadas.
 
     Args:
-        timestamps (list): Lista de objetos datetime para o eixo X.
-        vazoes (list): Lista de valores de vazão para o eixo Y.
+        timestamps (array_like): Instantes (datetime64 ou datetime) para o eixo X.
+        vazoes (array_like): Valores de vazão para o eixo Y.
         media (float): Vazão média.
         desvio_padrao (float): Desvio padrão da vazão.
         maxima_vazao (float): Valor da vazão máxima.
-        maxima_tempo (datetime): Timestamp da vazão máxima.
+        maxima_tempo (datetime64): Timestamp da vazão máxima.
         minima_vazao (float): Valor da vazão mínima.
-        minima_tempo (datetime): Timestamp da vazão mínima.
+        minima_tempo (datetime64): Timestamp da vazão mínima.
     """
     plt.figure(figsize=(12, 6)) # Define o tamanho da figura do gráfico
     plt.plot(timestamps, vazoes, label='Vazão Medida', color='blue', alpha=0.7) # Plota a série temporal da vazão
@@ -94,9 +209,9 @@ def gerar_grafico_vazao(timestamps, vazoes, media, desvio_padrao, maxima_vazao,
     plt.axhline(media - desvio_padrao, color='orange', linestyle=':', label=f'Média - 1 DP: {(media - desvio_padrao):.2f} m³/h')
 
     # Marca os pontos de máximo e mínimo
-    if maxima_tempo and maxima_vazao is not None:
+    if maxima_tempo is not None and maxima_vazao is not None:
         plt.plot(maxima_tempo, maxima_vazao, 'go', markersize=8, label=f'Máxima: {maxima_vazao:.2f} m³/h') # 'go' para marcador verde em círculo
-    if minima_tempo and minima_vazao is not None:
+    if minima_tempo is not None and minima_vazao is not None:
         plt.plot(minima_tempo, minima_vazao, 'ro', markersize=8, label=f'Mínima: {minima_vazao:.2f} m³/h') # 'ro' para marcador vermelho em círculo
 
     # Configurações do gráfico
@@ -116,7 +231,7 @@ if __name__ == "__main__":
     # 1. Leitura do Arquivo CSV
     timestamps, vazoes = ler_dados_vazao(nome_do_arquivo)
 
-    if timestamps and vazoes: # Verifica se os dados foram lidos com sucesso
+    if timestamps is not None and len(vazoes) > 0: # Verifica se os dados foram lidos com sucesso
         # 2. Análise Estatística Avançada
         media = vazao_media(vazoes)
         desvio_padrao = vazao_desvio_padrao(vazoes)
@@ -1,12 +1,82 @@
 import numpy as np
-from scipy.integrate import odeint # Função para resolver EDOs
+from scipy.integrate import solve_ivp # Função para resolver EDOs (com detecção de eventos)
 import matplotlib.pyplot as plt
 import seaborn as sns
+from instrumentacao_solver import RelatorioSimulacao # Contadores do solver e tempo por fase
 
-def simular_descarga_tanque():
+# --- Solução Analítica (Lei de Torricelli) ---
+# Com A_T, A_o e C_d constantes, dh/dt = -c*sqrt(h), com c = A_o*C_d*sqrt(2g)/A_T,
+# tem solução exata: sqrt(h) decresce linearmente até o tanque esvaziar.
+# Os parâmetros podem ser escalares ou arrays (grades de projeto), combinados por
+# broadcasting do NumPy; o eixo do tempo fica por último no resultado.
+def altura_descarga_analitica(t, h0, A_T, A_o, C_d, g=9.81):
+    """
+    Altura exata do líquido durante a descarga:
+    h(t) = (sqrt(h0) - A_o*C_d*sqrt(2g)/(2*A_T) * t)^2 até o esvaziamento, e 0 depois.
+
+    Args:
+        t (float ou array_like): Tempo(s) (s).
+        h0, A_T, A_o, C_d, g (float ou array_like): Parâmetros do tanque.
+
+    Returns:
+        np.ndarray: Alturas (m), com forma broadcast(parâmetros) + forma de t.
+    """
+    t = np.asarray(t, dtype=float)
+    eixos_tempo = (...,) + (np.newaxis,) * t.ndim
+    h0, A_T, A_o, C_d, g = (np.asarray(p, dtype=float)[eixos_tempo] for p in (h0, A_T, A_o, C_d, g))
+    raiz_h = np.sqrt(np.maximum(h0, 0.0)) - A_o * C_d * np.sqrt(2 * g) / (2 * A_T) * t
+    return np.maximum(raiz_h, 0.0) ** 2
+
+def tempo_esvaziamento_analitico(h0, A_T, A_o, C_d, g=9.81, nivel=0.0):
+    """
+    Tempo exato (s) para o nível cair de h0 até 'nivel' (padrão: tanque vazio):
+    2*A_T*(sqrt(h0) - sqrt(nivel)) / (A_o*C_d*sqrt(2g)). Aceita arrays.
+    Se h0 já está abaixo de 'nivel', o tempo é zero.
+    """
+    return (2 * np.asarray(A_T) * np.maximum(np.sqrt(np.maximum(h0, 0.0)) - np.sqrt(nivel), 0.0)
+            / (np.asarray(A_o) * np.asarray(C_d) * np.sqrt(2 * np.asarray(g))))
+
+# --- Eventos ---
+def evento_nivel(nivel, terminal=True):
+    """
+    Função de evento do solve_ivp que se anula quando a altura cruza 'nivel'
+    descendo. O solver localiza a raiz (o instante exato do cruzamento) e,
+    se terminal, encerra a integração nesse instante.
+    """
+    def evento(t, y):
+        return y[0] - nivel
+    evento.direction = -1
+    evento.terminal = terminal
+    return evento
+
+def simular_descarga_tanque(tempo_max=200, n_pontos=200, relatorio=None, metodo='analitico', verificar=False,
+                            nivel_vazio=0.01, parar_no_evento=True):
     """
     Simula a descarga de um tanque cilíndrico usando uma EDO e visualiza os resultados.
+
+    Args:
+        tempo_max (float, opcional): Tempo máximo de simulação (s). Padrão é 200.
+        n_pontos (int, opcional): Número de pontos de tempo da solução. Padrão é 200.
+        relatorio (RelatorioSimulacao, opcional): Relatório onde registrar os
+            contadores do solver e o tempo de cada fase. Padrão: um novo.
+        metodo (str, opcional): 'analitico' (padrão) usa a solução exata de
+            Torricelli; 'numerico' integra a EDO com o solve_ivp, localizando
+            o esvaziamento com uma função de evento.
+        verificar (bool, opcional): Se True, confere a solução numérica com a
+            exata e imprime os desvios da altura e do tempo de esvaziamento.
+        nivel_vazio (float, opcional): Altura (m) a partir da qual o tanque é
+            considerado vazio. Padrão é 0.01.
+        parar_no_evento (bool, opcional): Se True (padrão), a simulação termina
+            no instante em que o tanque esvazia, em vez de seguir até tempo_max.
+
+    Returns:
+        RelatorioSimulacao: Estatísticas do solver e tempos das fases
+        (integrar, derivar, plotar, tabular).
     """
+    if metodo not in ('analitico', 'numerico'):
+        raise ValueError(f"Método desconhecido: {metodo!r} (use 'analitico' ou 'numerico').")
+    if relatorio is None:
+        relatorio = RelatorioSimulacao('descarga_tanque')
     print("--- 9.2. Equações Diferenciais Ordinárias (EDOs) ---")
     print("\n--- Exemplo: Descarga de um Tanque Cilíndrico ---")
 
@@ -30,39 +100,78 @@ def simular_descarga_tanque():
 
     # --- 3. Definir Condições Iniciais e Intervalo de Tempo ---
     h0 = 2.0        # Altura inicial do líquido no tanque (m)
-    tempo_max = 200 # Tempo máximo de simulação (s)
     # Array de pontos de tempo onde queremos a solução da EDO
-    t = np.linspace(0, tempo_max, 200) # 200 pontos entre 0 e tempo_max
+    t = np.linspace(0, tempo_max, n_pontos) # n_pontos pontos entre 0 e tempo_max
 
-    # --- 4. Resolver a EDO Numericamente usando odeint ---
-    # odeint(funcao_edo, condicao_inicial, array_de_tempos, args=(parametros_da_funcao_edo))
-    # Retorna um array com a solução para a variável de estado em cada ponto de tempo
-    solucao_h = odeint(dHdt, h0, t, args=(A_T, A_o, C_d, g))
+    # --- 4. Resolver a EDO (solução exata ou numérica usando solve_ivp) ---
+    # Cada método devolve os tempos, as alturas e os instantes em que o nível
+    # cruzou nivel_vazio (evento). O solve_ivp espera f(t, y) e devolve os
+    # pontos de t_eval até o fim da integração (ou até o evento terminal).
+    def resolver_numerico(registro):
+        dHdt_contada = registro.contar_chamadas(dHdt)
+        resultado = solve_ivp(lambda t_atual, y: [dHdt_contada(y[0], t_atual, A_T, A_o, C_d, g)],
+                              (0, tempo_max), [h0], method='LSODA', t_eval=t, rtol=1e-12, atol=1e-14,
+                              events=evento_nivel(nivel_vazio, terminal=parar_no_evento))
+        registro.registrar_solve_ivp(resultado)
+        return resultado.t, resultado.y[0], resultado.t_events[0]
 
-    # odeint retorna um array 2D, mesmo para uma única variável.
-    # Precisamos extrair a primeira coluna para ter o array de alturas.
-    alturas = solucao_h[:, 0]
+    def resolver_analitico(registro):
+        # Sem solver (nada a registrar): o instante do evento também é exato
+        t_evento = tempo_esvaziamento_analitico(h0, A_T, A_o, C_d, g, nivel=nivel_vazio)
+        tempos_evento = np.array([t_evento] if t_evento <= tempo_max else [])
+        return t, altura_descarga_analitica(t, h0, A_T, A_o, C_d, g), tempos_evento
 
-    # Garantir que a altura não seja negativa (pode acontecer por aproximação numérica)
-    alturas[alturas < 0] = 0
+    resolver = resolver_analitico if metodo == 'analitico' else resolver_numerico
+    with relatorio.fase('integrar'):
+        t_solucao, alturas, tempos_evento = resolver(relatorio)
+    if verificar:
+        # A verificação usa um relatório à parte, para não misturar as estatísticas do solver
+        with relatorio.fase('verificar'):
+            if metodo == 'numerico':
+                t_numerico, alturas_numerico, eventos_numerico = t_solucao, alturas, tempos_evento
+            else:
+                t_numerico, alturas_numerico, eventos_numerico = resolver_numerico(RelatorioSimulacao('verificacao'))
+            desvio = np.max(np.abs(alturas_numerico - altura_descarga_analitica(t_numerico, h0, A_T, A_o, C_d, g)))
+            desvio_evento = np.max(np.abs(eventos_numerico - tempo_esvaziamento_analitico(h0, A_T, A_o, C_d, g,
+                                                                                          nivel=nivel_vazio)),
+                                   initial=0.0)
+        print(f"Desvio máximo entre a solução exata e a numérica: {desvio:.2e} m "
+              f"(tempo de esvaziamento: {desvio_evento:.2e} s)")
+
+    with relatorio.fase('derivar'):
+        # Garantir que a altura não seja negativa (pode acontecer por aproximação numérica)
+        alturas[alturas < 0] = 0
+
+        # O tempo de esvaziamento é o instante do evento, localizado pelo solver (ou exato)
+        if len(tempos_evento) > 0:
+            tempo_esvaziamento = f"{tempos_evento[0]:.2f} s"
+            if parar_no_evento:
+                # A curva termina no instante do evento
+                antes = t_solucao < tempos_evento[0]
+                t_solucao = np.append(t_solucao[antes], tempos_evento[0])
+                alturas = np.append(alturas[antes], nivel_vazio)
+        else:
+            tempo_esvaziamento = "Não esvaziou completamente"
 
     # --- 5. Visualizar a Curva da Altura do Líquido ---
-    sns.set_style("whitegrid")
-    plt.figure(figsize=(10, 6))
-    plt.plot(t, alturas, label='Altura do Líquido (h)', color='blue', linewidth=2)
-    plt.xlabel('Tempo (s)')
-    plt.ylabel('Altura (m)')
-    plt.title('Descarga de um Tanque Cilíndrico')
-    plt.legend()
-    plt.grid(True)
-    plt.show()
-
-    print("\n--- Resultados da Simulação ---")
-    print(f"Altura inicial: {h0:.2f} m")
-    print(f"Altura final (após {tempo_max} s): {alturas[-1]:.2f} m")
-    # Encontrar o tempo aproximado para esvaziar o tanque
-    tempo_esvaziamento = t[np.where(alturas <= 0.01)[0][0]] if np.any(alturas <= 0.01) else "Não esvaziou completamente"
-    print(f"Tempo aproximado para esvaziamento: {tempo_esvaziamento} s")
+    with relatorio.fase('plotar'):
+        sns.set_style("whitegrid")
+        plt.figure(figsize=(10, 6))
+        plt.plot(t_solucao, alturas, label='Altura do Líquido (h)', color='blue', linewidth=2)
+        plt.xlabel('Tempo (s)')
+        plt.ylabel('Altura (m)')
+        plt.title('Descarga de um Tanque Cilíndrico')
+        plt.legend()
+        plt.grid(True)
+        plt.show()
+
+    with relatorio.fase('tabular'):
+        print("\n--- Resultados da Simulação ---")
+        print(f"Altura inicial: {h0:.2f} m")
+        print(f"Altura final (após {t_solucao[-1]:.2f} s): {alturas[-1]:.2f} m")
+        print(f"Tempo para esvaziamento (h = {nivel_vazio} m): {tempo_esvaziamento}")
+
+    return relatorio
 
 
 # --- Execução do Exemplo ---
@@ -1,13 +1,72 @@
+import time # Para medir o tempo de simulação das redes de reações
 import numpy as np
-from scipy.integrate import odeint
+from scipy import sparse # Matrizes esparsas (estequiometria e Jacobiano)
+from scipy.linalg import expm # Exponencial de matriz (propagador exato)
+from scipy.integrate import odeint, solve_ivp
 import matplotlib.pyplot as plt
 import seaborn as sns
+from instrumentacao_solver import RelatorioSimulacao # Contadores do solver e tempo por fase
 
-def simular_cstr():
+# --- Solução Analítica do CSTR Linear ---
+# A EDO dCA/dt = (Q/V)*(CA_entrada - CA) - k*CA é linear; com CA_entrada constante
+# por partes, a solução exata é a soma (superposição) das respostas a cada degrau.
+# Os parâmetros podem ser escalares ou arrays (grades de projeto), combinados por
+# broadcasting do NumPy; o eixo do tempo fica por último no resultado.
+def concentracao_cstr_analitica(t, CA0, V, Q, k, instantes_entrada=(0.0,), valores_entrada=(1.0,)):
+    """
+    Concentração exata de A no CSTR com reação de primeira ordem.
+
+    CA_entrada vale valores_entrada[i] a partir de instantes_entrada[i] (e
+    zero antes do primeiro instante). Com a = Q/V + k, cada degrau de
+    amplitude d em t_i soma (Q/V)/a * d * (1 - exp(-a*(t - t_i))) para
+    t >= t_i, e a condição inicial decai como CA0*exp(-a*t).
+
+    Args:
+        t (float ou array_like): Tempo(s) (min).
+        CA0, V, Q, k (float ou array_like): Condição inicial e parâmetros do CSTR.
+        instantes_entrada (sequence, opcional): Instantes das mudanças de CA_entrada (min).
+        valores_entrada (sequence, opcional): Valores de CA_entrada (mol/L).
+
+    Returns:
+        np.ndarray: Concentrações (mol/L), com forma broadcast(parâmetros) + forma de t.
+    """
+    t = np.asarray(t, dtype=float)
+    eixos_tempo = (...,) + (np.newaxis,) * t.ndim
+    CA0, V, Q, k = (np.asarray(p, dtype=float)[eixos_tempo] for p in (CA0, V, Q, k))
+    a = Q / V + k
+    ganho = (Q / V) / a # Ganho estacionário: CA_regime = ganho * CA_entrada
+
+    CA = CA0 * np.exp(-a * t)
+    valor_anterior = 0.0
+    for t_i, valor in zip(instantes_entrada, valores_entrada):
+        # -expm1(-x) = 1 - exp(-x), sem perda de precisão para x pequeno; vale 0 antes de t_i
+        CA = CA + ganho * (valor - valor_anterior) * -np.expm1(-a * np.maximum(t - t_i, 0.0))
+        valor_anterior = valor
+    return CA
+
+def simular_cstr(tempo_max=100, n_pontos=200, relatorio=None, metodo='analitico', verificar=False):
     """
     Simula a dinâmica de um Reator Tanque Agitado Contínuo (CSTR)
     com uma reação de primeira ordem e visualiza a concentração ao longo do tempo.
+
+    Args:
+        tempo_max (float, opcional): Tempo máximo de simulação (min). Padrão é 100.
+        n_pontos (int, opcional): Número de pontos de tempo da solução. Padrão é 200.
+        relatorio (RelatorioSimulacao, opcional): Relatório onde registrar os
+            contadores do solver e o tempo de cada fase. Padrão: um novo.
+        metodo (str, opcional): 'analitico' (padrão) usa a solução exata do
+            CSTR linear; 'numerico' integra a EDO com o odeint.
+        verificar (bool, opcional): Se True, resolve também pelo outro método
+            e imprime o maior desvio entre as duas soluções.
+
+    Returns:
+        RelatorioSimulacao: Estatísticas do odeint e tempos das fases
+        (integrar, derivar, plotar, tabular).
     """
+    if metodo not in ('analitico', 'numerico'):
+        raise ValueError(f"Método desconhecido: {metodo!r} (use 'analitico' ou 'numerico').")
+    if relatorio is None:
+        relatorio = RelatorioSimulacao('cstr')
     print("--- 9.3. Simulações de Tanques, Reatores e Processos Dinâmicos ---")
     print("\n--- Exemplo: CSTR com Reação de Primeira Ordem ---")
 
@@ -32,51 +91,441 @@ def simular_cstr():
 
     # --- 3. Definir a Condição Inicial e o Intervalo de Tempo ---
     CA0 = 0.0       # Concentração inicial de A no reator (mol/L)
-    tempo_max = 100 # Tempo máximo de simulação (min)
-    t = np.linspace(0, tempo_max, 200) # 200 pontos de tempo para a solução
+    t = np.linspace(0, tempo_max, n_pontos) # n_pontos pontos de tempo para a solução
 
     # Definir a função para a concentração de entrada (CA_entrada)
     # Vamos simular uma mudança de CA_entrada de 1.0 para 5.0 mol/L em t=20 min
+    t_degrau = 20.0 # Instante da mudança (min)
+    CA_entrada_inicial = 1.0 # Concentração inicial de entrada (mol/L)
+    CA_entrada_nova = 5.0 # Nova concentração de entrada após t_degrau (mol/L)
+
     def CA_entrada_funcao(tempo_atual):
-        if tempo_atual < 20:
-            return 1.0 # Concentração inicial de entrada
+        if tempo_atual < t_degrau:
+            return CA_entrada_inicial
         else:
-            return 5.0 # Nova concentração de entrada após 20 min
+            return CA_entrada_nova
 
-    # --- 4. Resolver a EDO Numericamente usando odeint ---
+    # --- 4. Resolver a EDO (solução exata ou numérica usando odeint) ---
     # Passamos a função CA_entrada_funcao como um dos argumentos da EDO
-    solucao_CA = odeint(dCAdt, CA0, t, args=(V, Q, k, CA_entrada_funcao))
+    # (full_output=True devolve também as estatísticas do solver)
+    def resolver_numerico(registro):
+        solucao, info = odeint(registro.contar_chamadas(dCAdt), CA0, t,
+                               args=(V, Q, k, CA_entrada_funcao), full_output=True)
+        registro.registrar_odeint(info)
+        return solucao
 
-    # odeint retorna um array 2D, extraímos a primeira coluna para a concentração
-    concentracoes = solucao_CA[:, 0]
+    def resolver_analitico(registro):
+        # Sem solver (nada a registrar); mesmo formato do retorno do odeint: uma coluna por variável
+        return concentracao_cstr_analitica(t, CA0, V, Q, k, instantes_entrada=(0.0, t_degrau),
+                                           valores_entrada=(CA_entrada_inicial, CA_entrada_nova))[:, np.newaxis]
+
+    resolver, conferir = ((resolver_analitico, resolver_numerico) if metodo == 'analitico'
+                          else (resolver_numerico, resolver_analitico))
+    with relatorio.fase('integrar'):
+        solucao_CA = resolver(relatorio)
+    if verificar:
+        # A verificação usa um relatório à parte, para não misturar as estatísticas do solver
+        with relatorio.fase('verificar'):
+            desvio = np.max(np.abs(conferir(RelatorioSimulacao('verificacao')) - solucao_CA))
+        print(f"Desvio máximo entre a solução exata e o odeint: {desvio:.2e} mol/L")
+
+    with relatorio.fase('derivar'):
+        # odeint retorna um array 2D, extraímos a primeira coluna para a concentração
+        concentracoes = solucao_CA[:, 0]
+
+        # Criamos um array de CA_entrada correspondente aos tempos de simulação
+        CA_entrada_plot = np.array([CA_entrada_funcao(ti) for ti in t])
+
+        # Concentração de regime após a mudança
+        # (assumindo que o regime final é CA_entrada_final / (1 + k*V/Q))
+        CA_entrada_final = CA_entrada_funcao(tempo_max)
+        CA_regime_final = CA_entrada_final / (1 + k * V / Q)
 
     # --- 5. Visualizar a Curva da Concentração ---
-    sns.set_style("whitegrid")
-    plt.figure(figsize=(10, 6))
-
-    # Plotar a concentração no reator
-    plt.plot(t, concentracoes, label='Concentração de A no Reator', color='blue', linewidth=2)
-
-    # Plotar a concentração de entrada para contextualizar a mudança
-    # Criamos um array de CA_entrada correspondente aos tempos de simulação
-    CA_entrada_plot = np.array([CA_entrada_funcao(ti) for ti in t])
-    plt.plot(t, CA_entrada_plot, label='Concentração de A na Entrada', color='red', linestyle='--', linewidth=1.5)
-
-    plt.xlabel('Tempo (min)')
-    plt.ylabel('Concentração de A (mol/L)')
-    plt.title('Dinâmica da Concentração de A em um CSTR')
-    plt.legend()
-    plt.grid(True)
-    plt.show()
-
-    print("\n--- Resultados da Simulação ---")
-    print(f"Concentração inicial no reator: {CA0:.2f} mol/L")
-    print(f"Concentração final no reator (após {tempo_max} min): {concentracoes[-1]:.2f} mol/L")
-    # Encontrar o tempo para atingir 95% da nova concentração de regime
-    # (assumindo que o regime final é CA_entrada_final / (1 + k*V/Q))
-    CA_entrada_final = CA_entrada_funcao(tempo_max)
-    CA_regime_final = CA_entrada_final / (1 + k * V / Q)
-    print(f"Concentração de regime permanente esperada (após mudança): {CA_regime_final:.2f} mol/L")
+    with relatorio.fase('plotar'):
+        sns.set_style("whitegrid")
+        plt.figure(figsize=(10, 6))
+
+        # Plotar a concentração no reator
+        plt.plot(t, concentracoes, label='Concentração de A no Reator', color='blue', linewidth=2)
+
+        # Plotar a concentração de entrada para contextualizar a mudança
+        plt.plot(t, CA_entrada_plot, label='Concentração de A na Entrada', color='red', linestyle='--', linewidth=1.5)
+
+        plt.xlabel('Tempo (min)')
+        plt.ylabel('Concentração de A (mol/L)')
+        plt.title('Dinâmica da Concentração de A em um CSTR')
+        plt.legend()
+        plt.grid(True)
+        plt.show()
+
+    with relatorio.fase('tabular'):
+        print("\n--- Resultados da Simulação ---")
+        print(f"Concentração inicial no reator: {CA0:.2f} mol/L")
+        print(f"Concentração final no reator (após {tempo_max} min): {concentracoes[-1]:.2f} mol/L")
+        print(f"Concentração de regime permanente esperada (após mudança): {CA_regime_final:.2f} mol/L")
+
+    return relatorio
+
+# --- CSTR com Rede de Reações (Múltiplas Espécies) ---
+class RedeReacoesCSTR:
+    """
+    CSTR isotérmico com uma rede de reações entre n_especies espécies:
+
+        dC/dt = (Q/V) * (C_entrada - C) + N @ r(C)
+
+    N é a matriz estequiométrica esparsa (n_especies x n_reacoes; negativa
+    para reagentes, positiva para produtos) e r o vetor das taxas por lei de
+    ação das massas, r_j = k_j * prod_i C_i ** a_ji, com as ordens a_ji em
+    uma matriz esparsa (n_reacoes x n_especies).
+
+    Cada reação tem poucos reagentes, então as ordens são guardadas em uma
+    tabela (n_reacoes x m), com m o maior número de reagentes de uma reação
+    (posições vazias com ordem 0). Todas as taxas saem de uma única
+    operação vetorizada sobre essa tabela, e o Jacobiano analítico
+    J = -(Q/V)*I + N @ dr/dC é montado esparso, com o mesmo padrão das ordens.
+    O custo por avaliação cresce linearmente com o tamanho da rede.
+    """
+
+    def __init__(self, estequiometria, ordens, k, V, Q, C_entrada):
+        """
+        Args:
+            estequiometria (sparse ou array_like): Matriz N (n_especies x n_reacoes).
+            ordens (sparse ou array_like): Ordens das reações (n_reacoes x n_especies).
+            k (array_like): Constantes de velocidade (uma por reação).
+            V (float): Volume do reator (L).
+            Q (float): Vazão volumétrica (L/min).
+            C_entrada (array_like): Concentrações na alimentação (mol/L).
+        """
+        self.estequiometria = sparse.csr_matrix(estequiometria, dtype=float)
+        self.ordens = sparse.csr_matrix(ordens, dtype=float)
+        self.ordens.sort_indices()
+        self.n_especies, self.n_reacoes = self.estequiometria.shape
+        if self.ordens.shape != (self.n_reacoes, self.n_especies):
+            raise ValueError(f"A matriz de ordens deve ter forma {(self.n_reacoes, self.n_especies)}.")
+        self.k = np.broadcast_to(np.asarray(k, dtype=float), (self.n_reacoes,))
+        self.V, self.Q = V, Q
+        self.C_entrada = np.broadcast_to(np.asarray(C_entrada, dtype=float), (self.n_especies,))
+
+        # Tabela (n_reacoes x m) das espécies e ordens de cada reação, na ordem do CSR
+        por_reacao = np.diff(self.ordens.indptr)
+        linhas = np.repeat(np.arange(self.n_reacoes), por_reacao)
+        posicoes = np.arange(self.ordens.nnz) - self.ordens.indptr[linhas]
+        largura = max(int(por_reacao.max(initial=0)), 1)
+        self._especies = np.zeros((self.n_reacoes, largura), dtype=int)
+        self._ordens = np.zeros((self.n_reacoes, largura))
+        self._especies[linhas, posicoes] = self.ordens.indices
+        self._ordens[linhas, posicoes] = self.ordens.data
+        self._ocupadas = np.zeros((self.n_reacoes, largura), dtype=bool)
+        self._ocupadas[linhas, posicoes] = True # Em ordem de linha: a mesma ordem dos dados do CSR
+
+        self._diluicao = sparse.identity(self.n_especies, format='csr') * (Q / V)
+
+    @classmethod
+    def de_reacoes(cls, especies, reacoes, V, Q, C_entrada, T=25.0):
+        """
+        Monta a rede a partir de uma lista de reações legível.
+
+        Args:
+            especies (list): Nomes das espécies (definem a ordem do vetor C).
+            reacoes (list): Dicionários com 'reagentes' e 'produtos'
+                ({especie: coeficiente}), a constante 'k' (ou 'k0' e 'Ea_R',
+                para Arrhenius na temperatura T) e, opcionalmente, 'ordens'
+                ({especie: ordem}; padrão: os coeficientes dos reagentes).
+            V, Q (float): Volume (L) e vazão (L/min).
+            C_entrada (dict): Concentrações na alimentação ({especie: mol/L}).
+            T (float, opcional): Temperatura do reator (°C). Padrão é 25.
+        """
+        indice = {nome: i for i, nome in enumerate(especies)}
+        N = sparse.lil_matrix((len(especies), len(reacoes)))
+        ordens = sparse.lil_matrix((len(reacoes), len(especies)))
+        k = np.empty(len(reacoes))
+        for j, reacao in enumerate(reacoes):
+            for nome, coeficiente in reacao.get('reagentes', {}).items():
+                N[indice[nome], j] -= coeficiente
+            for nome, coeficiente in reacao.get('produtos', {}).items():
+                N[indice[nome], j] += coeficiente
+            for nome, ordem in reacao.get('ordens', reacao.get('reagentes', {})).items():
+                ordens[j, indice[nome]] = ordem
+            k[j] = reacao['k'] if 'k' in reacao else reacao['k0'] * np.exp(-reacao['Ea_R'] / (T + 273.15))
+        C_alimentacao = np.zeros(len(especies))
+        for nome, valor in C_entrada.items():
+            C_alimentacao[indice[nome]] = valor
+        return cls(N, ordens, k, V, Q, C_alimentacao)
+
+    def _fatores(self, C):
+        """Fatores C_i ** a_ji da tabela de reações (posições vazias valem 1)."""
+        return np.maximum(C, 0.0)[self._especies] ** self._ordens
+
+    def taxas(self, C):
+        """Taxas de todas as reações (mol/L.min), de uma vez."""
+        return self.k * self._fatores(C).prod(axis=1)
+
+    def odes(self, t, C):
+        """EDOs de todas as espécies (formato do solve_ivp)."""
+        return (self.Q / self.V) * (self.C_entrada - C) + self.estequiometria @ self.taxas(C)
+
+    def jacobiano(self, t, C):
+        """Jacobiano analítico esparso (n_especies x n_especies) das EDOs."""
+        C_positiva = np.maximum(C, 0.0)
+        fatores = self._fatores(C)
+        # Derivada de cada fator: a * C ** (a - 1) (zero nas posições vazias e onde C < 0,
+        # em que o fator max(C, 0) ** a é constante). Com ordem fracionária (a < 1) a
+        # derivada é infinita em C = 0 e também é zerada: C ** (a - 1) não é calculado ali
+        C_reacoes = C[self._especies]
+        derivadas = np.zeros_like(fatores)
+        np.power(C_positiva[self._especies], self._ordens - 1, out=derivadas,
+                 where=(self._ordens > 0) & ((C_reacoes > 0) | ((C_reacoes == 0) & (self._ordens >= 1))))
+        derivadas *= self._ordens
+
+        # Produto dos demais fatores de cada reação (prefixos x sufixos), sem divisão por C
+        outros = np.ones_like(fatores)
+        outros[:, 1:] = np.cumprod(fatores[:, :-1], axis=1)
+        sufixos = np.ones_like(fatores)
+        sufixos[:, :-1] = np.cumprod(fatores[:, :0:-1], axis=1)[:, ::-1]
+        outros *= sufixos
+
+        valores = (self.k[:, np.newaxis] * derivadas * outros)[self._ocupadas]
+        dr_dC = sparse.csr_matrix((valores, self.ordens.indices, self.ordens.indptr), shape=self.ordens.shape)
+        return (self.estequiometria @ dr_dC - self._diluicao).tocsc()
+
+    def simular(self, C0=None, tempo_max=100, n_pontos=200, metodo='BDF', jacobiano_analitico=True):
+        """
+        Integra a rede com um método rígido do solve_ivp.
+
+        Args:
+            C0 (array_like, opcional): Concentrações iniciais. Padrão: zero.
+            jacobiano_analitico (bool, opcional): Se False, o solver estima
+                o Jacobiano denso por diferenças finitas (apenas para comparação).
+
+        Returns:
+            tuple: (t, concentracoes, estatisticas), com concentracoes
+            (n_pontos, n_especies).
+        """
+        C0 = np.zeros(self.n_especies) if C0 is None else np.asarray(C0, dtype=float)
+        t = np.linspace(0, tempo_max, n_pontos)
+        opcoes = {'jac': self.jacobiano} if jacobiano_analitico else {}
+        resultado = solve_ivp(self.odes, (0, tempo_max), C0, method=metodo, t_eval=t,
+                              rtol=1e-6, atol=1e-9, **opcoes)
+        if not resultado.success:
+            raise RuntimeError(f"Falha do solver {metodo}: {resultado.message}")
+        estatisticas = {'nfe': int(resultado.nfev), 'nje': int(resultado.njev), 'nlu': int(resultado.nlu)}
+        return t, resultado.y.T, estatisticas
+
+def gerar_rede_aleatoria(n_especies, n_reacoes=None, semente=0, V=100.0, Q=10.0, vizinhanca=10):
+    """
+    Gera uma rede de reações aleatória para testes de escala: cada reação
+    tem um ou dois reagentes (ação das massas) e no máximo tantos produtos
+    quanto reagentes (nenhuma reação cria mols, então as concentrações ficam
+    limitadas), com constantes de velocidade espalhadas por cinco décadas
+    (sistema rígido).
+    Os participantes de cada reação são sorteados entre 'vizinhanca'
+    espécies consecutivas (acoplamento local, como em cadeias de reações),
+    o que limita o preenchimento da fatoração LU do Jacobiano esparso.
+    As três primeiras espécies são alimentadas com 1 mol/L.
+    """
+    rng = np.random.default_rng(semente)
+    n_reacoes = 2 * n_especies if n_reacoes is None else n_reacoes
+    linhas, colunas, coeficientes = [], [], []
+    ordens_linhas, ordens_colunas = [], []
+    for j in range(n_reacoes):
+        n_reagentes = rng.integers(1, 3)
+        n_produtos = rng.integers(1, n_reagentes + 1) # Nenhuma reação aumenta o número de mols
+        largura = min(vizinhanca, n_especies)
+        primeira = rng.integers(0, n_especies - largura + 1)
+        participantes = primeira + rng.choice(largura, size=n_reagentes + n_produtos, replace=False)
+        reagentes, produtos = participantes[:n_reagentes], participantes[n_reagentes:]
+        linhas += list(participantes)
+        colunas += [j] * len(participantes)
+        coeficientes += [-1.0] * n_reagentes + [1.0] * n_produtos
+        ordens_linhas += [j] * n_reagentes
+        ordens_colunas += list(reagentes)
+    N = sparse.csr_matrix((coeficientes, (linhas, colunas)), shape=(n_especies, n_reacoes))
+    ordens = sparse.csr_matrix((np.ones(len(ordens_linhas)), (ordens_linhas, ordens_colunas)),
+                               shape=(n_reacoes, n_especies))
+    k = 10.0 ** rng.uniform(-2, 3, n_reacoes)
+    C_entrada = np.zeros(n_especies)
+    C_entrada[:3] = 1.0
+    return RedeReacoesCSTR(N, ordens, k, V, Q, C_entrada)
+
+def comparar_escala_rede_reacoes(tamanhos=(50, 100, 200, 400), tempo_max=1000, limite_denso=200,
+                                 concentracao_inicial=1.0):
+    """
+    Mede o tempo de simulação de redes aleatórias com n espécies e 2n
+    reações, com o Jacobiano analítico esparso e (até limite_denso
+    espécies) com o Jacobiano denso por diferenças finitas.
+
+    O reator parte carregado (todas as espécies em concentracao_inicial),
+    então as reações de segunda ordem tornam o transitório não linear e o
+    solver precisa reavaliar o Jacobiano ao longo da simulação; partindo
+    do reator vazio, a rede é quase linear e um único Jacobiano basta.
+    """
+    print("--- Escala da Simulação de Redes de Reações em um CSTR ---")
+    resultados = []
+    for n in tamanhos:
+        rede = gerar_rede_aleatoria(n)
+        C0 = np.full(n, concentracao_inicial)
+        for analitico in (True, False):
+            if not analitico and n > limite_denso:
+                continue
+            inicio = time.perf_counter()
+            _, concentracoes, estatisticas = rede.simular(C0, tempo_max=tempo_max, jacobiano_analitico=analitico)
+            duracao = time.perf_counter() - inicio
+            rotulo = 'esparso' if analitico else 'denso (dif. finitas)'
+            resultados.append((n, rotulo, duracao, estatisticas))
+            print(f"n = {n:4d} | {rotulo:>20}: {duracao:8.3f} s | Avaliações das EDOs: {estatisticas['nfe']:6d} | "
+                  f"Jacobianos: {estatisticas['nje']:4d}")
+    return resultados
+
+# --- Propagador Exato para CSTRs Lineares (Exponencial de Matriz) ---
+class PropagadorLinear:
+    """
+    Propagador exato de um sistema linear dx/dt = A x + B u(t) com entrada u
+    constante por partes, em uma malha uniforme de passo 'passo'.
+
+    Em um passo com entrada constante, a solução exata é
+    x(t + dt) = Phi x(t) + Gamma u, com Phi = expm(A dt) e
+    Gamma = integral de 0 a dt de expm(A s) B ds; ambas saem de uma única
+    exponencial da matriz aumentada [[A, B], [0, 0]] * dt. Não há erro de
+    truncamento: o resultado só tem o arredondamento do produto matriz-vetor.
+
+    Para avançar muitos passos sem um laço do Python por passo, as
+    potências Phi^j e as somas G_j = (I + Phi + ... + Phi^(j-1)) Gamma são
+    pré-calculadas para j = 0..tamanho_bloco; cada bloco de passos com a
+    mesma entrada é então um único produto vetorizado
+    X[j] = Phi^j x + G_j u. O passo em que a entrada muda (fora da malha) é
+    dividido nos sub-intervalos entre as mudanças, com as matrizes parciais
+    calculadas uma vez por mudança.
+    """
+
+    def __init__(self, A, B, passo, tamanho_bloco=None):
+        """
+        Args:
+            A (array_like): Matriz do sistema (n x n).
+            B (array_like): Matriz de entrada (n x m).
+            passo (float): Passo da malha uniforme.
+            tamanho_bloco (int, opcional): Passos por bloco vetorizado.
+                Padrão: até 1024, limitado a cerca de 8 MB de potências.
+        """
+        self.A = np.atleast_2d(np.asarray(A, dtype=float))
+        self.B = np.asarray(B, dtype=float).reshape(len(self.A), -1)
+        self.passo = passo
+        n = len(self.A)
+        if tamanho_bloco is None:
+            tamanho_bloco = int(np.clip(2**20 // (n * (n + self.B.shape[1])), 16, 1024))
+        self.tamanho_bloco = tamanho_bloco
+
+        self.Phi, self.Gamma = self.discretizar(passo)
+        self._potencias = np.empty((tamanho_bloco + 1, n, n))
+        self._entradas = np.empty((tamanho_bloco + 1, n, self.B.shape[1]))
+        self._potencias[0] = np.eye(n)
+        self._entradas[0] = 0.0
+        for j in range(tamanho_bloco):
+            self._potencias[j + 1] = self.Phi @ self._potencias[j]
+            self._entradas[j + 1] = self.Phi @ self._entradas[j] + self.Gamma
+
+    def discretizar(self, intervalo):
+        """(Phi, Gamma) exatos de um intervalo com entrada constante."""
+        n, m = self.B.shape
+        aumentada = np.zeros((n + m, n + m))
+        aumentada[:n, :n] = self.A
+        aumentada[:n, n:] = self.B
+        exponencial = expm(aumentada * intervalo)
+        return exponencial[:n, :n], exponencial[:n, n:]
+
+    def _avancar_constante(self, X, k0, n_passos, u):
+        """Preenche X[k0+1 .. k0+n_passos] a partir de X[k0] com a entrada u constante."""
+        feitos = 0
+        while feitos < n_passos:
+            tamanho = min(self.tamanho_bloco, n_passos - feitos)
+            k = k0 + feitos
+            X[k + 1:k + tamanho + 1] = self._potencias[1:tamanho + 1] @ X[k] + self._entradas[1:tamanho + 1] @ u
+            feitos += tamanho
+
+    def propagar(self, x0, n_passos, instantes_entrada=(0.0,), valores_entrada=(0.0,)):
+        """
+        Avança o estado n_passos passos a partir de t = 0.
+
+        Args:
+            x0 (array_like): Estado inicial (n,).
+            n_passos (int): Número de passos da malha.
+            instantes_entrada (sequence, opcional): Instantes (crescentes) das mudanças da entrada.
+            valores_entrada (sequence, opcional): Valor de u (escalar ou vetor m) a partir de
+                cada instante; antes do primeiro instante vale o primeiro valor.
+
+        Returns:
+            tuple: (t, X), com t (n_passos + 1,) e X (n_passos + 1, n).
+        """
+        n, m = self.B.shape
+        valores = [np.broadcast_to(np.asarray(v, dtype=float), (m,)) for v in valores_entrada]
+        instantes = np.asarray(instantes_entrada, dtype=float)
+        X = np.empty((n_passos + 1, n))
+        X[0] = x0
+        t = np.arange(n_passos + 1) * self.passo
+
+        k = 0
+        indice = max(int(np.searchsorted(instantes, 0.0, side='right')) - 1, 0) # Entrada vigente
+        while k < n_passos:
+            # Próxima mudança de entrada depois de t_k
+            proximo = indice + 1
+            if proximo >= len(instantes) or instantes[proximo] >= t[-1]:
+                self._avancar_constante(X, k, n_passos - k, valores[indice])
+                break
+            t_mudanca = instantes[proximo]
+            passos_inteiros = int(np.floor(t_mudanca / self.passo + 1e-9)) - k
+            if passos_inteiros > 0:
+                self._avancar_constante(X, k, passos_inteiros, valores[indice])
+                k += passos_inteiros
+            # Passo [t_k, t_k+1] que contém uma ou mais mudanças: sub-intervalos exatos
+            x, t_atual = X[k], t[k]
+            while proximo < len(instantes) and instantes[proximo] < t[k + 1] - 1e-9 * self.passo:
+                if instantes[proximo] > t_atual:
+                    Phi, Gamma = self.discretizar(instantes[proximo] - t_atual)
+                    x = Phi @ x + Gamma @ valores[indice]
+                    t_atual = instantes[proximo]
+                indice, proximo = proximo, proximo + 1
+            Phi, Gamma = self.discretizar(t[k + 1] - t_atual)
+            X[k + 1] = Phi @ x + Gamma @ valores[indice]
+            k += 1
+            if proximo < len(instantes) and abs(instantes[proximo] - t[k]) <= 1e-9 * self.passo:
+                indice += 1 # Mudança exatamente sobre o ponto da malha
+        return t, X
+
+def cstr_linear_em_serie(n_tanques, V, Q, k):
+    """
+    Matrizes (A, B) de n_tanques CSTRs iguais em série com reação de
+    primeira ordem: dC_i/dt = (Q/V)(C_(i-1) - C_i) - k C_i, com C_0 = CA_entrada (entrada u).
+    """
+    A = np.diag(np.full(n_tanques, -(Q / V + k))) + np.diag(np.full(n_tanques - 1, Q / V), -1)
+    B = np.zeros((n_tanques, 1))
+    B[0, 0] = Q / V
+    return A, B
+
+def comparar_propagador_exato(n_passos=10**7, tempo_max=100.0, n_tanques=3):
+    """
+    Propaga o CSTR de simular_cstr (degrau de CA_entrada de 1 para 5 mol/L
+    em t = 20 min) por n_passos passos: confere o tanque único com a
+    solução analítica e mede o tempo de um trem de n_tanques em série.
+    """
+    print("--- Propagador Exato (Exponencial de Matriz) para CSTRs Lineares ---")
+    V, Q, k = 100.0, 10.0, 0.05
+    passo = tempo_max / n_passos
+    resultados = {}
+    for n in (1, n_tanques):
+        A, B = cstr_linear_em_serie(n, V, Q, k)
+        inicio = time.perf_counter()
+        propagador = PropagadorLinear(A, B, passo)
+        t, X = propagador.propagar(np.zeros(n), n_passos, instantes_entrada=(0.0, 20.0), valores_entrada=(1.0, 5.0))
+        duracao = time.perf_counter() - inicio
+        resultados[n] = (t, X, duracao)
+        print(f"{n} tanque(s): {n_passos} passos em {duracao:.3f} s | CA no último tanque em "
+              f"t = {t[-1]:.0f} min: {X[-1, -1]:.6f} mol/L")
+    t, X, _ = resultados[1]
+    amostras = slice(None, None, max(n_passos // 1000, 1))
+    desvio = np.max(np.abs(X[amostras, 0] - concentracao_cstr_analitica(t[amostras], 0.0, V, Q, k,
+                                                                        (0.0, 20.0), (1.0, 5.0))))
+    print(f"Desvio máximo do tanque único em relação à solução analítica: {desvio:.2e} mol/L")
+    return resultados
 
 # Para rodar a simulação, basta chamar a função:
 if __name__ == "__main__":
@@ -1,13 +1,63 @@
+import time # Para medir o tempo da varredura de projeto
 import numpy as np
-from scipy.integrate import odeint
+from scipy.integrate import odeint, solve_ivp # solve_ivp resolve as EDOs com detecção de eventos
 import matplotlib.pyplot as plt
 import seaborn as sns
+from instrumentacao_solver import RelatorioSimulacao # Contadores do solver e tempo por fase
 
-def simular_tanque_entrada_saida():
+# --- Eventos ---
+# Funções de evento do solve_ivp: o solver localiza o instante exato em que a
+# função se anula (raiz) e, se o evento for terminal, encerra a integração.
+def evento_nivel(nivel, direcao=0, terminal=False):
+    """
+    Evento de cruzamento do nível 'nivel' (m). direcao = +1 detecta só a
+    subida, -1 só a descida e 0 os dois sentidos.
+    """
+    def evento(t, y):
+        return y[0] - nivel
+    evento.direction = direcao
+    evento.terminal = terminal
+    return evento
+
+def evento_regime(funcao_edo, args, tolerancia, terminal=False):
+    """
+    Evento de regime permanente: |dh/dt| cai abaixo de 'tolerancia' (m/s).
+    funcao_edo(h, t, *args) é a EDO no formato do odeint. Com a vazão de
+    entrada constante, a altura é monótona, de modo que |dh/dt| só diminui
+    à medida que o tanque se aproxima do equilíbrio.
+    """
+    def evento(t, y):
+        return abs(funcao_edo(y[0], t, *args)) - tolerancia
+    evento.direction = -1
+    evento.terminal = terminal
+    return evento
+
+def simular_tanque_entrada_saida(tempo_max=200, n_pontos=300, relatorio=None, tolerancia_regime=1e-4,
+                                 parar_no_regime=True, nivel_alarme=None, parar_no_alarme=False):
     """
     Simula a dinâmica da altura do líquido em um tanque com entrada e saída,
     usando uma EDO e visualiza os resultados.
+
+    Args:
+        tempo_max (float, opcional): Tempo máximo de simulação (s). Padrão é 200.
+        n_pontos (int, opcional): Número de pontos de tempo da solução. Padrão é 300.
+        relatorio (RelatorioSimulacao, opcional): Relatório onde registrar os
+            contadores do solver e o tempo de cada fase. Padrão: um novo.
+        tolerancia_regime (float, opcional): O regime permanente é atingido
+            quando |dh/dt| < tolerancia_regime (m/s). Padrão é 1e-4.
+        parar_no_regime (bool, opcional): Se True (padrão), a simulação termina
+            ao atingir o regime após a última mudança da vazão de entrada.
+        nivel_alarme (float, opcional): Nível (m) cujos cruzamentos são
+            localizados (ex.: transbordamento). Padrão: nenhum.
+        parar_no_alarme (bool, opcional): Se True, a simulação termina no
+            primeiro cruzamento de nivel_alarme.
+
+    Returns:
+        RelatorioSimulacao: Estatísticas do solver e tempos das fases
+        (integrar, derivar, plotar, tabular).
     """
+    if relatorio is None:
+        relatorio = RelatorioSimulacao('tanque_entrada_saida')
     print("--- 10.1. Estudo de Caso: Tanque com Entrada e Saída ---")
 
     # --- 1. Definir os Parâmetros do Tanque e do Processo ---
@@ -22,8 +72,10 @@ def simular_tanque_entrada_saida():
     Q_entrada_constante = 0.1 # m^3/s
 
     # Exemplo: Vazão de entrada que muda em um certo tempo
+    t_mudanca = 50.0 # Instante da redução da vazão de entrada (s)
+
     def Q_entrada_funcao_tempo(t_atual):
-        if t_atual < 50:
+        if t_atual < t_mudanca:
             return 0.1 # m^3/s
         else:
             return 0.05 # m^3/s (reduz a vazão de entrada após 50s)
@@ -51,50 +103,338 @@ def simular_tanque_entrada_saida():
 
     # --- 4. Definir Condição Inicial e Intervalo de Tempo ---
     h0 = 0.5        # Altura inicial do líquido no tanque (m)
-    tempo_max = 200 # Tempo máximo de simulação (s)
-    t = np.linspace(0, tempo_max, 300) # 300 pontos de tempo para a solução
+    t = np.linspace(0, tempo_max, n_pontos) # n_pontos pontos de tempo para a solução
+
+    # --- 5. Resolver a EDO Numericamente usando solve_ivp, com Eventos ---
+    # O solve_ivp espera f(t, y); passamos Q_entrada_funcao_tempo como argumento da EDO.
+    # A integração é feita por trechos de vazão constante, reiniciando o solver na
+    # mudança: dentro de cada trecho a EDO é suave e |dh/dt| só diminui.
+    argumentos = (A_T, A_o, C_d, g, Q_entrada_funcao_tempo)
+    dHdt_contada = relatorio.contar_chamadas(dHdt) # Os eventos usam dHdt diretamente (não contam)
+
+    def funcao_derivada(t_atual, y):
+        return [dHdt_contada(y[0], t_atual, *argumentos)]
+
+    limites = [0.0] + [t_mudanca] * (t_mudanca < tempo_max) + [tempo_max]
+    tempos_evento = {'regime': [], 'alarme': []}
+    partes_t, partes_h = [], []
+    h_atual = h0
+    with relatorio.fase('integrar'):
+        for t_inicio, t_fim in zip(limites[:-1], limites[1:]):
+            ultimo_trecho = t_fim == tempo_max
+            # O trecho termina um ulp antes da mudança, para que a vazão nunca seja avaliada do lado de lá do degrau
+            t_final = t_fim if ultimo_trecho else np.nextafter(t_fim, t_inicio)
+            t_trecho = t[(t >= t_inicio) & (t <= t_final)]
+
+            # O regime só encerra a simulação depois da última mudança da vazão de entrada
+            eventos = [evento_regime(dHdt, argumentos, tolerancia_regime, terminal=parar_no_regime and ultimo_trecho)]
+            if nivel_alarme is not None:
+                eventos.append(evento_nivel(nivel_alarme, terminal=parar_no_alarme))
+
+            # Trecho que já começa em regime: o evento não teria cruzamento a localizar
+            if abs(dHdt(h_atual, t_inicio, *argumentos)) < tolerancia_regime:
+                tempos_evento['regime'].append(t_inicio)
+
+            resultado = solve_ivp(funcao_derivada, (t_inicio, t_final), [h_atual], method='LSODA',
+                                  t_eval=t_trecho, events=eventos, dense_output=True, rtol=1e-8, atol=1e-10)
+            relatorio.registrar_solve_ivp(resultado)
+            partes_t.append(resultado.t)
+            partes_h.append(resultado.y[0])
+            for nome, tempos in zip(tempos_evento, resultado.t_events):
+                tempos_evento[nome].extend(tempos)
+
+            if resultado.status == 1: # Evento terminal: a curva termina no instante localizado pelo solver
+                i = next(i for i, evento in enumerate(eventos) if evento.terminal and len(resultado.t_events[i]))
+                partes_t.append(resultado.t_events[i][:1])
+                partes_h.append(resultado.y_events[i][:1, 0])
+                break
+            h_atual = resultado.sol(t_final)[0]
 
-    # --- 5. Resolver a EDO Numericamente usando odeint ---
-    # Passamos a função Q_entrada_funcao_tempo como um dos argumentos da EDO
-    solucao_h = odeint(dHdt, h0, t, args=(A_T, A_o, C_d, g, Q_entrada_funcao_tempo))
+    with relatorio.fase('derivar'):
+        t_solucao = np.concatenate(partes_t)
+        alturas = np.concatenate(partes_h)
 
-    # odeint retorna um array 2D, extraímos a primeira coluna para ter o array de alturas.
-    alturas = solucao_h[:, 0]
+        # Garantir que a altura não seja negativa (pode acontecer por aproximação numérica)
+        alturas[alturas < 0] = 0
 
-    # Garantir que a altura não seja negativa (pode acontecer por aproximação numérica)
-    alturas[alturas < 0] = 0
+        # Vazão de entrada nos tempos da solução, para contextualizar a mudança no gráfico
+        Q_entrada_plot = np.array([Q_entrada_funcao_tempo(ti) for ti in t_solucao])
+
+        # Regime permanente: |dh/dt| abaixo da tolerância no fim da simulação; o instante
+        # em que foi atingido é o do último evento de regime (localizado pelo solver)
+        derivada_final = dHdt(alturas[-1], t_solucao[-1], *argumentos)
+        regime_permanente = abs(derivada_final) <= tolerancia_regime * (1 + 1e-6)
 
     # --- 6. Visualizar a Curva da Altura do Líquido ---
-    sns.set_style("whitegrid")
-    plt.figure(figsize=(10, 6))
-    plt.plot(t, alturas, label='Altura do Líquido (h)', color='blue', linewidth=2)
-
-    # Plotar a vazão de entrada para contextualizar a mudança
-    Q_entrada_plot = np.array([Q_entrada_funcao_tempo(ti) for ti in t])
-    # Criar um segundo eixo Y para a vazão de entrada
-    ax2 = plt.gca().twinx()
-    ax2.plot(t, Q_entrada_plot, label='Vazão de Entrada (Q_in)', color='red', linestyle=':', linewidth=1.5)
-    ax2.set_ylabel('Vazão de Entrada (m³/s)', color='red')
-    ax2.tick_params(axis='y', labelcolor='red')
-
-    plt.xlabel('Tempo (s)')
-    plt.ylabel('Altura (m)', color='blue')
-    plt.tick_params(axis='y', labelcolor='blue')
-    plt.title('Dinâmica da Altura do Líquido em um Tanque')
-    plt.legend(loc='upper left') # Ajusta a posição da legenda para não sobrepor
-    ax2.legend(loc='upper right')
-    plt.grid(True)
-    plt.show()
-
-    print("\n--- Resultados da Simulação ---")
-    print(f"Altura inicial: {h0:.2f} m")
-    print(f"Altura final (após {tempo_max} s): {alturas[-1]:.2f} m")
-    # Encontrar o tempo aproximado para atingir o regime permanente (se houver)
-    # Isso é mais complexo, mas podemos verificar se a altura está estável no final
-    if abs(alturas[-1] - alturas[-50]) < 0.01: # Se a variação nas últimas 50 amostras for pequena
-        print("O tanque parece ter atingido um regime permanente.")
-    else:
-        print("O tanque ainda está em transiente ou esvaziando/enchendo.")
+    with relatorio.fase('plotar'):
+        sns.set_style("whitegrid")
+        plt.figure(figsize=(10, 6))
+        plt.plot(t_solucao, alturas, label='Altura do Líquido (h)', color='blue', linewidth=2)
+
+        # Criar um segundo eixo Y para a vazão de entrada
+        ax2 = plt.gca().twinx()
+        ax2.plot(t_solucao, Q_entrada_plot, label='Vazão de Entrada (Q_in)', color='red', linestyle=':', linewidth=1.5)
+        ax2.set_ylabel('Vazão de Entrada (m³/s)', color='red')
+        ax2.tick_params(axis='y', labelcolor='red')
+
+        plt.xlabel('Tempo (s)')
+        plt.ylabel('Altura (m)', color='blue')
+        plt.tick_params(axis='y', labelcolor='blue')
+        plt.title('Dinâmica da Altura do Líquido em um Tanque')
+        plt.legend(loc='upper left') # Ajusta a posição da legenda para não sobrepor
+        ax2.legend(loc='upper right')
+        plt.grid(True)
+        plt.show()
+
+    with relatorio.fase('tabular'):
+        print("\n--- Resultados da Simulação ---")
+        print(f"Altura inicial: {h0:.2f} m")
+        print(f"Altura final (após {t_solucao[-1]:.2f} s): {alturas[-1]:.2f} m")
+        if nivel_alarme is not None:
+            cruzamentos = ", ".join(f"{t_evento:.2f} s" for t_evento in tempos_evento['alarme']) or "nenhum"
+            print(f"Cruzamentos do nível de alarme ({nivel_alarme} m): {cruzamentos}")
+        if regime_permanente:
+            print(f"O tanque atingiu o regime permanente (|dh/dt| < {tolerancia_regime} m/s) "
+                  f"em t = {tempos_evento['regime'][-1]:.2f} s.")
+        else:
+            print("O tanque ainda está em transiente ou esvaziando/enchendo.")
+
+    return relatorio
+
+
+# --- Varredura de Projeto Vetorizada (Lote de Tanques) ---
+# Para dimensionar o orifício, cada combinação de A_o, C_d, A_T e programação da
+# vazão de entrada é um tanque independente. Em vez de um odeint por tanque, todos
+# são integrados juntos: o estado é o vetor das alturas e o Jacobiano é diagonal
+# (ml = mu = 0), de modo que o custo por passo cresce linearmente com o número de tanques.
+def vazao_entrada_lote(t, instantes, vazoes):
+    """
+    Vazão de entrada (m^3/s) de cada tanque, para programações em degraus:
+    vazoes[j, i] vale a partir de instantes[j, i] (antes do primeiro
+    instante, vale a primeira vazão).
+
+    Args:
+        t (float ou array_like): Tempo(s) (s).
+        instantes, vazoes (np.ndarray): Matrizes (n_tanques, n_degraus).
+
+    Returns:
+        np.ndarray: (n_tanques,) para t escalar ou (n_tanques, len(t)).
+    """
+    tempos = np.atleast_1d(t)
+    indice = np.maximum(np.sum(instantes[:, :, np.newaxis] <= tempos, axis=1) - 1, 0)
+    vazao = np.take_along_axis(vazoes, indice, axis=1)
+    return vazao[:, 0] if np.ndim(t) == 0 else vazao
+
+def dHdt_lote(h, t, A_T, A_o, C_d, g, Q_entrada):
+    """
+    Versão vetorizada de dHdt: h, os parâmetros e Q_entrada são arrays com
+    um valor por tanque (ou matrizes tanque x tempo, para a trajetória inteira).
+    """
+    Q_saida = C_d * A_o * np.sqrt(2 * g * np.maximum(h, 0.0)) # Lei de Torricelli
+    return (Q_entrada - Q_saida) / A_T
+
+def interpolar_cruzamento(t, valores, indices):
+    """
+    Instante em que cada linha de 'valores' cruza zero entre as amostras
+    indices - 1 e indices, por interpolação linear (t[0] se o índice for 0).
+    Serve de estimativa inicial para localizar_cruzamentos_lote.
+    """
+    linhas = np.arange(len(indices))
+    k = np.maximum(indices, 1)
+    antes, depois = valores[linhas, k - 1], valores[linhas, k]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        fracao = np.clip(np.where(depois != antes, antes / (antes - depois), 1.0), 0.0, 1.0)
+    return np.where(indices == 0, t[0], t[k - 1] + fracao * (t[k] - t[k - 1]))
+
+def localizar_cruzamentos_lote(residuo, derivada_residuo, h_inicio, t_inicio, t_fim, t_estimado,
+                               A_T, A_o, C_d, g, Q_entrada, rtol=1e-8, atol=1e-10, max_iter=50):
+    """
+    Localiza, para cada tanque, o instante em (t_inicio, t_fim) em que
+    residuo(h) cruza zero, sobre a própria solução do solver, e não sobre a
+    grade de saída (mesma precisão dos eventos de simular_tanque_entrada_saida).
+
+    Partindo de h_inicio = h(t_inicio), cada iteração integra o lote inteiro
+    até t_inicio + tau, com um tau por tanque (tempo normalizado s de 0 a 1:
+    dh/ds = tau·dh/dt), e atualiza tau pelo método de Newton, protegido por
+    bissecção no intervalo que contém o cruzamento. A vazão de entrada deve
+    ser constante em cada intervalo.
+
+    Args:
+        residuo, derivada_residuo (callable): r(h) e dr/dh (arrays por tanque).
+        h_inicio, t_inicio, t_fim (np.ndarray): Altura e extremos do intervalo de cada tanque.
+        t_estimado (np.ndarray): Estimativa inicial do cruzamento (ex.: interpolar_cruzamento).
+        A_T, A_o, C_d, g, Q_entrada: Parâmetros de dHdt_lote por tanque.
+
+    Returns:
+        np.ndarray: Instante do cruzamento de cada tanque (s).
+    """
+    duracao = t_fim - t_inicio
+    a, b = np.zeros_like(duracao), duracao.copy()
+    sinal_inicio = np.sign(residuo(h_inicio))
+    tau = np.clip(t_estimado - t_inicio, 0.0, duracao)
+    for _ in range(max_iter):
+        h_tau = odeint(lambda h, s: tau * dHdt_lote(h, s, A_T, A_o, C_d, g, Q_entrada), h_inicio, [0.0, 1.0],
+                       ml=0, mu=0, rtol=rtol, atol=atol)[-1]
+        r = residuo(h_tau)
+        antes_do_cruzamento = np.sign(r) == sinal_inicio
+        a = np.where(antes_do_cruzamento, tau, a)
+        b = np.where(antes_do_cruzamento, b, tau)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            newton = tau - r / (derivada_residuo(h_tau) * dHdt_lote(h_tau, 0.0, A_T, A_o, C_d, g, Q_entrada))
+        tau_novo = np.where((newton > a) & (newton < b), newton, (a + b) / 2)
+        convergiu = np.all(np.abs(tau_novo - tau) <= 1e-10 * np.maximum(duracao, 1.0))
+        tau = tau_novo
+        if convergiu:
+            break
+    return t_inicio + tau
+
+def simular_lote_tanques(A_T, A_o, C_d, h0, instantes_entrada, vazoes_entrada, t, altura_maxima=np.inf,
+                         g=9.81, tolerancia_regime=1e-4, rtol=1e-8, atol=1e-10):
+    """
+    Integra de uma só vez um lote de tanques com entrada e saída.
+
+    Os parâmetros são escalares ou arrays com um valor por tanque
+    (combinados por broadcasting). A programação da vazão de entrada é
+    dada por instantes_entrada e vazoes_entrada, com forma (n_degraus,),
+    comum a todos, ou (n_tanques, n_degraus). O solver é reiniciado em cada
+    instante de mudança (união dos instantes de todos os tanques), de modo
+    que em cada trecho a vazão de entrada é um vetor constante.
+
+    Args:
+        A_T, A_o, C_d, h0 (float ou array_like): Parâmetros e alturas iniciais.
+        instantes_entrada, vazoes_entrada (array_like): Programação da vazão de entrada.
+        t (array_like): Pontos de tempo (crescentes) da solução (s).
+        altura_maxima (float ou array_like, opcional): Altura de transbordamento (m).
+        g (float, opcional): Aceleração da gravidade (m/s^2).
+        tolerancia_regime (float, opcional): Regime permanente: |dh/dt| < tolerancia_regime (m/s).
+        rtol, atol (float, opcional): Tolerâncias do odeint.
+
+    Returns:
+        tuple: (alturas, metricas), onde alturas é uma matriz
+        (n_tanques, len(t)) e metricas é um dicionário de arrays por tanque:
+        'altura_final' (m), 'tempo_transbordamento' (s, NaN se não
+        transbordou) e 'tempo_regime' (s, instante a partir do qual
+        |dh/dt| fica abaixo da tolerância após a última mudança da entrada;
+        NaN se não atingiu o regime). Os instantes são localizados sobre a
+        solução do solver (localizar_cruzamentos_lote), não apenas entre os
+        pontos de t.
+    """
+    t = np.asarray(t, dtype=float)
+    n_degraus = np.shape(instantes_entrada)[-1]
+    forma = np.broadcast_shapes(*(np.shape(p) for p in (A_T, A_o, C_d, h0, altura_maxima)),
+                                np.shape(instantes_entrada)[:-1], np.shape(vazoes_entrada)[:-1])
+    n_tanques = int(np.prod(forma))
+    A_T, A_o, C_d, h0, altura_maxima = (np.broadcast_to(np.asarray(p, dtype=float), forma).ravel()
+                                        for p in (A_T, A_o, C_d, h0, altura_maxima))
+    instantes = np.broadcast_to(np.asarray(instantes_entrada, dtype=float), forma + (n_degraus,)).reshape(n_tanques, n_degraus)
+    vazoes = np.broadcast_to(np.asarray(vazoes_entrada, dtype=float), forma + (n_degraus,)).reshape(n_tanques, n_degraus)
+
+    # A grade interna inclui os instantes de mudança: assim, entre dois pontos
+    # consecutivos a vazão de entrada de cada tanque é constante
+    quebras = np.unique(instantes[(instantes > t[0]) & (instantes < t[-1])])
+    t_interno = np.union1d(t, quebras)
+    limites = np.concatenate(([t[0]], quebras, [t[-1]]))
+
+    alturas = np.empty((len(t_interno), n_tanques))
+    alturas[0] = h0
+    h_atual = h0
+    for t_inicio, t_fim in zip(limites[:-1], limites[1:]):
+        Q_trecho = vazao_entrada_lote(t_inicio, instantes, vazoes) # Constante dentro do trecho
+        mascara = (t_interno > t_inicio) & (t_interno <= t_fim)
+        t_trecho = np.concatenate(([t_inicio], t_interno[mascara]))
+        solucao = odeint(dHdt_lote, h_atual, t_trecho, args=(A_T, A_o, C_d, g, Q_trecho),
+                         ml=0, mu=0, rtol=rtol, atol=atol)
+        alturas[mascara] = solucao[1:]
+        h_atual = solucao[-1]
+    alturas = np.maximum(alturas.T, 0.0) # Matriz (n_tanques, len(t_interno))
+    vazoes_interno = vazao_entrada_lote(t_interno, instantes, vazoes) # Vazão em cada ponto (e até o seguinte)
+
+    def localizar(indices, residuo, derivada_residuo, valores):
+        """Refina, sobre a solução do solver, o cruzamento entre as amostras indices - 1 e indices."""
+        tempos = interpolar_cruzamento(t_interno, valores, indices)
+        linhas = np.flatnonzero(indices > 0)
+        if len(linhas) == 0:
+            return tempos
+        k = indices[linhas]
+        parametros = (A_T[linhas], A_o[linhas], C_d[linhas], g, vazoes_interno[linhas, k - 1])
+        # Só há cruzamento a localizar se o resíduo muda de sinal no intervalo
+        com_cruzamento = np.sign(residuo(alturas[linhas, k - 1], linhas, parametros)) != \
+                         np.sign(residuo(alturas[linhas, k], linhas, parametros))
+        tempos[linhas] = np.where(com_cruzamento, tempos[linhas], t_interno[k])
+        linhas, k = linhas[com_cruzamento], k[com_cruzamento]
+        if len(linhas) > 0:
+            parametros = tuple(p[com_cruzamento] if np.ndim(p) else p for p in parametros)
+            tempos[linhas] = localizar_cruzamentos_lote(
+                lambda h: residuo(h, linhas, parametros), lambda h: derivada_residuo(h, linhas, parametros),
+                alturas[linhas, k - 1], t_interno[k - 1], t_interno[k], tempos[linhas], *parametros,
+                rtol=rtol, atol=atol)
+        return tempos
+
+    # --- Métricas por tanque ---
+    indices_saida = np.searchsorted(t_interno, t)
+    metricas = {'altura_final': alturas[:, -1]}
+
+    acima = alturas >= altura_maxima[:, np.newaxis]
+    transbordou = acima.any(axis=1)
+    tempos = localizar(np.argmax(acima, axis=1),
+                       lambda h, linhas, _: h - altura_maxima[linhas],
+                       lambda h, linhas, _: np.ones_like(h),
+                       alturas - altura_maxima[:, np.newaxis])
+    metricas['tempo_transbordamento'] = np.where(transbordou, tempos, np.nan)
+
+    # Regime: |dh/dt| abaixo da tolerância em todos os pontos a partir de um instante
+    # posterior à última mudança da vazão de entrada
+    derivadas = dHdt_lote(alturas, t_interno, A_T[:, np.newaxis], A_o[:, np.newaxis], C_d[:, np.newaxis], g,
+                          vazoes_interno)
+    ultima_mudanca = np.max(np.where(instantes <= t[-1], instantes, t[0]), axis=1)
+    em_regime = (np.abs(derivadas) < tolerancia_regime) & (t_interno >= ultima_mudanca[:, np.newaxis])
+    regime_ate_o_fim = np.logical_and.accumulate(em_regime[:, ::-1], axis=1)[:, ::-1]
+
+    def excesso_derivada(h, linhas, parametros):
+        return np.abs(dHdt_lote(h, 0.0, *parametros)) - tolerancia_regime
+
+    def derivada_excesso(h, linhas, parametros):
+        A_T_l, A_o_l, C_d_l, g_l, Q_l = parametros
+        d2h = -C_d_l * A_o_l * g_l / (A_T_l * np.sqrt(2 * g_l * np.maximum(h, 1e-12))) # d(dh/dt)/dh
+        return np.sign(dHdt_lote(h, 0.0, *parametros)) * d2h
+
+    tempos = localizar(np.argmax(regime_ate_o_fim, axis=1), excesso_derivada, derivada_excesso,
+                       np.abs(derivadas) - tolerancia_regime)
+    metricas['tempo_regime'] = np.where(regime_ate_o_fim[:, -1], np.maximum(tempos, ultima_mudanca), np.nan)
+    return alturas[:, indices_saida], metricas
+
+def varrer_projeto_tanques(valores_A_o=np.linspace(0.01, 0.04, 20), valores_C_d=np.linspace(0.6, 0.7, 10),
+                           valores_A_T=np.linspace(3.0, 7.0, 10), altura_maxima=2.0, tempo_max=1000, n_pontos=1001):
+    """
+    Varre a grade completa de A_o, C_d e A_T (um tanque por combinação) com a
+    programação de vazão de simular_tanque_entrada_saida (0.1 m^3/s, reduzida
+    para 0.05 m^3/s em t = 50 s) e resume o resultado.
+
+    Returns:
+        tuple: (grade, alturas, metricas), com grade = (A_o, C_d, A_T) em
+        arrays achatados (um valor por tanque) e o retorno de simular_lote_tanques.
+    """
+    print("--- Varredura de Projeto: Lote de Tanques ---")
+    A_o, C_d, A_T = (eixo.ravel() for eixo in np.meshgrid(valores_A_o, valores_C_d, valores_A_T, indexing='ij'))
+    t = np.linspace(0, tempo_max, n_pontos)
+
+    inicio = time.perf_counter()
+    alturas, metricas = simular_lote_tanques(A_T, A_o, C_d, h0=0.5, instantes_entrada=[0.0, 50.0],
+                                             vazoes_entrada=[0.1, 0.05], t=t, altura_maxima=altura_maxima)
+    duracao = time.perf_counter() - inicio
+
+    transbordaram = ~np.isnan(metricas['tempo_transbordamento'])
+    em_regime = ~np.isnan(metricas['tempo_regime'])
+    print(f"Tanques simulados: {len(A_o)} em {duracao:.3f} s (uma integração por trecho de vazão constante)")
+    print(f"Transbordaram (h >= {altura_maxima} m): {np.count_nonzero(transbordaram)}")
+    print(f"Atingiram o regime em {tempo_max} s: {np.count_nonzero(em_regime)}")
+    if np.any(em_regime & ~transbordaram):
+        candidatos = np.flatnonzero(em_regime & ~transbordaram)
+        melhor = candidatos[np.argmin(metricas['tempo_regime'][candidatos])]
+        print(f"Regime mais rápido sem transbordar: A_o = {A_o[melhor]:.4f} m², C_d = {C_d[melhor]:.3f}, "
+              f"A_T = {A_T[melhor]:.2f} m² (t = {metricas['tempo_regime'][melhor]:.1f} s, "
+              f"h final = {metricas['altura_final'][melhor]:.3f} m)")
+    return (A_o, C_d, A_T), alturas, metricas
 
 
 # --- Execução do Exemplo ---
@@ -2,6 +2,7 @@ import numpy as np
 from scipy.integrate import odeint
 import matplotlib.pyplot as plt
 import seaborn as sns
+from modelo_reator import ParametrosReator, arrhenius, balancos_reator, estado_escalar, jacobiano_balancos
 
 # --- 1. Definir os Parâmetros do Reator e da Reação (da Tarefa 1) ---
 AT = 5.0        # Área da seção transversal do reator (m^2)
@@ -35,73 +36,52 @@ T_entrada_control = T_entrada_const # Placeholder: temperatura de entrada no tem
 CA_entrada_control = CA_entrada_const # Placeholder: concentração de entrada no tempo t
 
 # --- 2. Implementar a função que descreve o sistema de EDOs acopladas ---
+# Os balanços de massa e energia ficam no módulo compartilhado modelo_reator
+# (o mesmo usado pelos códigos 36 e 38); aqui definimos apenas as entradas.
 def reactor_odes(Y, t, params):
     """
     Define o sistema de Equações Diferenciais Ordinárias (EDOs) acopladas
     para o reator químico.
+
+    params é a tupla (parametros, Q_aquecedor_func, Q_entrada_func,
+    T_entrada_func, CA_entrada_func), com os parâmetros físicos em um
+    ParametrosReator e as entradas como funções do tempo.
     """
-    h, T, CA = Y # Desempacotar as variáveis de estado
-
-    # Desempacotar os parâmetros
-    AT, Ao, Cd, g, rho, Cp_J_kg_C, k0, Ea_R, delta_H_reacao, \
-    Q_aquecedor_func, Q_entrada_func, T_entrada_func, CA_entrada_func = params
-
-    # --- Cálculos Intermediários ---
-    # Vazão de Entrada (pode ser uma função do tempo)
-    Q_entrada = Q_entrada_func(t)
-
-    # Vazão de Saída (Lei de Torricelli, depende da altura)
-    if h <= 0:
-        Q_saida = 0.0
-    else:
-        Q_saida = Cd * Ao * np.sqrt(2 * g * h)
-    
-    # Volume de Líquido no Reator (depende da altura)
-    V_liquido = AT * h
-    # Evitar divisão por zero se o tanque estiver vazio
-    if V_liquido <= 1e-6:
-        V_liquido = 1e-6
-
-    # Constante de Velocidade da Reação (Arrhenius, depende da temperatura)
-    k_arrhenius = k0 * np.exp(-Ea_R / (T + 273.15))
-
-    # Taxa de Reação (mol/L.min)
-    r_A = k_arrhenius * CA
-
-    # Calor Gerado/Consumido pela Reação (J/min)
-    Q_reacao = (-delta_H_reacao) * r_A * V_liquido
-
-    # Calor Fornecido pelo Aquecedor (J/min)
-    Q_aquecedor = Q_aquecedor_func(t)
-
-    # Temperatura e Concentração de Entrada
-    T_entrada = T_entrada_func(t)
-    CA_entrada = CA_entrada_func(t)
-
-    # --- EDOs ---
-    # 1. dh/dt (Balanço de Massa Total)
-    dhdt = (Q_entrada - Q_saida) / AT
-
-    # 2. dCA/dt (Balanço de Massa para Componente A)
-    dCAdt = (Q_entrada * CA_entrada - Q_saida * CA - V_liquido * r_A) / V_liquido
-    if h <= 0:
-        dCAdt = 0.0
-
-    # 3. dT/dt (Balanço de Energia)
-    dTdt = (Q_entrada * (T_entrada - T) / V_liquido) + \
-           (Q_reacao / (V_liquido * rho * Cp_J_kg_C)) + \
-           (Q_aquecedor / (V_liquido * rho * Cp_J_kg_C))
-    if h <= 0:
-        dTdt = 0.0
+    h, T, CA = estado_escalar(Y) # Desempacotar as variáveis de estado
+    parametros, Q_aquecedor_func, Q_entrada_func, T_entrada_func, CA_entrada_func = params
+
+    # Constante de Velocidade da Reação (Arrhenius, depende da temperatura do reator)
+    k_arrhenius = arrhenius(parametros.k0, parametros.Ea_R, T)
 
+    # Balanços de massa total, de energia e do componente A
+    dhdt, dTdt, dCAdt = balancos_reator(h, T, CA, Q_entrada_func(t), Q_aquecedor_func(t),
+                                        T_entrada_func(t), CA_entrada_func(t), k_arrhenius, parametros)
     return [dhdt, dTdt, dCAdt]
 
+def reactor_jacobiano(Y, t, params):
+    """
+    Calcula o Jacobiano analítico J[i, j] = d(dY_i/dt)/dY_j das EDOs do reator,
+    com as linhas na ordem de retorno de reactor_odes (dh/dt, dT/dt, dCA/dt) e
+    as colunas na ordem do estado (h, T, CA). Pode ser passado ao odeint
+    (Dfun=reactor_jacobiano) ou ao solve_ivp (jac) para métodos rígidos.
+    """
+    h, T, CA = estado_escalar(Y)
+    parametros, Q_aquecedor_func, Q_entrada_func, T_entrada_func, CA_entrada_func = params
+
+    # Arrhenius e sua derivada: dk/dT = k * Ea_R / (T + 273.15)^2
+    k_arrhenius = arrhenius(parametros.k0, parametros.Ea_R, T)
+    dk_dT = k_arrhenius * parametros.Ea_R / (T + 273.15)**2
+
+    # As entradas não dependem do estado (sem controladores nesta tarefa)
+    return jacobiano_balancos(h, T, CA, Q_entrada_func(t), Q_aquecedor_func(t), T_entrada_func(t),
+                              CA_entrada_func(t), k_arrhenius, dk_dT, 0.0, 0.0, parametros)
+
 # --- Exemplo de uso da função EDO (para teste, não é a simulação completa) ---
 if __name__ == "__main__":
     print("--- Teste da Função de EDOs do Reator ---")
 
     # Parâmetros (usando os definidos acima)
-    params_test = (AT, Ao, Cd, g, rho, Cp_J_kg_C, k0, Ea_R, delta_H_reacao,
+    params_test = (ParametrosReator(AT, Ao, Cd, g, rho, Cp_J_kg_C, k0, Ea_R, delta_H_reacao),
                    lambda t: Q_aquecedor_control, # Função placeholder para aquecedor
                    lambda t: Q_entrada_control,   # Função placeholder para Q_entrada
                    lambda t: T_entrada_control,   # Função placeholder para T_entrada
@@ -123,5 +103,10 @@ if __name__ == "__main__":
     print(f"  dT/dt = {derivadas[1]:.4f} °C/min")
     print(f"  dCA/dt = {derivadas[2]:.4f} mol/L.min")
 
+    # Jacobiano analítico no mesmo ponto (usado pelos métodos para sistemas rígidos)
+    jacobiano = reactor_jacobiano(Y_test, t_test, params_test)
+    print("\nJacobiano Analítico (linhas: dh/dt, dT/dt, dCA/dt; colunas: h, T, CA):")
+    print(np.array2string(jacobiano, precision=4))
+
     # O restante da simulação (chamada ao odeint, lógica de controle, visualização)
     # será implementado nas próximas tarefas.
\ No newline at end of file
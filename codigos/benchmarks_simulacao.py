@@ -0,0 +1,302 @@
+"""
+Suíte de benchmarks das simulações e leituras de dados dos códigos do curso.
+
+Cada benchmark é uma função de preparação parametrizada pelo tamanho do
+problema (horizonte de simulação, tamanho do ensemble ou número de linhas do
+CSV), no estilo do asv: a preparação (gerar arquivos, montar parâmetros) não
+é cronometrada; só a chamada devolvida por ela. Os gráficos ficam desativados
+(backend 'Agg' e plt.show sem efeito) e as mensagens dos códigos são
+descartadas, de modo que a suíte roda sem tela.
+
+Cada execução é acrescentada a um histórico em JSON Lines com o commit
+atual; ao final, o tempo de cada benchmark é comparado com o da última
+execução de outro commit (ou do commit escolhido com --base).
+
+Uso:
+    python benchmarks_simulacao.py                  # todos os benchmarks
+    python benchmarks_simulacao.py --filtro tanque  # só os que contêm 'tanque'
+    python benchmarks_simulacao.py --rapido         # só o menor tamanho de cada um
+"""
+import argparse
+import contextlib
+import datetime
+import functools
+import importlib.util
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+import matplotlib
+matplotlib.use('Agg') # Sem janelas: os benchmarks rodam sem tela
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+
+PASTA_CODIGOS = os.path.dirname(os.path.abspath(__file__))
+ARQUIVO_HISTORICO = os.path.join(PASTA_CODIGOS, 'benchmarks_historico.jsonl')
+
+# Os códigos numerados não podem ser importados pelo nome (começam com dígito);
+# os módulos do reator, sim, a partir da pasta dos códigos
+if PASTA_CODIGOS not in sys.path:
+    sys.path.insert(0, PASTA_CODIGOS)
+import ensemble_reator
+import reator_tubular
+import simulacao_reator
+
+def carregar_codigo(nome_arquivo):
+    """Importa um dos códigos numerados da pasta como módulo."""
+    nome_modulo = 'codigo_' + os.path.splitext(nome_arquivo)[0]
+    if nome_modulo in sys.modules:
+        return sys.modules[nome_modulo]
+    spec = importlib.util.spec_from_file_location(nome_modulo, os.path.join(PASTA_CODIGOS, nome_arquivo))
+    modulo = importlib.util.module_from_spec(spec)
+    sys.modules[nome_modulo] = modulo
+    spec.loader.exec_module(modulo)
+    return modulo
+
+@contextlib.contextmanager
+def modo_silencioso():
+    """Descarta as mensagens impressas e desativa plt.show durante a medição."""
+    show_original = plt.show
+    plt.show = lambda *args, **kwargs: None
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            yield
+    finally:
+        plt.show = show_original
+        plt.close('all')
+
+# --- Geração de Dados Sintéticos ---
+def gerar_csv_vazao(nome_arquivo, n_linhas, semente=0):
+    """Gera um CSV de vazão no formato lido por ler_dados_vazao (código 14)."""
+    rng = np.random.default_rng(semente)
+    instantes = np.datetime64('2024-01-01T00:00:00') + np.arange(n_linhas).astype('timedelta64[m]')
+    vazoes = 100.0 + 10.0 * rng.standard_normal(n_linhas)
+    pd.DataFrame({
+        'Timestamp': np.char.replace(np.datetime_as_string(instantes, unit='s'), 'T', ' '),
+        'Vazao': np.round(vazoes, 3),
+    }).to_csv(nome_arquivo, index=False)
+
+def gerar_csv_calibracao(nome_arquivo, n_linhas, semente=0):
+    """Gera um CSV de calibração no formato lido por calibrar_sensor_pressao (código 16)."""
+    rng = np.random.default_rng(semente)
+    saida_sensor = np.linspace(0.2, 5.0, n_linhas)
+    pressao = 50.0 * saida_sensor + 0.5 * rng.standard_normal(n_linhas)
+    pd.DataFrame({'Saida_Sensor': saida_sensor, 'Pressao_Referencia': pressao}).to_csv(nome_arquivo, index=False)
+
+# --- Benchmarks ---
+# Cada preparação recebe o tamanho do problema e a pasta temporária e devolve
+# a função (sem argumentos) que será cronometrada.
+def preparar_reactor_odes(n_avaliacoes, pasta):
+    """Avaliações isoladas do lado direito das EDOs do reator (código 38)."""
+    params = simulacao_reator.montar_parametros()
+    Y = np.array([1.0, 50.0, 0.5])
+    reactor_odes = simulacao_reator.reactor_odes
+
+    def executar():
+        for _ in range(n_avaliacoes):
+            reactor_odes(Y, 30.0, params)
+    return executar
+
+def preparar_simulacao_reator(tempo_max, pasta):
+    """Simulação nominal do reator (código 38) com horizonte tempo_max (min)."""
+    n_pontos = int(500 * tempo_max / 150)
+    return lambda: simulacao_reator.executar_simulacao(tempo_max=tempo_max, n_pontos=n_pontos)
+
+def preparar_ensemble_reator(n_reatores, pasta):
+    """Ensemble Monte Carlo de n_reatores reatores (código 38)."""
+    rng = np.random.default_rng(42)
+    matriz_parametros = np.column_stack([
+        simulacao_reator.k0 * rng.lognormal(0.0, 0.3, n_reatores),
+        simulacao_reator.Ea_R * rng.normal(1.0, 0.02, n_reatores),
+        simulacao_reator.delta_H_reacao * rng.normal(1.0, 0.1, n_reatores),
+        simulacao_reator.Cd * rng.normal(1.0, 0.05, n_reatores),
+        rng.uniform(0.4, 0.6, n_reatores),
+        rng.uniform(20.0, 30.0, n_reatores),
+        np.zeros(n_reatores),
+    ])
+    t_span = np.linspace(0, 150, 500)
+    return lambda: ensemble_reator.simular_ensemble_reator(matriz_parametros, t_span)
+
+def preparar_descarga_tanque(tempo_max, pasta, metodo='numerico'):
+    """
+    Descarga do tanque (código 29) com horizonte tempo_max (s), 1 ponto por
+    segundo: pelo solver (padrão) ou pela solução exata (metodo='analitico').
+    """
+    codigo_29 = carregar_codigo('29_codigo_simulacao_descarga_tanque.py')
+    return lambda: codigo_29.simular_descarga_tanque(tempo_max=tempo_max, n_pontos=int(tempo_max), metodo=metodo)
+
+def preparar_tanque_entrada_saida(tempo_max, pasta):
+    """Tanque com entrada e saída (código 33) com horizonte tempo_max (s)."""
+    codigo_33 = carregar_codigo('33_codigo_estudo_tanque_entrada_e_saida.py')
+    return lambda: codigo_33.simular_tanque_entrada_saida(tempo_max=tempo_max, n_pontos=int(1.5 * tempo_max))
+
+def preparar_cstr(tempo_max, pasta, metodo='numerico'):
+    """
+    CSTR com reação de primeira ordem (código 30) com horizonte tempo_max
+    (min): pelo odeint (padrão) ou pela solução exata (metodo='analitico').
+    """
+    codigo_30 = carregar_codigo('30_codigo_simulacao_reator_cstr_com_reacao.py')
+    return lambda: codigo_30.simular_cstr(tempo_max=tempo_max, n_pontos=int(2 * tempo_max), metodo=metodo)
+
+def preparar_reator_tubular(n_celulas, pasta):
+    """Reator tubular (PFR) do código 38 discretizado em n_celulas células."""
+    pfr = reator_tubular.ReatorTubular(n_celulas=n_celulas)
+    return lambda: pfr.simular()
+
+def preparar_calibracao_sensor(n_linhas, pasta):
+    """Ajuste da curva de calibração (código 16) sobre um CSV de n_linhas linhas."""
+    codigo_16 = carregar_codigo('16_codigo_calibracao_sensor.py')
+    nome_arquivo = os.path.join(pasta, f'calibracao_{n_linhas}.csv')
+    gerar_csv_calibracao(nome_arquivo, n_linhas)
+    return lambda: codigo_16.calibrar_sensor_pressao(nome_arquivo)
+
+def preparar_leitura_vazao(n_linhas, pasta):
+    """Leitura do CSV de vazão (código 14) com n_linhas linhas."""
+    codigo_14 = carregar_codigo('14_codigo_analise_vazao.py')
+    nome_arquivo = os.path.join(pasta, f'vazao_{n_linhas}.csv')
+    gerar_csv_vazao(nome_arquivo, n_linhas)
+    return lambda: codigo_14.ler_dados_vazao(nome_arquivo)
+
+# Nome -> (função de preparação, nome do parâmetro, tamanhos). Os códigos 29 e 30
+# usam a solução exata por padrão; 'descarga_tanque' e 'cstr' medem o solver
+# (metodo='numerico') e as versões '_analitico', a solução exata.
+BENCHMARKS = {
+    'reactor_odes': (preparar_reactor_odes, 'n_avaliacoes', (10000, 100000)),
+    'simulacao_reator': (preparar_simulacao_reator, 'tempo_max', (150, 600, 2400)),
+    'ensemble_reator': (preparar_ensemble_reator, 'n_reatores', (10, 100, 1000)),
+    'descarga_tanque': (preparar_descarga_tanque, 'tempo_max', (200, 2000, 20000)),
+    'descarga_tanque_analitico': (functools.partial(preparar_descarga_tanque, metodo='analitico'), 'tempo_max',
+                                  (200, 2000, 20000)),
+    'tanque_entrada_saida': (preparar_tanque_entrada_saida, 'tempo_max', (200, 2000, 20000)),
+    'cstr': (preparar_cstr, 'tempo_max', (100, 1000, 10000)),
+    'cstr_analitico': (functools.partial(preparar_cstr, metodo='analitico'), 'tempo_max', (100, 1000, 10000)),
+    'reator_tubular': (preparar_reator_tubular, 'n_celulas', (50, 500, 5000)),
+    'calibracao_sensor': (preparar_calibracao_sensor, 'n_linhas', (1000, 100000, 1000000)),
+    'leitura_vazao': (preparar_leitura_vazao, 'n_linhas', (1000, 10000, 100000)),
+}
+
+def cronometrar(funcao, repeticoes=3):
+    """Executa a função 'repeticoes' vezes e devolve os tempos (s) de cada execução."""
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return tempos
+
+def executar_benchmarks(filtro=None, rapido=False, repeticoes=3):
+    """
+    Roda os benchmarks selecionados e devolve {'nome[parametro=tamanho]': resultado}.
+
+    Cada resultado tem o menor tempo ('minimo', usado nas comparações), a
+    mediana e o número de repetições.
+    """
+    resultados = {}
+    with tempfile.TemporaryDirectory() as pasta:
+        for nome, (preparar, nome_parametro, tamanhos) in BENCHMARKS.items():
+            if filtro and filtro not in nome:
+                continue
+            for tamanho in (tamanhos[:1] if rapido else tamanhos):
+                chave = f"{nome}[{nome_parametro}={tamanho}]"
+                with modo_silencioso():
+                    funcao = preparar(tamanho, pasta)
+                    funcao() # Aquecimento: importações, caches e compilações não entram na medida
+                    tempos = cronometrar(funcao, repeticoes)
+                resultados[chave] = {'minimo': min(tempos), 'mediana': float(np.median(tempos)),
+                                     'repeticoes': repeticoes}
+                print(f"{chave:<50} {min(tempos) * 1000:12.2f} ms")
+    return resultados
+
+# --- Histórico por Commit ---
+def commit_atual():
+    """Devolve (hash curto do commit, True se houver alterações não commitadas) ou (None, None)."""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=PASTA_CODIGOS,
+                                capture_output=True, text=True, check=True).stdout.strip()
+        status = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=PASTA_CODIGOS,
+                                capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None, None
+    return commit, bool(status)
+
+def ler_historico(nome_arquivo=ARQUIVO_HISTORICO):
+    """Lê todas as execuções gravadas no histórico (lista vazia se não existir)."""
+    if not os.path.exists(nome_arquivo):
+        return []
+    with open(nome_arquivo, encoding='utf-8') as arquivo:
+        return [json.loads(linha) for linha in arquivo if linha.strip()]
+
+def gravar_execucao(resultados, nome_arquivo=ARQUIVO_HISTORICO):
+    """Acrescenta uma execução (commit, data, ambiente e resultados) ao histórico."""
+    commit, modificado = commit_atual()
+    execucao = {
+        'commit': commit,
+        'modificado': modificado,
+        'data': datetime.datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'maquina': platform.node(),
+        'resultados': resultados,
+    }
+    with open(nome_arquivo, 'a', encoding='utf-8') as arquivo:
+        arquivo.write(json.dumps(execucao, ensure_ascii=False) + '\n')
+    return execucao
+
+def escolher_referencia(historico, execucao, base=None):
+    """
+    Escolhe a execução de referência para a comparação: a última do commit
+    'base', se informado; senão, a última de um commit diferente do atual
+    (ou a anterior do mesmo commit, se houver alterações não commitadas).
+    """
+    for candidata in reversed(historico):
+        if base is not None:
+            if candidata['commit'] and candidata['commit'].startswith(base):
+                return candidata
+        elif candidata['commit'] != execucao['commit'] or execucao['modificado']:
+            return candidata
+    return None
+
+def comparar_execucoes(execucao, referencia):
+    """Imprime, por benchmark, o tempo atual, o de referência e a razão entre eles."""
+    # Execuções fora de um repositório git são gravadas com commit None
+    rotulo = (referencia['commit'] or 'commit desconhecido') + (' (modificado)' if referencia['modificado'] else '')
+    print(f"\n--- Comparação com {rotulo} de {referencia['data']} ---")
+    print(f"{'Benchmark':<50} {'Ref. (ms)':>12} {'Atual (ms)':>12} {'Razão':>8}")
+    for chave, resultado in execucao['resultados'].items():
+        anterior = referencia['resultados'].get(chave)
+        if anterior is None:
+            print(f"{chave:<50} {'-':>12} {resultado['minimo'] * 1000:12.2f} {'novo':>8}")
+            continue
+        razao = anterior['minimo'] / resultado['minimo'] # > 1: ficou mais rápido
+        marca = ' mais rápido' if razao > 1.1 else (' mais lento' if razao < 1 / 1.1 else '')
+        print(f"{chave:<50} {anterior['minimo'] * 1000:12.2f} {resultado['minimo'] * 1000:12.2f} "
+              f"{razao:7.2f}x{marca}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks das simulações (sem gráficos).")
+    parser.add_argument('--filtro', help="Roda apenas os benchmarks cujo nome contém este texto.")
+    parser.add_argument('--rapido', action='store_true', help="Apenas o menor tamanho de cada benchmark.")
+    parser.add_argument('--repeticoes', type=int, default=3, help="Repetições por medida (vale a menor).")
+    parser.add_argument('--historico', default=ARQUIVO_HISTORICO, help="Arquivo JSON Lines do histórico.")
+    parser.add_argument('--base', help="Commit de referência para a comparação (padrão: o anterior).")
+    parser.add_argument('--sem-historico', action='store_true', help="Não grava esta execução no histórico.")
+    args = parser.parse_args()
+
+    resultados = executar_benchmarks(args.filtro, args.rapido, args.repeticoes)
+    historico = ler_historico(args.historico)
+    if args.sem_historico:
+        commit, modificado = commit_atual()
+        execucao = {'commit': commit, 'modificado': modificado, 'resultados': resultados}
+    else:
+        execucao = gravar_execucao(resultados, args.historico)
+    referencia = escolher_referencia(historico, execucao, args.base)
+    if referencia is not None:
+        comparar_execucoes(execucao, referencia)
+    else:
+        print("\nNenhuma execução anterior no histórico para comparar.")
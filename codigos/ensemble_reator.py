@@ -0,0 +1,104 @@
+"""
+Modo ensemble (Monte Carlo) do reator da Tarefa 4: N reatores com
+parâmetros perturbados integrados de uma vez, como um único sistema de 3N
+EDOs com Jacobiano em banda.
+"""
+import numpy as np
+from modelo_reator import balancos_reator_vetorizado
+from simulacao_reator import (CA_entrada_disturbance_profile, Cd, Ea_R, Q_entrada_disturbance_profile,
+                              T_entrada_disturbance_profile, calcular_sinais_reator, delta_H_reacao,
+                              integrar_por_segmentos, k0, montar_parametros, obter_pontos_de_quebra,
+                              setpoint_nivel_profile, setpoint_temperatura_profile)
+
+# --- Modo Ensemble (Monte Carlo) Vetorizado ---
+# Ordem das colunas da matriz de parâmetros do ensemble: cada linha é um reator.
+PARAMETROS_ENSEMBLE = ('k0', 'Ea_R', 'delta_H_reacao', 'Cd', 'h0', 'T0', 'CA0')
+
+def reactor_odes_ensemble(Y, t, params):
+    """
+    Versão vetorizada de reactor_odes: avalia as EDOs de N reatores de uma vez.
+
+    O vetor de estados Y tem tamanho 3*N e é organizado reator a reator
+    (h0, T0, CA0, h1, T1, CA1, ...), de modo que o Jacobiano do sistema é
+    bloco-diagonal (banda com ml = mu = 2). Os parâmetros perturbados chegam
+    em params como arrays de tamanho N (ver montar_parametros); as fórmulas
+    são as de balancos_reator_vetorizado (modelo_reator).
+    """
+    estados = Y.reshape(-1, 3) # Matriz (N, 3)
+    h = estados[:, 0]
+    T = estados[:, 1]
+    CA = estados[:, 2]
+
+    sinais = calcular_sinais_reator(h, T, CA, t, params)
+
+    # --- EDOs ---
+    derivadas = np.empty_like(estados)
+    derivadas[:, 0], derivadas[:, 1], derivadas[:, 2] = balancos_reator_vetorizado(h, T, CA, sinais, params)
+    return derivadas.ravel()
+
+def simular_ensemble_reator(matriz_parametros, t_span, percentis=(5, 50, 95)):
+    """
+    Simula N reatores com parâmetros perturbados em uma única chamada ao odeint.
+
+    Args:
+        matriz_parametros (array_like): Matriz (N, 7) com as colunas de
+            PARAMETROS_ENSEMBLE: k0, Ea_R, delta_H_reacao, Cd, h0, T0, CA0.
+        t_span (array_like): Pontos de tempo da solução (min).
+        percentis (tuple, opcional): Percentis das bandas. Padrão (5, 50, 95).
+
+    Returns:
+        tuple: (trajetorias, bandas), onde trajetorias é um array
+        (N, len(t_span), 3) com h, T e CA de cada reator e bandas é um
+        dicionário {percentil: array (len(t_span), 3)}.
+    """
+    matriz_parametros = np.atleast_2d(np.asarray(matriz_parametros, dtype=float))
+    if matriz_parametros.shape[1] != len(PARAMETROS_ENSEMBLE):
+        raise ValueError(f"A matriz de parâmetros deve ter {len(PARAMETROS_ENSEMBLE)} colunas: {PARAMETROS_ENSEMBLE}")
+
+    k0_vet, Ea_R_vet, delta_H_vet, Cd_vet = matriz_parametros[:, :4].T
+    params = montar_parametros(k0=k0_vet, Ea_R=Ea_R_vet, delta_H_reacao=delta_H_vet, Cd=Cd_vet)
+    Y0 = matriz_parametros[:, 4:7].ravel() # Condições iniciais (h0, T0, CA0) de cada reator
+
+    # Jacobiano em banda (ml = mu = 2): o custo por passo cresce linearmente com N
+    pontos_de_quebra = obter_pontos_de_quebra(setpoint_nivel_profile, setpoint_temperatura_profile,
+                                              Q_entrada_disturbance_profile, T_entrada_disturbance_profile,
+                                              CA_entrada_disturbance_profile)
+    solucao, _ = integrar_por_segmentos(reactor_odes_ensemble, Y0, t_span,
+                                        args=(params,),
+                                        pontos_de_quebra=pontos_de_quebra, ml=2, mu=2)
+
+    trajetorias = solucao.reshape(len(t_span), -1, 3).transpose(1, 0, 2)
+    # Garantir que altura e concentração não sejam negativas
+    trajetorias[:, :, [0, 2]] = np.maximum(trajetorias[:, :, [0, 2]], 0.0)
+
+    bandas = {p: np.percentile(trajetorias, p, axis=0) for p in percentis}
+    return trajetorias, bandas
+
+def analisar_disparo_termico_monte_carlo(n_reatores=1000, T_disparo=40.0, semente=42):
+    """
+    Estima a probabilidade de disparo térmico (runaway) perturbando k0, Ea_R,
+    delta_H_reacao, Cd e as condições iniciais em torno dos valores nominais.
+    """
+    print("--- Análise Monte Carlo de Disparo Térmico ---")
+    rng = np.random.default_rng(semente)
+
+    # Perturbações em torno dos valores nominais
+    matriz_parametros = np.column_stack([
+        k0 * rng.lognormal(0.0, 0.3, n_reatores),
+        Ea_R * rng.normal(1.0, 0.02, n_reatores),
+        delta_H_reacao * rng.normal(1.0, 0.1, n_reatores),
+        Cd * rng.normal(1.0, 0.05, n_reatores),
+        rng.uniform(0.4, 0.6, n_reatores),   # h0 (m)
+        rng.uniform(20.0, 30.0, n_reatores), # T0 (°C)
+        np.zeros(n_reatores),                # CA0 (mol/L)
+    ])
+
+    t_span = np.linspace(0, 150, 500)
+    trajetorias, bandas = simular_ensemble_reator(matriz_parametros, t_span)
+
+    T_maxima = trajetorias[:, :, 1].max(axis=1)
+    probabilidade = np.mean(T_maxima > T_disparo)
+    print(f"Reatores simulados: {n_reatores}")
+    print(f"Temperatura máxima mediana: {np.median(T_maxima):.2f} °C")
+    print(f"Probabilidade de disparo (T > {T_disparo:.1f} °C): {probabilidade:.2%}")
+    return trajetorias, bandas, probabilidade
@@ -0,0 +1,243 @@
+"""
+Estados estacionários do reator da Tarefa 4: solução direta pelo método de
+Newton e continuação paramétrica (pseudo-comprimento de arco), com a
+estabilidade de cada ponto do ramo.
+"""
+import numpy as np
+import matplotlib.pyplot as plt
+import seaborn as sns
+import pandas as pd
+from modelo_reator import arrhenius, balancos_reator, estado_escalar, jacobiano_balancos
+from simulacao_reator import PerfilPorPartes, calcular_entradas, montar_parametros, reactor_jacobiano, reactor_odes
+
+# --- Estado Estacionário (Newton) e Continuação Paramétrica ---
+# Parâmetros de continuação que são perfis de entrada: viram perfis constantes
+PERFIS_CONTINUACAO = {'Q_entrada_base': 'Q_entrada_base_func', 'T_entrada': 'T_entrada_func',
+                      'CA_entrada': 'CA_entrada_func'}
+
+def substituir_parametro(params, nome, valor):
+    """
+    Retorna uma cópia de params com um parâmetro trocado. Os nomes de
+    PERFIS_CONTINUACAO são substituídos por um perfil constante.
+    """
+    if nome in PERFIS_CONTINUACAO:
+        nome, valor = PERFIS_CONTINUACAO[nome], PerfilPorPartes.constante(valor)
+    return params.substituir(**{nome: valor})
+
+# --- Cinética na Temperatura do Reator (opcional) ---
+# No código 38 a constante de velocidade usa a temperatura de entrada, então o
+# calor de reação não realimenta a cinética e o reator tem um único estado
+# estacionário. Com cinetica_no_reator=True, os estudos abaixo usam k(T) na
+# temperatura do reator (como nos códigos 36 e 37), com as mesmas entradas.
+def reactor_odes_cinetica_no_reator(Y, t, params):
+    """reactor_odes com a constante de velocidade calculada na temperatura do reator."""
+    h, T, CA = estado_escalar(Y)
+    Q_entrada, _, Q_aquecedor, _, T_entrada, CA_entrada = calcular_entradas(h, T, t, params)
+    return balancos_reator(h, T, CA, Q_entrada, Q_aquecedor, T_entrada, CA_entrada,
+                           arrhenius(params.k0, params.Ea_R, T), params)
+
+def reactor_jacobiano_cinetica_no_reator(Y, t, params):
+    """Jacobiano analítico de reactor_odes_cinetica_no_reator (inclui dk/dT)."""
+    h, T, CA = estado_escalar(Y)
+    Q_entrada, dQe_dh, Q_aquecedor, dQa_dT, T_entrada, CA_entrada = calcular_entradas(h, T, t, params)
+    k_arrhenius = arrhenius(params.k0, params.Ea_R, T)
+    dk_dT = k_arrhenius * params.Ea_R / (T + 273.15)**2
+    return jacobiano_balancos(h, T, CA, Q_entrada, Q_aquecedor, T_entrada, CA_entrada, k_arrhenius,
+                              dk_dT, dQe_dh, dQa_dT, params)
+
+def modelo_estacionario(cinetica_no_reator=False):
+    """Retorna o par (EDOs, Jacobiano) usado pelos estudos de estado estacionário."""
+    if cinetica_no_reator:
+        return reactor_odes_cinetica_no_reator, reactor_jacobiano_cinetica_no_reator
+    return reactor_odes, reactor_jacobiano
+
+def resolver_estado_estacionario(params=None, Y_inicial=(1.0, 50.0, 0.5), t_ref=0.0, tol=1e-10, max_iter=50,
+                                 cinetica_no_reator=False):
+    """
+    Resolve f(h, T, CA) = 0 diretamente pelo método de Newton com o Jacobiano
+    analítico, com os perfis avaliados no instante t_ref. Cada passo é
+    reduzido à metade enquanto não diminuir o resíduo (busca linear); se
+    nem um passo 10⁶ vezes menor diminuir o resíduo, o método desiste.
+    Com cinetica_no_reator=True, k é calculado na temperatura do reator
+    (reactor_odes_cinetica_no_reator).
+
+    Returns:
+        np.ndarray: Estado estacionário (h, T, CA).
+
+    Raises:
+        RuntimeError: Se o método não convergir em max_iter iterações ou
+            se a busca linear não encontrar um passo que diminua o resíduo.
+    """
+    if params is None:
+        params = montar_parametros()
+    odes, jacobiano = modelo_estacionario(cinetica_no_reator)
+    Y = np.asarray(Y_inicial, dtype=float)
+    residuo = np.asarray(odes(Y, t_ref, params))
+    for _ in range(max_iter):
+        if np.linalg.norm(residuo) < tol:
+            return Y
+        passo = np.linalg.solve(jacobiano(Y, t_ref, params), -residuo)
+        fator = 1.0
+        while fator > 1e-6:
+            Y_novo = Y + fator * passo
+            residuo_novo = np.asarray(odes(Y_novo, t_ref, params))
+            if Y_novo[0] > 0 and np.linalg.norm(residuo_novo) < np.linalg.norm(residuo):
+                break
+            fator /= 2
+        else:
+            raise RuntimeError(f"A busca linear do método de Newton falhou em Y = {Y} "
+                               f"(resíduo = {np.linalg.norm(residuo):.3e}).")
+        Y, residuo = Y_novo, residuo_novo
+    if np.linalg.norm(residuo) < tol:
+        return Y
+    raise RuntimeError(f"O método de Newton não convergiu (resíduo = {np.linalg.norm(residuo):.3e}).")
+
+def continuar_estado_estacionario(nome_parametro, valor_inicial, valor_final, params=None,
+                                  Y_inicial=(1.0, 50.0, 0.5), escala_log=None, passo=0.05,
+                                  passo_max=0.5, max_passos=1000, t_ref=0.0, tol=1e-9, cinetica_no_reator=False):
+    """
+    Traça o ramo de estados estacionários enquanto um parâmetro varia, pelo
+    método da continuação pseudo-comprimento de arco (preditor tangente +
+    corretor de Newton no sistema aumentado). Diferente de uma varredura
+    simples, o método contorna pontos de virada (ignição/extinção), onde o
+    ramo dobra e o parâmetro volta para trás.
+
+    Args:
+        nome_parametro (str): 'Q_entrada_base', 'T_entrada', 'CA_entrada' ou
+            qualquer nome numérico de NOMES_PARAMETROS (ex.: 'k0').
+        valor_inicial, valor_final (float): Faixa do parâmetro.
+        params (ParametrosReator, opcional): Parâmetros base (padrão: montar_parametros()).
+        Y_inicial (array_like, opcional): Estimativa inicial do estado.
+        escala_log (bool, opcional): Continuar em log10 do parâmetro.
+            Padrão: True para 'k0', False para os demais.
+        passo, passo_max (float, opcional): Comprimento de arco inicial e máximo.
+        max_passos (int, opcional): Número máximo de pontos do ramo.
+        cinetica_no_reator (bool, opcional): Calcula k na temperatura do
+            reator (ver reactor_odes_cinetica_no_reator).
+
+    Returns:
+        tuple: (df_ramo, pontos_de_virada). df_ramo tem uma linha por ponto,
+        com o parâmetro, h, T, CA, a maior parte real dos autovalores do
+        Jacobiano e a estabilidade; pontos_de_virada lista os índices i tais
+        que o ramo dobra entre as linhas i e i + 1.
+    """
+    if params is None:
+        params = montar_parametros()
+    if escala_log is None:
+        escala_log = nome_parametro == 'k0'
+    converter = (lambda lam: 10.0**lam) if escala_log else (lambda lam: lam)
+    lam_inicial, lam_final = (np.log10([valor_inicial, valor_final]) if escala_log
+                              else (float(valor_inicial), float(valor_final)))
+    sentido = np.sign(lam_final - lam_inicial)
+    odes, jacobiano = modelo_estacionario(cinetica_no_reator)
+
+    def F(Y, lam):
+        return np.asarray(odes(Y, t_ref, substituir_parametro(params, nome_parametro, converter(lam))))
+
+    def dF_dlam(Y, lam, d=1e-6):
+        d = d * max(1.0, abs(lam))
+        return (F(Y, lam + d) - F(Y, lam - d)) / (2 * d)
+
+    def J(Y, lam):
+        return jacobiano(Y, t_ref, substituir_parametro(params, nome_parametro, converter(lam)))
+
+    def matriz_aumentada(x, tangente):
+        # Jacobiano do sistema aumentado [F(Y, λ); tangente·(x - x_predito)]
+        matriz = np.zeros((4, 4))
+        matriz[:3, :3] = J(x[:3], x[3])
+        matriz[:3, 3] = dF_dlam(x[:3], x[3])
+        matriz[3, :] = tangente
+        return matriz
+
+    # Ponto inicial e tangente (dY/ds, dλ/ds), orientada para valor_final
+    Y = resolver_estado_estacionario(substituir_parametro(params, nome_parametro, converter(lam_inicial)),
+                                     Y_inicial, t_ref, cinetica_no_reator=cinetica_no_reator)
+    lam = lam_inicial
+    tangente = np.append(np.linalg.solve(J(Y, lam), -dF_dlam(Y, lam)), 1.0)
+    tangente *= sentido / np.linalg.norm(tangente)
+
+    linhas, pontos_de_virada = [], []
+    for _ in range(max_passos):
+        autovalores = np.linalg.eigvals(J(Y, lam))
+        linhas.append({nome_parametro: converter(lam), 'h (m)': Y[0], 'T (°C)': Y[1], 'CA (mol/L)': Y[2],
+                       'Maior Parte Real': autovalores.real.max(), 'Estável': bool(np.all(autovalores.real < 0))})
+        if sentido * (lam - lam_final) >= 0:
+            break
+
+        # Preditor ao longo da tangente + corretor de Newton no sistema aumentado
+        while True:
+            x_predito = np.append(Y, lam) + passo * tangente
+            x = x_predito.copy()
+            for iteracao in range(20):
+                G = np.append(F(x[:3], x[3]), tangente @ (x - x_predito))
+                if np.linalg.norm(G) < tol:
+                    break
+                x = x - np.linalg.solve(matriz_aumentada(x, tangente), G)
+            if np.linalg.norm(G) < tol and x[0] > 0:
+                break
+            passo /= 2 # Corretor falhou: reduz o comprimento de arco
+            if passo < 1e-8:
+                print("Continuação interrompida: o corretor não converge.")
+                return pd.DataFrame(linhas), pontos_de_virada
+
+        # Nova tangente: mesma orientação da anterior
+        nova_tangente = np.linalg.solve(matriz_aumentada(x, tangente), np.array([0.0, 0.0, 0.0, 1.0]))
+        nova_tangente /= np.linalg.norm(nova_tangente)
+
+        # Troca de sinal de dλ/ds: o ramo dobrou (ponto de virada) entre o último ponto e o novo
+        if np.sign(nova_tangente[3]) != np.sign(tangente[3]):
+            pontos_de_virada.append(len(linhas) - 1)
+        tangente = nova_tangente
+        Y, lam = x[:3], x[3]
+        if iteracao <= 3:
+            passo = min(passo * 1.5, passo_max) # Convergência fácil: aumenta o passo
+
+    return pd.DataFrame(linhas), pontos_de_virada
+
+def mapear_estados_estacionarios(nome_parametro='k0', valor_inicial=1.0e8, valor_final=1.0e14, plotar=True,
+                                 cinetica_no_reator=False, Y_inicial=(1.0, 50.0, 0.5), **alteracoes):
+    """
+    Traça e exibe o mapa de estados estacionários e sua estabilidade em função
+    de um parâmetro (alteracoes são repassadas a montar_parametros).
+
+    Limitação: com a cinética do código 38 (k na temperatura de entrada), o
+    calor de reação não realimenta a cinética, então o mapa padrão é um ramo
+    único, sem ignição nem extinção. Mesmo com cinetica_no_reator=True, a
+    elevação adiabática dos parâmetros padrão, (-ΔH)·CA_entrada/(ρ·Cp), é de
+    cerca de 0,01 °C, pequena demais para haver multiplicidade. A curva em S
+    aparece em um cenário bem exotérmico e sem o controle de temperatura, por
+    exemplo mapear_estados_estacionarios(valor_inicial=1e6,
+    cinetica_no_reator=True, Kp_temp=0.0, Cp_J_kg_C=41.86,
+    delta_H_reacao=-5e6), com ignição perto de k0 = 1,8e10 e extinção perto
+    de k0 = 2,7e9.
+    """
+    print(f"--- Mapa de Estados Estacionários em Função de {nome_parametro} ---")
+    df_ramo, pontos_de_virada = continuar_estado_estacionario(nome_parametro, valor_inicial, valor_final,
+                                                              params=montar_parametros(**alteracoes),
+                                                              Y_inicial=Y_inicial,
+                                                              cinetica_no_reator=cinetica_no_reator)
+    print(df_ramo.iloc[::max(len(df_ramo) // 10, 1)])
+    if pontos_de_virada:
+        for indice in pontos_de_virada:
+            print(f"Ponto de virada (ignição/extinção) próximo de {nome_parametro} = "
+                  f"{df_ramo[nome_parametro].iloc[indice]:.4g}")
+    else:
+        print("Nenhum ponto de virada: há um único estado estacionário nessa faixa.")
+
+    if plotar:
+        sns.set_style("whitegrid")
+        fig, eixos = plt.subplots(3, 1, figsize=(10, 10), sharex=True)
+        for eixo, coluna in zip(eixos, ('h (m)', 'T (°C)', 'CA (mol/L)')):
+            estavel = df_ramo[coluna].where(df_ramo['Estável'])
+            instavel = df_ramo[coluna].where(~df_ramo['Estável'])
+            eixo.plot(df_ramo[nome_parametro], estavel, color='blue', linewidth=2, label='Estável')
+            eixo.plot(df_ramo[nome_parametro], instavel, color='red', linestyle='--', linewidth=2, label='Instável')
+            eixo.set_ylabel(coluna)
+            eixo.legend(loc='best')
+        if nome_parametro == 'k0':
+            eixos[-1].set_xscale('log')
+        eixos[-1].set_xlabel(nome_parametro)
+        eixos[0].set_title('Estados Estacionários do Reator')
+        plt.tight_layout()
+        plt.show()
+    return df_ramo, pontos_de_virada
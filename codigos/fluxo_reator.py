@@ -0,0 +1,192 @@
+"""
+Simulação longa do reator da Tarefa 4 em fluxo: janelas integradas em
+sequência e gravadas em um armazenamento colunar em disco, com memória
+constante e checkpoints para retomar uma execução interrompida.
+"""
+import hashlib
+import json
+import os
+import numpy as np
+from simulacao_reator import (assinatura_modelo, calcular_sinais_reator, descrever_parametros,
+                              integrar_por_segmentos, montar_parametros, obter_pontos_de_quebra,
+                              reactor_jacobiano, reactor_odes)
+
+# --- Simulação Longa em Fluxo (janelas gravadas em disco) ---
+def gerar_simulacao_em_janelas(params=None, Y0=(0.5, 25.0, 0.0), tempo_max=150, passo_saida=1 / 60,
+                               janela=60.0, decimacao=1, metodo=None, retomada=None):
+    """
+    Gerador que integra o reator janela a janela e entrega cada trecho da
+    solução assim que ele fica pronto, sem guardar a trajetória inteira: a
+    memória usada depende só do tamanho da janela, não do horizonte.
+
+    Args:
+        params (ParametrosReator, opcional): Parâmetros (padrão: montar_parametros()).
+        Y0 (array_like, opcional): Condições iniciais (h0, T0, CA0).
+        tempo_max (float, opcional): Horizonte de simulação (min).
+        passo_saida (float, opcional): Espaçamento dos pontos de saída (min). Padrão: 1 s.
+        janela (float, opcional): Duração de cada janela de integração (min).
+        decimacao (int, opcional): Entrega um ponto a cada `decimacao` pontos de saída.
+        metodo (str, opcional): Como em executar_simulacao.
+        retomada (tuple, opcional): Ponto de retomada (indice, estado)
+            entregue por uma execução anterior com as mesmas opções; a
+            simulação continua dali como se não tivesse sido interrompida.
+
+    Yields:
+        tuple: (trecho, retomada). trecho é um dicionário com as colunas
+        ('tempo', 'h', 'T', 'CA' e os sinais de calcular_sinais_reator),
+        todas com o mesmo tamanho; retomada é o ponto (indice, estado) a
+        partir do qual a janela seguinte é integrada.
+    """
+    if params is None:
+        params = montar_parametros()
+    pontos_de_quebra = obter_pontos_de_quebra(*params.perfis())
+    passo = passo_saida * decimacao
+    n_pontos = int(round(tempo_max / passo)) + 1
+    pontos_por_janela = max(int(round(janela / passo)), 1)
+
+    Y = np.asarray(Y0, dtype=float)
+    t_anterior = None
+    primeiro = 0
+    if retomada is not None:
+        primeiro, Y = retomada
+        Y = np.array(Y, dtype=float)
+        t_anterior = (primeiro - 1) * passo
+    for inicio in range(primeiro, n_pontos, pontos_por_janela):
+        # Tempos calculados a partir do índice global, sem acumular erro de arredondamento
+        t_janela = np.arange(inicio, min(inicio + pontos_por_janela, n_pontos)) * passo
+        if t_anterior is None:
+            solucao = np.empty((len(t_janela), 3))
+            solucao[0] = Y
+            if len(t_janela) > 1:
+                solucao, _ = integrar_por_segmentos(reactor_odes, Y, t_janela, args=(params,),
+                                                    pontos_de_quebra=pontos_de_quebra,
+                                                    metodo=metodo, jacobiano=reactor_jacobiano)
+        else:
+            # A janela parte do último ponto entregue, que não é repetido
+            solucao, _ = integrar_por_segmentos(reactor_odes, Y, np.concatenate(([t_anterior], t_janela)),
+                                                args=(params,), pontos_de_quebra=pontos_de_quebra,
+                                                metodo=metodo, jacobiano=reactor_jacobiano)
+            solucao = solucao[1:]
+        Y, t_anterior = solucao[-1].copy(), t_janela[-1]
+
+        solucao[:, [0, 2]] = np.maximum(solucao[:, [0, 2]], 0.0) # Altura e concentração não negativas
+        sinais = calcular_sinais_reator(solucao[:, 0], solucao[:, 1], solucao[:, 2], t_janela, params)
+        trecho = {'tempo': t_janela, 'h': solucao[:, 0], 'T': solucao[:, 1], 'CA': solucao[:, 2]}
+        trecho.update((nome, np.broadcast_to(valor, t_janela.shape)) for nome, valor in sinais.items())
+        yield trecho, (inicio + len(t_janela), Y)
+
+def gravar_checkpoint(nome_arquivo, retomada, n_linhas, chave, colunas):
+    """
+    Grava um checkpoint binário compacto (.npz): o estado do solver sem
+    arredondamentos, o índice do próximo ponto (que fixa o tempo e a posição
+    nos perfis), as linhas já gravadas, as colunas e a chave da simulação. A escrita
+    passa por um arquivo temporário, então um checkpoint nunca fica pela metade.
+    """
+    indice, estado = retomada
+    caminho_temporario = f"{nome_arquivo}.{os.getpid()}.tmp.npz"
+    np.savez(caminho_temporario, estado=np.asarray(estado, dtype=np.float64), indice=np.int64(indice),
+             n_linhas=np.int64(n_linhas), chave=np.array(chave), colunas=np.array(list(colunas)))
+    os.replace(caminho_temporario, nome_arquivo)
+
+def ler_checkpoint(nome_arquivo):
+    """Lê um checkpoint de gravar_checkpoint e retorna (retomada, n_linhas, chave, colunas)."""
+    with np.load(nome_arquivo) as dados:
+        return ((int(dados['indice']), dados['estado'].copy()), int(dados['n_linhas']), str(dados['chave']),
+                [str(nome) for nome in dados['colunas']])
+
+def gravar_simulacao_em_disco(pasta_saida, float32=False, arquivo_checkpoint=None, reiniciar=False,
+                              janelas_por_checkpoint=1, **opcoes_simulacao):
+    """
+    Consome gerar_simulacao_em_janelas e acrescenta cada trecho a um
+    armazenamento colunar em disco: um arquivo binário por coluna
+    (<coluna>.bin, lido com ler_simulacao_em_disco) e um metadados.json
+    com as colunas, o tipo e o número de linhas.
+
+    Com arquivo_checkpoint, um checkpoint (gravar_checkpoint) é salvo a cada
+    janelas_por_checkpoint janelas, depois que as colunas foram gravadas.
+    Com reiniciar=True, a simulação retoma do último checkpoint: as colunas
+    são cortadas no ponto do checkpoint e a integração continua do estado
+    salvo, produzindo exatamente os mesmos bytes de uma execução sem
+    interrupção.
+
+    Args:
+        pasta_saida (str): Pasta do armazenamento (criada se não existir;
+            sem reinício, arquivos de uma gravação anterior são substituídos).
+        float32 (bool, opcional): Grava em float32, com metade do espaço
+            (a coluna de tempo é sempre float64).
+        arquivo_checkpoint (str, opcional): Caminho do arquivo de checkpoint.
+        reiniciar (bool, opcional): Retoma do checkpoint, se ele existir.
+        janelas_por_checkpoint (int, opcional): Frequência dos checkpoints.
+        **opcoes_simulacao: Repassadas a gerar_simulacao_em_janelas
+            (params, Y0, tempo_max, passo_saida, janela, decimacao, metodo).
+
+    Returns:
+        dict: Os metadados gravados.
+
+    Raises:
+        ValueError: Se o checkpoint for de uma simulação com outras opções.
+    """
+    os.makedirs(pasta_saida, exist_ok=True)
+    tipo = np.float32 if float32 else np.float64
+
+    # Chave da simulação: parâmetros, opções de saída e código do modelo
+    params = opcoes_simulacao.get('params') or montar_parametros()
+    opcoes = {nome: valor for nome, valor in opcoes_simulacao.items() if nome != 'params'}
+    opcoes['Y0'] = list(map(float, opcoes.get('Y0', (0.5, 25.0, 0.0))))
+    chave = hashlib.sha256(json.dumps([descrever_parametros(params), sorted(opcoes.items()),
+                                       np.dtype(tipo).name, assinatura_modelo()]).encode('utf-8')).hexdigest()[:32]
+
+    retomada, n_linhas, modo, colunas = None, 0, 'wb', []
+    if reiniciar and arquivo_checkpoint and os.path.exists(arquivo_checkpoint):
+        retomada, n_linhas, chave_checkpoint, colunas = ler_checkpoint(arquivo_checkpoint)
+        if chave_checkpoint != chave:
+            raise ValueError(f"O checkpoint {arquivo_checkpoint} é de uma simulação com outros parâmetros ou opções.")
+        modo = 'r+b'
+        print(f"Retomando do checkpoint: {n_linhas} pontos já gravados.")
+
+    passo = opcoes_simulacao.get('passo_saida', 1 / 60) * opcoes_simulacao.get('decimacao', 1)
+    n_total = int(round(opcoes_simulacao.get('tempo_max', 150) / passo)) + 1
+    arquivos = {}
+    try:
+        geradas = 0
+        for trecho, ponto_de_retomada in gerar_simulacao_em_janelas(**opcoes_simulacao, retomada=retomada):
+            for nome, valores in trecho.items():
+                tipo_coluna = np.float64 if nome == 'tempo' else tipo
+                if nome not in arquivos:
+                    arquivos[nome] = open(os.path.join(pasta_saida, f"{nome}.bin"), modo)
+                    # Descarta o que foi gravado depois do checkpoint (execução interrompida)
+                    arquivos[nome].truncate(n_linhas * np.dtype(tipo_coluna).itemsize)
+                    arquivos[nome].seek(0, os.SEEK_END)
+                np.asarray(valores, dtype=tipo_coluna).tofile(arquivos[nome])
+            n_linhas += len(trecho['tempo'])
+
+            geradas += 1
+            ultima = n_linhas == n_total
+            if arquivo_checkpoint and (geradas % janelas_por_checkpoint == 0 or ultima):
+                for arquivo in arquivos.values():
+                    arquivo.flush() # As colunas vão para o disco antes do checkpoint que as referencia
+                gravar_checkpoint(arquivo_checkpoint, ponto_de_retomada, n_linhas, chave, arquivos)
+    finally:
+        for arquivo in arquivos.values():
+            arquivo.close()
+
+    # Se o checkpoint já estava no fim, nenhuma coluna foi reaberta: as colunas
+    # vêm do checkpoint (os metadados podem não ter sido gravados antes da interrupção)
+    metadados = {'colunas': list(arquivos) or colunas, 'tipo': np.dtype(tipo).name, 'n_linhas': n_linhas}
+    with open(os.path.join(pasta_saida, 'metadados.json'), 'w', encoding='utf-8') as arquivo:
+        json.dump(metadados, arquivo, indent=2)
+    return metadados
+
+def ler_simulacao_em_disco(pasta_saida, colunas=None):
+    """
+    Abre as colunas gravadas por gravar_simulacao_em_disco como arrays
+    mapeados em memória (np.memmap): nada é carregado até ser acessado.
+    """
+    with open(os.path.join(pasta_saida, 'metadados.json'), encoding='utf-8') as arquivo:
+        metadados = json.load(arquivo)
+    resultado = {}
+    for nome in colunas or metadados['colunas']:
+        tipo = np.float64 if nome == 'tempo' else metadados['tipo']
+        resultado[nome] = np.memmap(os.path.join(pasta_saida, f"{nome}.bin"), dtype=tipo, mode='r',
+                                    shape=(metadados['n_linhas'],))
+    return resultado
@@ -0,0 +1,101 @@
+"""
+Instrumentação das simulações dos códigos 29, 30, 33 e 38: contadores do
+solver e tempo de cada fase, em um relatório estruturado.
+
+Uma simulação instrumentada registra em um RelatorioSimulacao:
+
+- as estatísticas do solver: avaliações das EDOs (nfe) e do Jacobiano
+  (nje), passos aceitos (nst) e trocas de método do LSODA (mused), lidas do
+  full_output do odeint (ou do resultado do solve_ivp);
+- as chamadas efetivas da função das EDOs, contadas por um invólucro, e uma
+  estimativa dos passos rejeitados: o ODEPACK não os informa, mas, quando um
+  passo é rejeitado, o solver volta a avaliar as EDOs em um tempo anterior
+  ao da última tentativa, e cada recuo é contado;
+- o tempo de parede de cada fase: 'integrar' (solver), 'derivar' (cálculos
+  sobre a solução), 'tabular' (DataFrame e impressão dos resultados) e
+  'plotar' (figura).
+
+O relatório pode ser impresso (imprimir), convertido em dicionário
+(como_dicionario) ou acrescentado a um log em JSON Lines (gravar_json).
+"""
+import contextlib
+import datetime
+import json
+import time
+import numpy as np
+
+# Ordem de apresentação das fases
+FASES = ('integrar', 'derivar', 'tabular', 'plotar')
+
+class RelatorioSimulacao:
+    """Contadores do solver e tempos por fase de uma simulação."""
+
+    def __init__(self, nome):
+        self.nome = nome
+        self.fases = {}
+        self.solver = {'chamadas_edo': 0, 'passos_rejeitados': 0}
+        self._ultimo_t = -np.inf
+
+    @contextlib.contextmanager
+    def fase(self, nome):
+        """Cronometra o bloco e acumula o tempo (s) na fase indicada."""
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.fases[nome] = self.fases.get(nome, 0.0) + time.perf_counter() - inicio
+
+    def contar_chamadas(self, funcao_edo):
+        """
+        Envolve uma função f(Y, t, *args) no formato do odeint, contando as
+        chamadas e os recuos no tempo (passos rejeitados).
+        """
+        self._ultimo_t = -np.inf
+
+        def funcao_contada(Y, t, *args):
+            self.solver['chamadas_edo'] += 1
+            if t < self._ultimo_t:
+                self.solver['passos_rejeitados'] += 1
+            self._ultimo_t = t
+            return funcao_edo(Y, t, *args)
+        return funcao_contada
+
+    def registrar_odeint(self, info):
+        """Acumula as estatísticas do full_output do odeint de uma integração."""
+        self.registrar_estatisticas({'nfe': int(info['nfe'][-1]), 'nje': int(info['nje'][-1]),
+                                     'nst': int(info['nst'][-1]),
+                                     'trocas_metodo': int(np.count_nonzero(np.diff(info['mused'])))})
+        self.solver['metodo_final'] = 'BDF' if info['mused'][-1] == 2 else 'Adams'
+
+    def registrar_solve_ivp(self, resultado):
+        """Acumula as estatísticas de um resultado do solve_ivp (avaliações e fatorações LU)."""
+        self.registrar_estatisticas({'nfe': int(resultado.nfev), 'nje': int(resultado.njev),
+                                     'nlu': int(resultado.nlu)})
+
+    def registrar_estatisticas(self, estatisticas):
+        """Acumula um dicionário de estatísticas (ex.: o de integrar_por_segmentos do código 38)."""
+        for chave, valor in estatisticas.items():
+            self.solver[chave] = self.solver.get(chave, 0) + valor
+
+    def como_dicionario(self):
+        """Relatório em um dicionário simples (serializável em JSON)."""
+        fases = {nome: self.fases[nome] for nome in FASES if nome in self.fases}
+        fases.update({nome: duracao for nome, duracao in self.fases.items() if nome not in fases})
+        return {'simulacao': self.nome, 'solver': dict(self.solver),
+                'fases': fases, 'tempo_total': sum(fases.values())}
+
+    def gravar_json(self, nome_arquivo):
+        """Acrescenta o relatório, com data e hora, a um log em JSON Lines."""
+        registro = {'data': datetime.datetime.now().isoformat(timespec='seconds'), **self.como_dicionario()}
+        with open(nome_arquivo, 'a', encoding='utf-8') as arquivo:
+            arquivo.write(json.dumps(registro, ensure_ascii=False) + '\n')
+
+    def imprimir(self):
+        """Imprime o relatório em forma de tabela."""
+        relatorio = self.como_dicionario()
+        print(f"\n--- Perfil da Simulação: {self.nome} ---")
+        print("Solver: " + " | ".join(f"{chave}: {valor}" for chave, valor in relatorio['solver'].items()))
+        for nome, duracao in relatorio['fases'].items():
+            fracao = duracao / relatorio['tempo_total'] if relatorio['tempo_total'] > 0 else 0.0
+            print(f"  {nome:<10} {duracao * 1000:10.2f} ms ({fracao:6.1%})")
+        print(f"  {'total':<10} {relatorio['tempo_total'] * 1000:10.2f} ms")
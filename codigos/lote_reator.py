@@ -0,0 +1,119 @@
+"""
+Execução em lote de cenários do reator da Tarefa 4, sem interface gráfica:
+cenários lidos de um arquivo JSON, simulados em paralelo (um processo por
+núcleo) e gravados em um .npz por cenário.
+"""
+import json # Para ler os arquivos de cenários
+import os
+import time # Para medir o tempo de execução
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+import matplotlib.pyplot as plt
+from instrumentacao_solver import RelatorioSimulacao
+from simulacao_reator import (PerfilPorPartes, executar_simulacao, montar_dataframe, montar_parametros,
+                              plotar_resultados)
+
+# --- Execução em Lote de Cenários (sem interface gráfica) ---
+def carregar_cenarios(nome_arquivo):
+    """
+    Lê os cenários de um arquivo JSON: uma lista de cenários ou um objeto
+    com a chave "cenarios". Cada cenário pode conter:
+
+        "nome": nome usado nos arquivos de saída;
+        "parametros": alterações de montar_parametros (ex.: {"k0": 1e12});
+        "perfis": perfis por nome de parâmetro (ex.: "setpoint_nivel_func"),
+                  como número (constante), {"instantes", "valores", "rampas"}
+                  ou {"csv", "coluna_tempo", "coluna_valor", "coluna_rampa"};
+        "condicoes_iniciais": [h0, T0, CA0];
+        "tempo_max", "n_pontos" e "metodo".
+    """
+    with open(nome_arquivo, 'r', encoding='utf-8') as arquivo:
+        conteudo = json.load(arquivo)
+    cenarios = conteudo['cenarios'] if isinstance(conteudo, dict) else conteudo
+    for i, cenario in enumerate(cenarios):
+        cenario.setdefault('nome', f"cenario_{i:03d}")
+    return cenarios
+
+def construir_perfil(especificacao):
+    """Cria um PerfilPorPartes a partir da especificação de um cenário."""
+    if isinstance(especificacao, (int, float)):
+        return PerfilPorPartes.constante(especificacao)
+    if 'csv' in especificacao:
+        opcoes = {chave: especificacao[chave] for chave in ('coluna_tempo', 'coluna_valor', 'coluna_rampa')
+                  if chave in especificacao}
+        return PerfilPorPartes.de_csv(especificacao['csv'], **opcoes)
+    return PerfilPorPartes(especificacao['instantes'], especificacao['valores'], especificacao.get('rampas'))
+
+def montar_parametros_cenario(cenario):
+    """Converte as alterações de parâmetros e perfis de um cenário na tupla de reactor_odes."""
+    alteracoes = dict(cenario.get('parametros', {}))
+    for nome, especificacao in cenario.get('perfis', {}).items():
+        alteracoes[nome] = construir_perfil(especificacao)
+    return montar_parametros(**alteracoes)
+
+def executar_cenario(cenario, pasta_saida, gerar_grafico=False):
+    """
+    Simula um cenário e grava o resultado em um arquivo .npz comprimido
+    (uma coluna por variável). Usada pelos processos de executar_lote.
+
+    Returns:
+        dict: Resumo do cenário (nome, arquivo, duração, avaliações das EDOs
+        e o perfil da execução, em RelatorioSimulacao.como_dicionario()).
+    """
+    inicio = time.perf_counter()
+    relatorio = RelatorioSimulacao(cenario['nome'])
+    params = montar_parametros_cenario(cenario)
+    t_span, solucao, sinais, estatisticas = executar_simulacao(
+        params,
+        Y0=cenario.get('condicoes_iniciais', (0.5, 25.0, 0.0)),
+        tempo_max=cenario.get('tempo_max', 150),
+        n_pontos=cenario.get('n_pontos', 500),
+        metodo=cenario.get('metodo'),
+        relatorio=relatorio)
+
+    # Grava em um arquivo temporário e renomeia: um processo interrompido nunca deixa um .npz incompleto
+    with relatorio.fase('tabular'):
+        caminho = os.path.join(pasta_saida, f"{cenario['nome']}.npz")
+        caminho_temporario = os.path.join(pasta_saida, f"{cenario['nome']}.{os.getpid()}.tmp.npz")
+        colunas = {nome: np.broadcast_to(valor, t_span.shape) for nome, valor in sinais.items()}
+        np.savez_compressed(caminho_temporario, tempo=t_span, h=solucao[:, 0], T=solucao[:, 1], CA=solucao[:, 2], **colunas)
+        os.replace(caminho_temporario, caminho)
+
+    if gerar_grafico:
+        with relatorio.fase('plotar'):
+            plt.switch_backend('Agg') # Sem janelas: a figura vai direto para o arquivo
+            plotar_resultados(montar_dataframe(t_span, solucao, sinais),
+                              nome_arquivo=os.path.join(pasta_saida, f"{cenario['nome']}.png"))
+
+    return {'nome': cenario['nome'], 'arquivo': caminho,
+            'duracao': time.perf_counter() - inicio, 'nfe': estatisticas['nfe'],
+            'perfil': relatorio.como_dicionario()}
+
+def executar_lote(nome_arquivo_cenarios, pasta_saida='resultados_reator', processos=None, gerar_graficos=False):
+    """
+    Executa em paralelo (um processo por núcleo, por padrão) todos os cenários
+    de um arquivo JSON, gravando um .npz por cenário em pasta_saida.
+
+    Returns:
+        list: Resumos dos cenários concluídos (ver executar_cenario).
+    """
+    cenarios = carregar_cenarios(nome_arquivo_cenarios)
+    os.makedirs(pasta_saida, exist_ok=True)
+    print(f"--- Execução em Lote: {len(cenarios)} cenários ---")
+
+    inicio = time.perf_counter()
+    resumos = []
+    with ProcessPoolExecutor(max_workers=processos) as executor:
+        futuros = {executor.submit(executar_cenario, cenario, pasta_saida, gerar_graficos): cenario['nome']
+                   for cenario in cenarios}
+        for futuro in as_completed(futuros):
+            try:
+                resumo = futuro.result()
+            except Exception as e: # Um cenário com erro não interrompe o lote
+                print(f"Erro no cenário '{futuros[futuro]}': {e}")
+                continue
+            resumos.append(resumo)
+            print(f"{resumo['nome']}: {resumo['duracao']:.3f} s -> {resumo['arquivo']}")
+
+    print(f"Lote concluído: {len(resumos)}/{len(cenarios)} cenários em {time.perf_counter() - inicio:.2f} s.")
+    return resumos
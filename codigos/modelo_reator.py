@@ -0,0 +1,311 @@
+"""
+Modelo do reator do desafio (tanque aquecido com a reação A -> B), em um
+único módulo compartilhado pelos códigos 36, 37 e 38.
+
+Cada fórmula do modelo (Arrhenius, Torricelli, controladores P saturados e
+balanços de massa e energia) é escrita uma única vez, em funções que recebem
+o conjunto de operações a usar (argumento xp):
+
+- xp=np (padrão): arrays de estados (trajetória inteira após a integração,
+  ensemble ou rede de reatores);
+- xp=OPERACOES_ESCALARES: floats do Python, com o módulo math e comparações
+  simples. É o caminho do solver a cada avaliação das EDOs, pois np.sqrt,
+  np.exp e np.clip custam microssegundos de despacho em valores escalares
+  (arrays 0-d).
+
+As funções escalares usadas pelos códigos 36, 37 e 38 (arrhenius, saturar,
+controle_proporcional e balancos_reator) são apenas invólucros dessas
+fórmulas com xp=OPERACOES_ESCALARES.
+"""
+import math
+import time
+import numpy as np
+
+# Nomes dos parâmetros do reator, na ordem da antiga tupla de parâmetros
+NOMES_PARAMETROS = ('AT', 'Ao', 'Cd', 'g', 'rho', 'Cp_J_kg_C', 'k0', 'Ea_R', 'delta_H_reacao',
+                    'Q_entrada_max', 'Q_aquecedor_max', 'Q_resfriador_max', 'Kp_nivel', 'Kp_temp',
+                    'setpoint_nivel_func', 'setpoint_temperatura_func',
+                    'Q_entrada_base_func', 'T_entrada_func', 'CA_entrada_func')
+
+# --- Parâmetros do Reator ---
+class ParametrosReator:
+    """
+    Parâmetros do reator em um objeto imutável e leve (__slots__).
+
+    O acesso por atributo (p.AT, p.k0, ...) substitui o desempacotamento de
+    uma tupla de 19 posições a cada chamada das EDOs. Para trocar valores,
+    use substituir(), que retorna um novo objeto. Os limites dos atuadores,
+    os ganhos e os perfis (setpoints e distúrbios) só são usados pelo
+    código 38 e podem ser omitidos nos demais.
+
+    O objeto também pode ser percorrido (e desempacotado) como a antiga
+    tupla, na ordem de NOMES_PARAMETROS.
+    """
+
+    __slots__ = NOMES_PARAMETROS
+
+    def __init__(self, AT, Ao, Cd, g, rho, Cp_J_kg_C, k0, Ea_R, delta_H_reacao,
+                 Q_entrada_max=math.inf, Q_aquecedor_max=math.inf, Q_resfriador_max=-math.inf,
+                 Kp_nivel=0.0, Kp_temp=0.0, setpoint_nivel_func=None, setpoint_temperatura_func=None,
+                 Q_entrada_base_func=None, T_entrada_func=None, CA_entrada_func=None):
+        valores = locals()
+        for nome in NOMES_PARAMETROS:
+            object.__setattr__(self, nome, valores[nome])
+
+    def __setattr__(self, nome, valor):
+        raise AttributeError("ParametrosReator é imutável; use substituir() para alterar valores.")
+
+    def __delattr__(self, nome):
+        raise AttributeError("ParametrosReator é imutável; use substituir() para alterar valores.")
+
+    def __iter__(self):
+        return (getattr(self, nome) for nome in NOMES_PARAMETROS)
+
+    def __reduce__(self):
+        # Necessário para o pickle (ex.: ProcessPoolExecutor), já que __setattr__ está bloqueado
+        return (ParametrosReator, tuple(self))
+
+    def __repr__(self):
+        return 'ParametrosReator(' + ', '.join(f'{nome}={valor!r}' for nome, valor in self.como_dicionario().items()) + ')'
+
+    def como_dicionario(self):
+        """Retorna os parâmetros como dicionário {nome: valor}."""
+        return dict(zip(NOMES_PARAMETROS, self))
+
+    def substituir(self, **alteracoes):
+        """Retorna uma cópia com os parâmetros informados trocados (ex.: p.substituir(k0=1e13))."""
+        desconhecidos = set(alteracoes) - set(NOMES_PARAMETROS)
+        if desconhecidos:
+            raise ValueError(f"Parâmetros desconhecidos: {sorted(desconhecidos)}")
+        valores = self.como_dicionario()
+        valores.update(alteracoes)
+        return ParametrosReator(**valores)
+
+    def perfis(self):
+        """Retorna as cinco funções de perfil (setpoints e distúrbios)."""
+        return (self.setpoint_nivel_func, self.setpoint_temperatura_func,
+                self.Q_entrada_base_func, self.T_entrada_func, self.CA_entrada_func)
+
+# --- Operações Elementares (NumPy ou floats do Python) ---
+class OperacoesEscalares:
+    """
+    Subconjunto da interface do NumPy usado pelas fórmulas do modelo (sqrt,
+    exp, maximum, clip e where), implementado para floats do Python.
+    """
+
+    sqrt = staticmethod(math.sqrt)
+    exp = staticmethod(math.exp)
+
+    @staticmethod
+    def maximum(a, b):
+        return a if a >= b else b
+
+    @staticmethod
+    def clip(valor, minimo, maximo):
+        if valor < minimo:
+            return minimo
+        if valor > maximo:
+            return maximo
+        return valor
+
+    @staticmethod
+    def where(condicao, se_verdadeiro, se_falso):
+        return se_verdadeiro if condicao else se_falso
+
+OPERACOES_ESCALARES = OperacoesEscalares()
+
+def estado_escalar(Y):
+    """
+    Converte o vetor de estado do solver em floats do Python: desempacotar
+    o ndarray diretamente gera escalares NumPy, cuja aritmética é mais lenta.
+    """
+    return Y.tolist() if isinstance(Y, np.ndarray) else Y
+
+# --- Fórmulas do Modelo (fonte única) ---
+def arrhenius_vetorizado(k0, Ea_R, T, xp=np):
+    """Constante de velocidade k = k0·exp(-Ea/(R·T)), com T em °C."""
+    return k0 * xp.exp(-Ea_R / (T + 273.15))
+
+def controle_proporcional_vetorizado(base, ganho, erro, minimo, maximo, xp=np):
+    """
+    Ação de um controlador P saturado nos limites do atuador.
+
+    Returns:
+        tuple: (acao, d(acao)/d(erro)), com derivada nula quando o atuador satura.
+    """
+    acao = base + ganho * erro
+    livre = (acao > minimo) & (acao < maximo)
+    return xp.clip(acao, minimo, maximo), xp.where(livre, ganho, 0.0)
+
+def vazao_saida(h, p, xp=np):
+    """Vazão de saída pela Lei de Torricelli, nula com o tanque vazio (h <= 0)."""
+    return p.Cd * p.Ao * xp.sqrt(2 * p.g * xp.maximum(h, 0.0))
+
+def volume_liquido(h, p, xp=np):
+    """Volume de líquido, limitado a 1e-6 m^3 para evitar divisão por zero."""
+    return xp.maximum(p.AT * h, 1e-6)
+
+def sinais_intermediarios(h, CA, k_arrhenius, p, xp=np):
+    """
+    Vazão de saída, volume, taxa de reação e calor de reação.
+
+    Returns:
+        dict: 'Q_saida', 'V_liquido', 'r_A' e 'Q_reacao'.
+    """
+    V_liquido = volume_liquido(h, p, xp)
+    r_A = k_arrhenius * CA
+    return {
+        'Q_saida': vazao_saida(h, p, xp),
+        'V_liquido': V_liquido,
+        'r_A': r_A,
+        'Q_reacao': (-p.delta_H_reacao) * r_A * V_liquido,
+    }
+
+def derivadas_balancos(h, T, CA, Q_entrada, Q_saida, V_liquido, r_A, Q_aquecedor, T_entrada, CA_entrada, p, xp=np):
+    """
+    Balanços de massa total, de energia e do componente A a partir das
+    vazões, do volume e da taxa de reação. Com o tanque vazio (h <= 0) não
+    há saída, e a temperatura e a concentração ficam congeladas.
+
+    Returns:
+        tuple: (dhdt, dTdt, dCAdt), com o formato de h.
+    """
+    Q_reacao = (-p.delta_H_reacao) * r_A * V_liquido
+    capacidade_termica = V_liquido * p.rho * p.Cp_J_kg_C
+    vazio = h <= 0
+
+    dhdt = (Q_entrada - Q_saida) / p.AT
+    dTdt = xp.where(vazio, 0.0,
+                    (Q_entrada * (T_entrada - T) / V_liquido) +
+                    (Q_reacao / capacidade_termica) +
+                    (Q_aquecedor / capacidade_termica))
+    dCAdt = xp.where(vazio, 0.0, (Q_entrada * CA_entrada - Q_saida * CA - V_liquido * r_A) / V_liquido)
+    return dhdt, dTdt, dCAdt
+
+def balancos_reator_vetorizado(h, T, CA, sinais, p):
+    """
+    Balanços do reator para arrays de estados. O dicionário sinais traz as
+    entradas ('Q_entrada', 'Q_aquecedor', 'T_entrada', 'CA_entrada') e os
+    sinais de sinais_intermediarios ('Q_saida', 'V_liquido', 'r_A').
+
+    Returns:
+        tuple: (dhdt, dTdt, dCAdt), com o formato de h.
+    """
+    return derivadas_balancos(h, T, CA, sinais['Q_entrada'], sinais['Q_saida'], sinais['V_liquido'], sinais['r_A'],
+                              sinais['Q_aquecedor'], sinais['T_entrada'], sinais['CA_entrada'], p)
+
+# --- Núcleo Escalar (caminho rápido do solver) ---
+def arrhenius(k0, Ea_R, T):
+    """arrhenius_vetorizado para floats do Python."""
+    return arrhenius_vetorizado(k0, Ea_R, T, OPERACOES_ESCALARES)
+
+def saturar(valor, minimo, maximo):
+    """Equivalente escalar de np.clip."""
+    return OPERACOES_ESCALARES.clip(valor, minimo, maximo)
+
+def controle_proporcional(base, ganho, erro, minimo, maximo):
+    """controle_proporcional_vetorizado para floats do Python."""
+    return controle_proporcional_vetorizado(base, ganho, erro, minimo, maximo, OPERACOES_ESCALARES)
+
+def balancos_reator(h, T, CA, Q_entrada, Q_aquecedor, T_entrada, CA_entrada, k_arrhenius, p):
+    """
+    Balanços de massa total, de energia e do componente A (escalares).
+
+    Args:
+        h, T, CA (float): Altura (m), temperatura (°C) e concentração (mol/L).
+        Q_entrada, Q_aquecedor (float): Vazão de entrada (m^3/min) e calor do aquecedor (J/min).
+        T_entrada, CA_entrada (float): Temperatura e concentração da corrente de entrada.
+        k_arrhenius (float): Constante de velocidade (min^-1), calculada por quem chama
+            (o código 38 usa a temperatura de entrada; os códigos 36 e 37, a do reator).
+        p (ParametrosReator): Parâmetros do reator.
+
+    Returns:
+        tuple: (dhdt, dTdt, dCAdt).
+    """
+    xp = OPERACOES_ESCALARES
+    return derivadas_balancos(h, T, CA, Q_entrada, vazao_saida(h, p, xp), volume_liquido(h, p, xp), k_arrhenius * CA,
+                              Q_aquecedor, T_entrada, CA_entrada, p, xp)
+
+def jacobiano_balancos(h, T, CA, Q_entrada, Q_aquecedor, T_entrada, CA_entrada, k_arrhenius,
+                       dk_dT, dQe_dh, dQa_dT, p):
+    """
+    Jacobiano analítico J[i, j] = d(dY_i/dt)/dY_j de balancos_reator, com as
+    linhas (dh/dt, dT/dt, dCA/dt) e as colunas (h, T, CA).
+
+    As derivadas das entradas em relação ao estado vêm de quem chama:
+    dk_dT (nula se k depende só da temperatura de entrada), dQe_dh e dQa_dT
+    (nulas sem controladores ou com os atuadores saturados).
+    """
+    J = np.zeros((3, 3))
+
+    # Vazão de saída e sua derivada: dQs/dh = Qs / (2h)
+    if h <= 0:
+        J[0, 0] = dQe_dh / p.AT
+        return J # dT/dt e dCA/dt são nulos com o tanque vazio
+    Q_saida = vazao_saida(h, p, OPERACOES_ESCALARES)
+    dQs_dh = Q_saida / (2 * h)
+
+    V_liquido = volume_liquido(h, p, OPERACOES_ESCALARES)
+    dV_dh = p.AT if p.AT * h > 1e-6 else 0.0
+    rho_Cp = p.rho * p.Cp_J_kg_C
+
+    # Linha de dh/dt
+    J[0, 0] = (dQe_dh - dQs_dh) / p.AT
+
+    # Linha de dT/dt (o termo de reação não depende de V, pois Q_reacao/V_liquido = -ΔH·r_A)
+    J[1, 0] = dQe_dh * (T_entrada - T) / V_liquido - \
+              (Q_entrada * (T_entrada - T) + Q_aquecedor / rho_Cp) * dV_dh / V_liquido**2
+    J[1, 1] = -Q_entrada / V_liquido + dQa_dT / (V_liquido * rho_Cp) + (-p.delta_H_reacao) * dk_dT * CA / rho_Cp
+    J[1, 2] = (-p.delta_H_reacao) * k_arrhenius / rho_Cp
+
+    # Linha de dCA/dt
+    J[2, 0] = (dQe_dh * CA_entrada - dQs_dh * CA) / V_liquido - \
+              (Q_entrada * CA_entrada - Q_saida * CA) * dV_dh / V_liquido**2
+    J[2, 1] = -dk_dT * CA
+    J[2, 2] = -Q_saida / V_liquido - k_arrhenius
+    return J
+
+# --- Micro-benchmark do Lado Direito das EDOs ---
+def medir_avaliacoes_por_segundo(funcao_edo, Y, t, args=(), n_avaliacoes=100000):
+    """Mede quantas avaliações por segundo funcao_edo(Y, t, *args) sustenta (melhor de 3 rodadas)."""
+    melhor = math.inf
+    for _ in range(3):
+        inicio = time.perf_counter()
+        for _ in range(n_avaliacoes):
+            funcao_edo(Y, t, *args)
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return n_avaliacoes / melhor
+
+def comparar_nucleos(n_avaliacoes=100000):
+    """
+    Compara o custo das mesmas fórmulas avaliadas com floats do Python
+    (núcleo escalar) e com o NumPy em escalares (arrays 0-d).
+    """
+    print("--- Avaliações por Segundo do Lado Direito das EDOs ---")
+    p = ParametrosReator(AT=5.0, Ao=0.01, Cd=0.6, g=9.81 * 60**2, rho=1000.0, Cp_J_kg_C=4186.0,
+                         k0=1.0e10, Ea_R=8000.0, delta_H_reacao=-50000.0)
+    Y = np.array([1.0, 50.0, 0.5])
+    entradas = (0.1, 1000.0, 25.0, 1.0) # Q_entrada, Q_aquecedor, T_entrada, CA_entrada
+
+    def rhs_escalar(Y, t):
+        h, T, CA = estado_escalar(Y)
+        return balancos_reator(h, T, CA, *entradas, arrhenius(p.k0, p.Ea_R, T), p)
+
+    def rhs_numpy(Y, t):
+        h, T, CA = Y
+        sinais = sinais_intermediarios(h, CA, arrhenius_vetorizado(p.k0, p.Ea_R, T), p)
+        sinais.update(zip(('Q_entrada', 'Q_aquecedor', 'T_entrada', 'CA_entrada'), entradas))
+        return balancos_reator_vetorizado(h, T, CA, sinais, p)
+
+    if not np.allclose(rhs_escalar(Y, 0.0), rhs_numpy(Y, 0.0), rtol=1e-12, atol=0.0):
+        raise RuntimeError("As versões escalar e vetorizada dos balanços divergem.")
+
+    taxa_escalar = medir_avaliacoes_por_segundo(rhs_escalar, Y, 0.0, n_avaliacoes=n_avaliacoes)
+    taxa_numpy = medir_avaliacoes_por_segundo(rhs_numpy, Y, 0.0, n_avaliacoes=n_avaliacoes)
+    print(f"Núcleo escalar (math):     {taxa_escalar:12,.0f} avaliações/s")
+    print(f"NumPy em escalares (0-d):  {taxa_numpy:12,.0f} avaliações/s")
+    print(f"Ganho do núcleo escalar: {taxa_escalar / taxa_numpy:.1f}x")
+    return taxa_escalar, taxa_numpy
+
+if __name__ == "__main__":
+    comparar_nucleos()
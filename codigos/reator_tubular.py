@@ -0,0 +1,175 @@
+"""
+Reator tubular (PFR) com a cinética do reator da Tarefa 4, discretizado
+pelo método das linhas e integrado com o Jacobiano em banda.
+"""
+import time
+import numpy as np
+from scipy.integrate import odeint
+import pandas as pd
+from modelo_reator import OPERACOES_ESCALARES, arrhenius, arrhenius_vetorizado
+from simulacao_reator import montar_parametros
+
+# --- Reator Tubular (PFR) pelo Método das Linhas ---
+class ReatorTubular:
+    """
+    Reator tubular (PFR) com a mesma cinética de Arrhenius de reactor_odes,
+    discretizado ao longo do eixo em N células de volumes finitos com
+    esquema upwind (método das linhas):
+
+        dCA_i/dt = (u/dz)(CA_(i-1) - CA_i) - k(T_i) CA_i
+        dT_i/dt  = (u/dz)(T_(i-1) - T_i) + (-ΔH) k(T_i) CA_i / (rho Cp)
+                   + U_parede (T_parede - T_i) / (rho Cp)
+
+    com u = Q/area, dz = comprimento/N e a célula 0 alimentada pela
+    corrente de entrada. Cada célula é um CSTR de volume area·dz, então a
+    discretização equivale a N tanques em série.
+
+    O estado é organizado célula a célula (T0, CA0, T1, CA1, ...): cada
+    equação só depende da própria célula e da anterior, e o Jacobiano é uma
+    banda com 2 diagonais abaixo e 1 acima da principal. O odeint recebe essa
+    estrutura (ml, mu) e monta e fatora o Jacobiano com custo linear em N.
+    """
+
+    ml, mu = 2, 1 # Larguras da banda do Jacobiano (abaixo e acima da diagonal)
+
+    def __init__(self, n_celulas=100, comprimento=10.0, area=0.05, Q=0.1, T_entrada=80.0, CA_entrada=1.0,
+                 params=None, U_parede=0.0, T_parede=25.0):
+        """
+        Args:
+            n_celulas (int, opcional): Número de células ao longo do tubo.
+            comprimento, area (float, opcional): Comprimento (m) e seção transversal (m^2) do tubo.
+            Q (float, opcional): Vazão volumétrica (m^3/min).
+            T_entrada, CA_entrada (float, opcional): Temperatura (°C) e concentração (mol/L) da alimentação.
+            params (ParametrosReator, opcional): Fonte de k0, Ea_R, delta_H_reacao, rho e Cp_J_kg_C.
+            U_parede (float, opcional): Coeficiente de troca térmica com a parede por
+                volume (J/min.m^3.°C); zero para o tubo adiabático.
+            T_parede (float, opcional): Temperatura da parede/camisa (°C).
+        """
+        self.n_celulas = n_celulas
+        self.comprimento, self.area, self.Q = comprimento, area, Q
+        self.T_entrada, self.CA_entrada = T_entrada, CA_entrada
+        self.params = montar_parametros() if params is None else params
+        self.U_parede, self.T_parede = U_parede, T_parede
+        self.dz = comprimento / n_celulas
+        self.conveccao = Q / area / self.dz # u/dz (min^-1)
+        self.z = (np.arange(n_celulas) + 0.5) * self.dz # Centros das células (m)
+
+    def derivadas_celulas(self, T_anterior, CA_anterior, T, CA, xp=np):
+        """
+        Balanços de uma ou mais células, a partir da própria célula e da
+        anterior: fonte única de odes (arrays, xp=np) e de odes_por_celula
+        (floats, xp=OPERACOES_ESCALARES). Retorna (dT/dt, dCA/dt).
+        """
+        p = self.params
+        r_A = arrhenius_vetorizado(p.k0, p.Ea_R, T, xp) * CA
+        dTdt = self.conveccao * (T_anterior - T) + \
+               ((-p.delta_H_reacao) * r_A + self.U_parede * (self.T_parede - T)) / (p.rho * p.Cp_J_kg_C)
+        dCAdt = self.conveccao * (CA_anterior - CA) - r_A
+        return dTdt, dCAdt
+
+    def odes(self, Y, t):
+        """EDOs das N células, vetorizadas sobre as células."""
+        T, CA = Y[0::2], Y[1::2]
+        T_anterior = np.concatenate(([self.T_entrada], T[:-1]))
+        CA_anterior = np.concatenate(([self.CA_entrada], CA[:-1]))
+        derivadas = np.empty_like(Y)
+        derivadas[0::2], derivadas[1::2] = self.derivadas_celulas(T_anterior, CA_anterior, T, CA)
+        return derivadas
+
+    def odes_por_celula(self, Y, t):
+        """Mesmas EDOs de odes, célula a célula com aritmética escalar (referência)."""
+        derivadas = [0.0] * len(Y)
+        T_anterior, CA_anterior = self.T_entrada, self.CA_entrada
+        for i in range(self.n_celulas):
+            T, CA = float(Y[2 * i]), float(Y[2 * i + 1])
+            derivadas[2 * i], derivadas[2 * i + 1] = self.derivadas_celulas(T_anterior, CA_anterior, T, CA,
+                                                                            OPERACOES_ESCALARES)
+            T_anterior, CA_anterior = T, CA
+        return derivadas
+
+    def jacobiano_banda(self, Y, t):
+        """
+        Jacobiano analítico no formato de banda do odeint: J_banda[i - j + mu, j]
+        guarda d(dY_i/dt)/dY_j, com forma (ml + mu + 1, 2N).
+        """
+        p = self.params
+        T, CA = Y[0::2], Y[1::2]
+        k_arrhenius = arrhenius_vetorizado(p.k0, p.Ea_R, T)
+        dk_dT = k_arrhenius * p.Ea_R / (T + 273.15)**2
+        rho_Cp = p.rho * p.Cp_J_kg_C
+
+        J_banda = np.zeros((self.ml + self.mu + 1, len(Y)))
+        diagonal = self.mu # Linha da diagonal principal (i = j)
+        # Colunas de T_i (j = 2i): dT_i/dT_i, dCA_i/dT_i e dT_(i+1)/dT_i
+        J_banda[diagonal, 0::2] = -self.conveccao + ((-p.delta_H_reacao) * dk_dT * CA - self.U_parede) / rho_Cp
+        J_banda[diagonal + 1, 0::2] = -dk_dT * CA
+        J_banda[diagonal + 2, 0:-2:2] = self.conveccao
+        # Colunas de CA_i (j = 2i + 1): dT_i/dCA_i, dCA_i/dCA_i e dCA_(i+1)/dCA_i
+        J_banda[diagonal - 1, 1::2] = (-p.delta_H_reacao) * k_arrhenius / rho_Cp
+        J_banda[diagonal, 1::2] = -self.conveccao - k_arrhenius
+        J_banda[diagonal + 2, 1:-2:2] = self.conveccao
+        return J_banda
+
+    def simular(self, tempo_max=20.0, n_pontos=200, T0=None, CA0=0.0, vetorizado=True,
+                jacobiano_analitico=False, relatorio=None):
+        """
+        Integra o PFR a partir do tubo cheio (por padrão, na temperatura de
+        entrada e sem reagente) com a alimentação ligada em t = 0.
+
+        Args:
+            vetorizado (bool, opcional): Usa odes (NumPy sobre as células) em vez de odes_por_celula.
+            jacobiano_analitico (bool, opcional): Passa jacobiano_banda ao odeint; sem ele,
+                o solver estima a banda por diferenças finitas (ml + mu + 1 avaliações).
+            relatorio (RelatorioSimulacao, opcional): Recebe as estatísticas do odeint.
+
+        Returns:
+            tuple: (t_span, T, CA, estatisticas), com T e CA de forma (n_pontos, N).
+        """
+        Y0 = np.empty(2 * self.n_celulas)
+        Y0[0::2] = self.T_entrada if T0 is None else T0
+        Y0[1::2] = CA0
+        t_span = np.linspace(0, tempo_max, n_pontos)
+        solucao, info = odeint(self.odes if vetorizado else self.odes_por_celula, Y0, t_span,
+                               Dfun=self.jacobiano_banda if jacobiano_analitico else None,
+                               ml=self.ml, mu=self.mu, full_output=True)
+        if relatorio is not None:
+            relatorio.registrar_odeint(info)
+        estatisticas = {'nfe': int(info['nfe'][-1]), 'nje': int(info['nje'][-1]), 'nst': int(info['nst'][-1])}
+        return t_span, solucao[:, 0::2], np.maximum(solucao[:, 1::2], 0.0), estatisticas
+
+    def CA_saida_estacionaria(self):
+        """
+        CA de saída em regime do tubo isotérmico na temperatura de entrada:
+        N tanques em série, CA_entrada / (1 + k·tau/N)^N (exato para a
+        discretização sem troca térmica nem calor de reação apreciável).
+        """
+        p = self.params
+        tau = self.comprimento * self.area / self.Q
+        k_arrhenius = arrhenius(p.k0, p.Ea_R, self.T_entrada)
+        return self.CA_entrada / (1 + k_arrhenius * tau / self.n_celulas)**self.n_celulas
+
+def comparar_escala_pfr(tamanhos=(50, 500, 5000), tempo_max=20.0, limite_por_celula=500):
+    """
+    Mede o tempo de simulação do PFR com N células (Jacobiano em banda),
+    com as EDOs vetorizadas e (até limite_por_celula células) com o laço
+    célula a célula, e confere a saída em regime com N tanques em série.
+    """
+    print("--- Escala da Simulação do Reator Tubular (método das linhas) ---")
+    linhas = []
+    for n in tamanhos:
+        pfr = ReatorTubular(n_celulas=n)
+        for vetorizado in (True, False):
+            if not vetorizado and n > limite_por_celula:
+                continue
+            inicio = time.perf_counter()
+            _, T, CA, estatisticas = pfr.simular(tempo_max=tempo_max, vetorizado=vetorizado)
+            duracao = time.perf_counter() - inicio
+            linhas.append({'Células': n, 'EDOs': 'vetorizadas' if vetorizado else 'por célula',
+                           'Tempo (s)': duracao, 'Tempo por célula (ms)': duracao / n * 1000,
+                           'Avaliações das EDOs': estatisticas['nfe'], 'Jacobianos': estatisticas['nje'],
+                           'CA saída (mol/L)': CA[-1, -1], 'CA saída N tanques (mol/L)': pfr.CA_saida_estacionaria(),
+                           'Memória da solução (MB)': (T.nbytes + CA.nbytes) / 1e6})
+            print(f"N = {n:5d} | {linhas[-1]['EDOs']:>11}: {duracao:8.3f} s "
+                  f"({linhas[-1]['Tempo por célula (ms)']:.3f} ms/célula) | Avaliações das EDOs: {estatisticas['nfe']:5d} | "
+                  f"CA saída: {CA[-1, -1]:.5f} (N tanques: {pfr.CA_saida_estacionaria():.5f}) mol/L")
+    return pd.DataFrame(linhas)
@@ -0,0 +1,159 @@
+"""
+Rede de reatores iguais ao da Tarefa 4 (trens em série e em paralelo),
+integrada como um único sistema com Jacobiano analítico esparso.
+"""
+import time
+import numpy as np
+from scipy import sparse
+import pandas as pd
+from modelo_reator import arrhenius_vetorizado, balancos_reator_vetorizado, sinais_intermediarios, vazao_saida
+from simulacao_reator import (calcular_entradas, integrar_por_segmentos, montar_parametros,
+                              obter_pontos_de_quebra)
+
+# --- Rede de Reatores (Trens em Série e em Paralelo) ---
+def conexoes_em_serie(n_unidades, primeira=0):
+    """Conexões de um trem em série: toda a saída de cada reator alimenta o seguinte."""
+    return [(i, i + 1, 1.0) for i in range(primeira, primeira + n_unidades - 1)]
+
+def conexoes_em_paralelo(n_trens, unidades_por_trem):
+    """
+    Conexões de trens em paralelo: o reator 0 divide sua saída igualmente
+    entre n_trens trens em série, cada um com unidades_por_trem reatores
+    (total de 1 + n_trens * unidades_por_trem unidades).
+    """
+    conexoes = []
+    for trem in range(n_trens):
+        primeira = 1 + trem * unidades_por_trem
+        conexoes.append((0, primeira, 1.0 / n_trens))
+        conexoes += conexoes_em_serie(unidades_por_trem, primeira)
+    return conexoes
+
+class RedeReatores:
+    """
+    Rede de N reatores iguais ao da Tarefa 4 ligados por um grafo de
+    conexões: a saída (Q_saida, T, CA) de um reator alimenta outro.
+
+    Cada conexão é uma tupla (origem, destino, fracao), com a fração da
+    vazão de saída da origem enviada ao destino; o que sobra da saída deixa
+    a planta. A entrada de cada reator é a mistura das correntes recebidas
+    com a alimentação fresca, que só existe nas unidades alimentadas (por
+    padrão, as que não recebem nenhuma corrente) e é ajustada pelo
+    controlador de nível. Todos os reatores têm o controlador de temperatura.
+
+    O estado é organizado reator a reator (h0, T0, CA0, h1, T1, CA1, ...).
+    Como cada reator só depende de si e das unidades a montante, o
+    Jacobiano é esparso em blocos 3x3 (padrao_jacobiano) e o solver rígido
+    o monta e fatora com custo próximo de linear em N.
+    """
+
+    def __init__(self, n_unidades, conexoes, params=None, alimentadas=None):
+        """
+        Args:
+            n_unidades (int): Número de reatores.
+            conexoes (iterable): Tuplas (origem, destino, fracao).
+            params (ParametrosReator, opcional): Parâmetros e perfis comuns;
+                os numéricos podem ser arrays de tamanho N (como no ensemble).
+            alimentadas (array_like, opcional): Máscara das unidades com
+                alimentação fresca.
+        """
+        self.n_unidades = n_unidades
+        self.params = montar_parametros() if params is None else params
+
+        conexoes = list(conexoes)
+        origens = np.array([c[0] for c in conexoes], dtype=int)
+        destinos = np.array([c[1] for c in conexoes], dtype=int)
+        fracoes = np.array([c[2] for c in conexoes], dtype=float)
+        if conexoes and (origens.min() < 0 or destinos.min() < 0 or max(origens.max(), destinos.max()) >= n_unidades):
+            raise ValueError(f"As conexões devem ligar unidades entre 0 e {n_unidades - 1}.")
+        if np.any(origens == destinos) or np.any(fracoes <= 0):
+            raise ValueError("Cada conexão deve ligar unidades diferentes com fração positiva.")
+        if np.any(np.bincount(origens, weights=fracoes, minlength=n_unidades) > 1.0 + 1e-12):
+            raise ValueError("A soma das frações que saem de uma unidade não pode passar de 1.")
+
+        # Matriz de conexões: Q_recebida = M @ Q_saida (M[destino, origem] = fracao)
+        self.matriz_conexoes = sparse.csr_matrix((fracoes, (destinos, origens)), shape=(n_unidades, n_unidades))
+        if alimentadas is None:
+            alimentadas = np.bincount(destinos, minlength=n_unidades) == 0
+        self.alimentadas = np.asarray(alimentadas, dtype=bool)
+
+        # Padrão do Jacobiano: bloco 3x3 de cada reator e de cada conexão origem -> destino
+        dependencias = self.matriz_conexoes + sparse.identity(n_unidades, format='csr')
+        self.padrao_jacobiano = sparse.kron(dependencias != 0, np.ones((3, 3)), format='csr')
+
+    def odes(self, Y, t):
+        """EDOs da rede inteira, vetorizadas sobre os N reatores."""
+        p = self.params
+        estados = Y.reshape(-1, 3)
+        h, T, CA = estados[:, 0], estados[:, 1], estados[:, 2]
+
+        # Correntes recebidas das unidades a montante (vazão, calor sensível e reagente)
+        Q_saida = vazao_saida(h, p)
+        Q_recebida = self.matriz_conexoes @ Q_saida
+        T_recebida = self.matriz_conexoes @ (Q_saida * T)
+        CA_recebida = self.matriz_conexoes @ (Q_saida * CA)
+
+        # Alimentação fresca com controle de nível, apenas nas unidades alimentadas
+        Q_controle, _, Q_aquecedor, _, T_fresca, CA_fresca = calcular_entradas(h, T, t, p, xp=np)
+        Q_fresca = np.where(self.alimentadas, Q_controle, 0.0)
+
+        # Mistura na entrada de cada reator (média ponderada pelas vazões)
+        Q_entrada = Q_fresca + Q_recebida
+        com_entrada = Q_entrada > 0
+        divisor = np.where(com_entrada, Q_entrada, 1.0)
+        T_entrada = np.where(com_entrada, (Q_fresca * T_fresca + T_recebida) / divisor, T_fresca)
+        CA_entrada = np.where(com_entrada, (Q_fresca * CA_fresca + CA_recebida) / divisor, CA_fresca)
+
+        k_arrhenius = arrhenius_vetorizado(p.k0, p.Ea_R, T_entrada) # k depende da T_entrada, como em reactor_odes
+
+        sinais = {'Q_entrada': Q_entrada, 'Q_aquecedor': Q_aquecedor, 'T_entrada': T_entrada,
+                  'CA_entrada': CA_entrada, **sinais_intermediarios(h, CA, k_arrhenius, p)}
+        derivadas = np.empty_like(estados)
+        derivadas[:, 0], derivadas[:, 1], derivadas[:, 2] = balancos_reator_vetorizado(h, T, CA, sinais, p)
+        return derivadas.ravel()
+
+    def simular(self, Y0=(0.5, 25.0, 0.0), tempo_max=150, n_pontos=500, metodo='BDF', esparso=True):
+        """
+        Integra a rede com um método rígido do solve_ivp.
+
+        Args:
+            Y0 (array_like, opcional): Estado inicial comum (h0, T0, CA0) ou
+                matriz (N, 3) com o estado de cada reator.
+            esparso (bool, opcional): Se False, o solver estima o Jacobiano
+                denso (apenas para comparação de desempenho).
+
+        Returns:
+            tuple: (t_span, trajetorias, estatisticas), com trajetorias
+            (N, n_pontos, 3) contendo h, T e CA de cada reator.
+        """
+        Y0 = np.broadcast_to(np.asarray(Y0, dtype=float), (self.n_unidades, 3)).ravel()
+        t_span = np.linspace(0, tempo_max, n_pontos)
+        opcoes = {'jac_sparsity': self.padrao_jacobiano} if esparso else {}
+        solucao, estatisticas = integrar_por_segmentos(self.odes, Y0, t_span,
+                                                       pontos_de_quebra=obter_pontos_de_quebra(*self.params.perfis()),
+                                                       metodo=metodo, **opcoes)
+        trajetorias = solucao.reshape(n_pontos, -1, 3).transpose(1, 0, 2)
+        trajetorias[:, :, [0, 2]] = np.maximum(trajetorias[:, :, [0, 2]], 0.0)
+        return t_span, trajetorias, estatisticas
+
+def comparar_escala_rede(tamanhos=(25, 50, 100, 200), tempo_max=150, limite_denso=100):
+    """
+    Mede o tempo de simulação de trens em série com N reatores, com o
+    padrão esparso do Jacobiano e (até limite_denso unidades) com o
+    Jacobiano denso, para mostrar o crescimento do custo com N.
+    """
+    print("--- Escala da Simulação de Redes de Reatores (trem em série) ---")
+    linhas = []
+    for n in tamanhos:
+        rede = RedeReatores(n, conexoes_em_serie(n))
+        for esparso in (True, False):
+            if not esparso and n > limite_denso:
+                continue
+            inicio = time.perf_counter()
+            _, trajetorias, estatisticas = rede.simular(tempo_max=tempo_max, esparso=esparso)
+            duracao = time.perf_counter() - inicio
+            linhas.append({'Unidades': n, 'Jacobiano': 'esparso' if esparso else 'denso', 'Tempo (s)': duracao,
+                           'Avaliações das EDOs': estatisticas['nfe'], 'Fatorações LU': estatisticas['nlu'],
+                           'T última unidade (°C)': trajetorias[-1, -1, 1]})
+            print(f"N = {n:4d} | {linhas[-1]['Jacobiano']:>7}: {duracao:8.3f} s | "
+                  f"Avaliações das EDOs: {estatisticas['nfe']:6d}")
+    return pd.DataFrame(linhas)
@@ -0,0 +1,178 @@
+"""
+Sensibilidade do reator da Tarefa 4 aos parâmetros: sensibilidades diretas
+dY/dp em uma única integração do sistema aumentado e gradiente de um custo
+integral pelo método adjunto.
+"""
+import numpy as np
+from scipy.integrate import solve_ivp
+import pandas as pd
+from modelo_reator import estado_escalar
+from estado_estacionario_reator import substituir_parametro
+from simulacao_reator import (calcular_sinais_reator, integrar_por_segmentos, montar_parametros,
+                              obter_pontos_de_quebra, reactor_jacobiano, reactor_odes)
+
+# --- Análise de Sensibilidade aos Parâmetros ---
+PARAMETROS_SENSIBILIDADE = ('Kp_nivel', 'Kp_temp', 'k0', 'Ea_R', 'Cd')
+
+def reactor_derivadas_parametros(Y, t, params, nomes=PARAMETROS_SENSIBILIDADE):
+    """
+    Calcula a matriz (3, P) das derivadas das EDOs em relação aos parâmetros,
+    df_i/dp_j. As derivadas em relação a Kp_nivel, Kp_temp, k0, Ea_R e Cd são
+    analíticas (nulas onde o controlador satura); para os demais parâmetros
+    numéricos de NOMES_PARAMETROS usa diferenças finitas centrais.
+    """
+    h, T, CA = estado_escalar(Y)
+    AT, rho, Cp_J_kg_C, delta_H_reacao = params.AT, params.rho, params.Cp_J_kg_C, params.delta_H_reacao
+
+    sinais = calcular_sinais_reator(h, T, CA, t, params)
+    V_liquido = sinais['V_liquido']
+    rho_Cp = rho * Cp_J_kg_C
+    vivo = 0.0 if h <= 0 else 1.0 # Com o tanque vazio, dT/dt e dCA/dt são nulos
+
+    # Derivadas das EDOs em relação aos sinais intermediários
+    df_dQe = np.array([1 / AT, vivo * (sinais['T_entrada'] - T) / V_liquido, vivo * sinais['CA_entrada'] / V_liquido])
+    df_dQa = np.array([0.0, vivo / (V_liquido * rho_Cp), 0.0])
+    df_dk = np.array([0.0, vivo * (-delta_H_reacao) * CA / rho_Cp, -vivo * CA])
+    df_dQs = np.array([-1 / AT, 0.0, -vivo * CA / V_liquido])
+
+    df_dp = np.zeros((3, len(nomes)))
+    for j, nome in enumerate(nomes):
+        if nome == 'Kp_nivel':
+            erro_nivel = sinais['setpoint_nivel'] - h
+            Q_entrada_control = sinais['Q_entrada_base'] + params.Kp_nivel * erro_nivel
+            if 0.0 < Q_entrada_control < params.Q_entrada_max:
+                df_dp[:, j] = df_dQe * erro_nivel
+        elif nome == 'Kp_temp':
+            erro_temp = sinais['setpoint_temperatura'] - T
+            if params.Q_resfriador_max < params.Kp_temp * erro_temp < params.Q_aquecedor_max:
+                df_dp[:, j] = df_dQa * erro_temp
+        elif nome == 'k0':
+            df_dp[:, j] = df_dk * sinais['k_arrhenius'] / params.k0
+        elif nome == 'Ea_R':
+            df_dp[:, j] = df_dk * (-sinais['k_arrhenius'] / (sinais['T_entrada'] + 273.15))
+        elif nome == 'Cd':
+            df_dp[:, j] = df_dQs * sinais['Q_saida'] / params.Cd
+        else:
+            valor = getattr(params, nome)
+            d = 1e-6 * max(1.0, abs(valor))
+            f_mais = reactor_odes(Y, t, substituir_parametro(params, nome, valor + d))
+            f_menos = reactor_odes(Y, t, substituir_parametro(params, nome, valor - d))
+            df_dp[:, j] = (np.asarray(f_mais) - np.asarray(f_menos)) / (2 * d)
+    return df_dp
+
+def reactor_odes_sensibilidade(Z, t, params, nomes):
+    """
+    Sistema aumentado estado + sensibilidades: dY/dt = f(Y) e
+    dS/dt = J(Y)·S + df/dp, com S = dY/dp organizada como matriz (3, P).
+    """
+    Y = Z[:3]
+    S = Z[3:].reshape(3, len(nomes))
+    dYdt = np.asarray(reactor_odes(Y, t, params))
+    dSdt = reactor_jacobiano(Y, t, params) @ S + reactor_derivadas_parametros(Y, t, params, nomes)
+    return np.concatenate((dYdt, dSdt.ravel()))
+
+def simular_sensibilidades(nomes=PARAMETROS_SENSIBILIDADE, params=None, Y0=(0.5, 25.0, 0.0),
+                           tempo_max=150, n_pontos=500, metodo=None):
+    """
+    Calcula as sensibilidades dY/dp ao longo da trajetória em uma única
+    integração do sistema aumentado (sensibilidade direta), em vez de uma
+    simulação extra por parâmetro como nas diferenças finitas.
+
+    Returns:
+        tuple: (t_span, solucao, sensibilidades), com solucao (n_pontos, 3) e
+        sensibilidades (n_pontos, 3, P): sensibilidades[i, k, j] = dY_k/dp_j
+        no instante t_span[i]. Com nomes vazio, P = 0 e só a trajetória é
+        calculada.
+    """
+    if params is None:
+        params = montar_parametros()
+    n_parametros = len(nomes)
+    Z0 = np.concatenate((np.asarray(Y0, dtype=float), np.zeros(3 * n_parametros))) # Y0 não depende de p
+    t_span = np.linspace(0, tempo_max, n_pontos)
+    solucao, _ = integrar_por_segmentos(reactor_odes_sensibilidade, Z0, t_span, args=(params, tuple(nomes)),
+                                        pontos_de_quebra=obter_pontos_de_quebra(*params.perfis()), metodo=metodo)
+    return t_span, solucao[:, :3], solucao[:, 3:].reshape(len(t_span), 3, n_parametros)
+
+def custo_erro_temperatura(Y, t, params):
+    """Integrando do custo padrão do modo adjunto: erro quadrático de temperatura e sua derivada em Y."""
+    erro = Y[1] - params.setpoint_temperatura_func(t)
+    return erro**2, np.array([0.0, 2 * erro, 0.0])
+
+def gradiente_adjunto(nomes=PARAMETROS_SENSIBILIDADE, params=None, Y0=(0.5, 25.0, 0.0), tempo_max=150,
+                      custo=custo_erro_temperatura, rtol=1e-8, atol=1e-10):
+    """
+    Calcula o gradiente dG/dp de um custo integral G = ∫ g(Y, t) dt pelo
+    método adjunto: uma integração direta (guardando a trajetória) e uma
+    integração reversa de λ' = -Jᵀλ - (dg/dY)ᵀ, com λ(tempo_max) = 0. O
+    número de solves não cresce com o número de parâmetros; cada parâmetro
+    acrescenta só uma quadratura, dG/dp = ∫ λᵀ·df/dp dt.
+
+    Args:
+        custo (callable): g(Y, t, params) -> (valor, dg/dY). Padrão: erro
+            quadrático entre a temperatura e o seu setpoint.
+
+    Returns:
+        tuple: (G, gradiente), com o gradiente como dicionário {parâmetro: dG/dp}.
+
+    Raises:
+        RuntimeError: Se o solver falhar no passo direto ou no reverso.
+    """
+    if params is None:
+        params = montar_parametros()
+    n_parametros = len(nomes)
+    quebras = [tq for tq in obter_pontos_de_quebra(*params.perfis()) if 0 < tq < tempo_max]
+    limites = [0.0] + quebras + [float(tempo_max)]
+
+    # --- Passo direto: trajetória contínua (dense_output) de cada segmento ---
+    trechos = []
+    Y_atual = np.asarray(Y0, dtype=float)
+    for t_inicio, t_fim in zip(limites[:-1], limites[1:]):
+        t_fim_segmento = np.nextafter(t_fim, t_inicio) if t_fim in quebras else t_fim
+        resultado = solve_ivp(lambda t, Y: reactor_odes(Y, t, params), (t_inicio, t_fim_segmento), Y_atual,
+                              method='LSODA', jac=lambda t, Y: reactor_jacobiano(Y, t, params),
+                              dense_output=True, rtol=rtol, atol=atol)
+        if not resultado.success:
+            raise RuntimeError(f"Falha do solver no passo direto, entre t = {t_inicio} e {t_fim}: {resultado.message}")
+        trechos.append((t_inicio, t_fim_segmento, resultado.sol))
+        Y_atual = resultado.y[:, -1]
+
+    # --- Passo reverso: adjunto λ (3), quadratura do gradiente μ (P) e custo q ---
+    def sistema_adjunto(t, W, trajetoria):
+        Y = trajetoria(t)
+        lam = W[:3]
+        valor, dg_dY = custo(Y, t, params)
+        dlam = -reactor_jacobiano(Y, t, params).T @ lam - dg_dY
+        dmu = -lam @ reactor_derivadas_parametros(Y, t, params, nomes)
+        return np.concatenate((dlam, dmu, [-valor]))
+
+    W = np.zeros(3 + n_parametros + 1)
+    for t_inicio, t_fim, trajetoria in reversed(trechos):
+        resultado = solve_ivp(sistema_adjunto, (t_fim, t_inicio), W, method='LSODA', args=(trajetoria,),
+                              rtol=rtol, atol=atol)
+        if not resultado.success:
+            raise RuntimeError(f"Falha do solver no passo reverso, entre t = {t_fim} e {t_inicio}: {resultado.message}")
+        W = resultado.y[:, -1]
+
+    G = W[-1]
+    gradiente = dict(zip(nomes, W[3:3 + n_parametros]))
+    return G, gradiente
+
+def analisar_sensibilidades(nomes=PARAMETROS_SENSIBILIDADE):
+    """
+    Exibe as sensibilidades relativas p·dY/dp no fim da simulação (variação
+    do estado para uma variação de 100% no parâmetro) e o gradiente adjunto
+    do erro quadrático de temperatura.
+    """
+    print("--- Análise de Sensibilidade aos Parâmetros ---")
+    params = montar_parametros()
+    t_span, solucao, sensibilidades = simular_sensibilidades(nomes, params)
+    valores = np.array([getattr(params, nome) for nome in nomes])
+    df_relativas = pd.DataFrame(sensibilidades[-1] * valores, index=['h (m)', 'T (°C)', 'CA (mol/L)'], columns=nomes)
+    print(f"\nSensibilidades relativas p·dY/dp em t = {t_span[-1]:.0f} min:")
+    print(df_relativas)
+
+    G, gradiente = gradiente_adjunto(nomes, params)
+    print(f"\nErro quadrático integrado de temperatura: {G:.4g} °C².min")
+    for nome, derivada in gradiente.items():
+        print(f"  dG/d{nome} = {derivada:.4g}")
+    return df_relativas, gradiente
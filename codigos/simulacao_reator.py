@@ -0,0 +1,571 @@
+"""
+Núcleo da simulação do reator da Tarefa 4 (código 38): parâmetros e perfis
+padrão, controladores P, EDOs e Jacobiano analítico, integração por
+segmentos entre as descontinuidades dos perfis e apresentação dos
+resultados. Os balanços de massa e energia vêm de modelo_reator.
+
+Os estudos sobre este núcleo ficam em módulos próprios: lote_reator,
+sintonia_reator, ensemble_reator, estado_estacionario_reator,
+tempo_real_reator, sensibilidade_reator, rede_reatores, reator_tubular,
+controle_amostrado e fluxo_reator. O código 38 orquestra a simulação
+completa e a linha de comando.
+"""
+import bisect # Busca binária nos perfis tabelados
+import functools
+import hashlib # Chaves do cache de resultados
+import inspect
+import numpy as np
+from scipy.integrate import odeint, solve_ivp
+import matplotlib.pyplot as plt
+import seaborn as sns
+import pandas as pd # Para organizar os resultados da simulação
+import modelo_reator # Modelo compartilhado com os códigos 36 e 37
+from instrumentacao_solver import RelatorioSimulacao # Contadores do solver e tempo por fase
+from modelo_reator import (OPERACOES_ESCALARES, ParametrosReator, arrhenius, arrhenius_vetorizado,
+                           balancos_reator, controle_proporcional_vetorizado, estado_escalar,
+                           jacobiano_balancos, sinais_intermediarios)
+
+# --- 1. Definir os Parâmetros do Reator e da Reação (da Tarefa 1) ---
+AT = 5.0        # Área da seção transversal do reator (m^2)
+H_MAX = 2.0     # Altura máxima do reator (m)
+rho = 1000.0    # Densidade do líquido (kg/m^3)
+Cp = 4.186      # Capacidade calorífica do líquido (kJ/kg.°C)
+Cp_J_kg_C = Cp * 1000 # Convertendo kJ/kg.°C para J/kg.°C
+
+k0 = 1.0e10     # Fator pré-exponencial da constante de velocidade (min^-1)
+Ea_R = 8000.0   # Energia de ativação / Constante dos gases (K)
+delta_H_reacao = -50000.0 # Entalpia de reação (J/mol) - Negativo para exotérmica
+
+Q_entrada_base_const = 0.1 # Vazão volumétrica de entrada base (m^3/min)
+Q_entrada_max = 0.5  # Vazão máxima da bomba de entrada (m^3/min)
+T_entrada_const = 25.0     # Temperatura da corrente de entrada (°C)
+CA_entrada_const = 1.0     # Concentração do reagente A na entrada (mol/L)
+
+Ao = 0.01       # Área do orifício de saída (m^2)
+Cd = 0.6        # Coeficiente de descarga do orifício (adimensional)
+g = 9.81 * 60**2 # Aceleração da gravidade (m/min^2)
+
+Q_aquecedor_max = 50000.0 # Potência máxima do aquecedor (J/min)
+Q_resfriador_max = -50000.0 # Potência máxima do resfriador (J/min)
+
+# Parâmetros de Controle (Ganhos)
+Kp_nivel = 0.5
+Kp_temp = 100.0
+
+# --- Perfis por Partes Tabelados ---
+class PerfilPorPartes:
+    """
+    Perfil de entrada (setpoint ou distúrbio) definido por uma tabela de
+    instantes e valores, com rampas lineares opcionais.
+
+    A partir de cada instante t_i o perfil vale valores[i]. Se rampas[i] > 0,
+    a transição do valor anterior para valores[i] é linear entre t_i e
+    t_i + rampas[i]; caso contrário é um degrau. Antes do primeiro instante
+    vale o primeiro valor. O objeto é chamável: escalares (de qualquer tipo
+    numérico, resultado float) são avaliados por busca binária (bisect) e
+    arrays de tempo, de uma vez, com np.searchsorted.
+    """
+
+    def __init__(self, instantes, valores, rampas=None):
+        self.instantes = np.asarray(instantes, dtype=float)
+        self.valores = np.asarray(valores, dtype=float)
+        self.rampas = np.zeros_like(self.instantes) if rampas is None else np.asarray(rampas, dtype=float)
+
+        if not (len(self.instantes) == len(self.valores) == len(self.rampas)) or len(self.instantes) == 0:
+            raise ValueError("Instantes, valores e rampas devem ter o mesmo tamanho (pelo menos 1).")
+        if np.any(np.diff(self.instantes) <= 0):
+            raise ValueError("Os instantes do perfil devem ser estritamente crescentes.")
+        if np.any(self.rampas < 0) or np.any(self.instantes[:-1] + self.rampas[:-1] > self.instantes[1:]):
+            raise ValueError("Cada rampa deve ser não negativa e terminar antes do instante seguinte.")
+
+        # Valor de partida de cada transição (o primeiro trecho não tem transição)
+        self.valores_anteriores = np.concatenate((self.valores[:1], self.valores[:-1]))
+
+        # Cópias em listas Python: a avaliação escalar evita o custo de despacho do NumPy
+        self._instantes_lista = self.instantes.tolist()
+        self._valores_lista = self.valores.tolist()
+        self._anteriores_lista = self.valores_anteriores.tolist()
+        self._rampas_lista = self.rampas.tolist()
+
+        # Degraus e inícios/fins de rampa são descontinuidades do perfil ou de sua derivada
+        quebras = set(self.instantes[1:].tolist())
+        quebras.update((self.instantes + self.rampas)[self.rampas > 0].tolist())
+        self.pontos_de_quebra = tuple(sorted(quebras))
+
+    @classmethod
+    def constante(cls, valor):
+        """Cria um perfil que vale sempre o mesmo valor."""
+        return cls([0.0], [valor])
+
+    @classmethod
+    def de_csv(cls, nome_arquivo, coluna_tempo='Tempo (min)', coluna_valor='Valor', coluna_rampa=None):
+        """
+        Lê um perfil de um arquivo CSV (ex.: histórico de setpoints da planta).
+
+        Args:
+            nome_arquivo (str): Caminho do arquivo CSV.
+            coluna_tempo (str, opcional): Coluna com os instantes (min).
+            coluna_valor (str, opcional): Coluna com os valores do perfil.
+            coluna_rampa (str, opcional): Coluna com a duração das rampas (min).
+                Se omitida, todas as transições são degraus.
+        """
+        colunas = [coluna_tempo, coluna_valor] + ([coluna_rampa] if coluna_rampa else [])
+        df = pd.read_csv(nome_arquivo, usecols=colunas)
+        rampas = df[coluna_rampa].to_numpy() if coluna_rampa else None
+        return cls(df[coluna_tempo].to_numpy(), df[coluna_valor].to_numpy(), rampas)
+
+    def __call__(self, t):
+        if isinstance(t, float) or np.ndim(t) == 0: # Inclui int, np.float32 e arrays 0-d
+            return self._avaliar_escalar(float(t))
+        return self._avaliar_array(np.asarray(t, dtype=float))
+
+    def _avaliar_escalar(self, t):
+        i = bisect.bisect_right(self._instantes_lista, t) - 1
+        if i < 0:
+            return self._valores_lista[0]
+        rampa = self._rampas_lista[i]
+        if rampa > 0 and t < self._instantes_lista[i] + rampa:
+            fracao = (t - self._instantes_lista[i]) / rampa
+            anterior = self._anteriores_lista[i]
+            return anterior + (self._valores_lista[i] - anterior) * fracao
+        return self._valores_lista[i]
+
+    def _avaliar_array(self, t):
+        i = np.maximum(np.searchsorted(self.instantes, t, side='right') - 1, 0)
+        valores = self.valores[i]
+        rampas = self.rampas[i]
+        em_rampa = (rampas > 0) & (t < self.instantes[i] + rampas)
+        if np.any(em_rampa):
+            fracao = np.clip((t[em_rampa] - self.instantes[i][em_rampa]) / rampas[em_rampa], 0.0, 1.0)
+            anteriores = self.valores_anteriores[i][em_rampa]
+            valores[em_rampa] = anteriores + (valores[em_rampa] - anteriores) * fracao
+        return valores
+
+# --- Perfis de Setpoint e Distúrbio (NOVIDADE DA TAREFA 4) ---
+# Cada perfil declara em "pontos_de_quebra" os instantes (min) em que muda de
+# valor, para que o integrador reinicie o solver em cada descontinuidade.
+
+# Setpoint de nível: 1.0 m, passando a 1.5 m após 50 min
+setpoint_nivel_profile = PerfilPorPartes([0.0, 50.0], [1.0, 1.5])
+
+# Setpoint de temperatura: 50 °C, 60 °C após 20 min e 55 °C após 80 min
+setpoint_temperatura_profile = PerfilPorPartes([0.0, 20.0, 80.0], [50.0, 60.0, 55.0])
+
+# Distúrbio na vazão de entrada base: aumento de 20% entre 10 e 60 min
+Q_entrada_disturbance_profile = PerfilPorPartes([0.0, 10.0, 60.0],
+                                                [Q_entrada_base_const, Q_entrada_base_const * 1.2, Q_entrada_base_const])
+
+# Distúrbio na temperatura de entrada: aumento de 10 °C entre 40 e 70 min
+T_entrada_disturbance_profile = PerfilPorPartes([0.0, 40.0, 70.0],
+                                                [T_entrada_const, T_entrada_const + 10.0, T_entrada_const])
+
+# Concentração de entrada mantida constante para este exemplo
+CA_entrada_disturbance_profile = PerfilPorPartes.constante(CA_entrada_const)
+
+# --- 2. Implementar a função que descreve o sistema de EDOs acopladas (da Tarefa 2 e 3) ---
+# Os balanços de massa e energia ficam no módulo compartilhado modelo_reator
+# (o mesmo dos códigos 36 e 37); aqui ficam os controladores e os perfis.
+def calcular_entradas(h, T, t, params, entradas=None, xp=OPERACOES_ESCALARES):
+    """
+    Controladores P e perfis de entrada do reator, escritos uma única vez
+    para os dois caminhos: floats do Python (padrão, usado a cada avaliação
+    das EDOs e do Jacobiano) ou arrays (xp=np, usado por
+    calcular_sinais_reator sobre a trajetória inteira).
+
+    O dicionário opcional entradas traz valores externos (ex.: de um CLP) que
+    substituem os controladores P internos ('Q_entrada', 'Q_aquecedor') e os
+    perfis de distúrbio ('T_entrada', 'CA_entrada'). As ações externas
+    também respeitam os limites dos atuadores.
+
+    Returns:
+        tuple: (Q_entrada, dQe_dh, Q_aquecedor, dQa_dT, T_entrada, CA_entrada),
+        com as derivadas das ações de controle em relação ao estado (nulas
+        quando o atuador satura ou a ação é externa).
+    """
+    if not entradas:
+        # Caminho comum: controladores P internos e perfis de distúrbio
+        Q_entrada, Kp_efetivo = controle_proporcional_vetorizado(
+            params.Q_entrada_base_func(t), params.Kp_nivel, params.setpoint_nivel_func(t) - h,
+            0.0, params.Q_entrada_max, xp)
+        Q_aquecedor, Kp_temp_efetivo = controle_proporcional_vetorizado(
+            0.0, params.Kp_temp, params.setpoint_temperatura_func(t) - T,
+            params.Q_resfriador_max, params.Q_aquecedor_max, xp)
+        return Q_entrada, -Kp_efetivo, Q_aquecedor, -Kp_temp_efetivo, params.T_entrada_func(t), params.CA_entrada_func(t)
+
+    if 'Q_entrada' in entradas:
+        Q_entrada, dQe_dh = xp.clip(entradas['Q_entrada'], 0.0, params.Q_entrada_max), 0.0 # Ação externa
+    else:
+        Q_entrada, Kp_efetivo = controle_proporcional_vetorizado(
+            params.Q_entrada_base_func(t), params.Kp_nivel, params.setpoint_nivel_func(t) - h,
+            0.0, params.Q_entrada_max, xp)
+        dQe_dh = -Kp_efetivo
+    if 'Q_aquecedor' in entradas:
+        Q_aquecedor, dQa_dT = xp.clip(entradas['Q_aquecedor'], params.Q_resfriador_max, params.Q_aquecedor_max), 0.0
+    else:
+        Q_aquecedor, Kp_temp_efetivo = controle_proporcional_vetorizado(
+            0.0, params.Kp_temp, params.setpoint_temperatura_func(t) - T,
+            params.Q_resfriador_max, params.Q_aquecedor_max, xp)
+        dQa_dT = -Kp_temp_efetivo
+    T_entrada = entradas['T_entrada'] if 'T_entrada' in entradas else params.T_entrada_func(t)
+    CA_entrada = entradas['CA_entrada'] if 'CA_entrada' in entradas else params.CA_entrada_func(t)
+    return Q_entrada, dQe_dh, Q_aquecedor, dQa_dT, T_entrada, CA_entrada
+
+def calcular_sinais_reator(h, T, CA, t, params, entradas=None):
+    """
+    Calcula as ações de controle e os sinais intermediários do reator.
+
+    É a versão vetorizada (NumPy) das contas de reactor_odes, com as mesmas
+    fórmulas (calcular_entradas e modelo_reator): após a integração, é
+    aplicada de uma só vez sobre a matriz de solução. Aceita escalares ou
+    arrays (h, T, CA e t com formatos compatíveis); com arrays de tempo, os
+    perfis devem aceitar arrays (como PerfilPorPartes). O argumento entradas
+    tem o mesmo papel que em calcular_entradas.
+
+    Returns:
+        dict: Setpoints e distúrbios no instante t ('setpoint_nivel',
+        'setpoint_temperatura', 'Q_entrada_base', 'T_entrada', 'CA_entrada'),
+        ações de controle ('Q_entrada', 'Q_aquecedor') e sinais derivados
+        ('Q_saida', 'V_liquido', 'k_arrhenius', 'r_A', 'Q_reacao').
+    """
+    Q_entrada, _, Q_aquecedor, _, T_entrada, CA_entrada = calcular_entradas(h, T, t, params, entradas, np)
+    k_arrhenius = arrhenius_vetorizado(params.k0, params.Ea_R, T_entrada) # k depende da T_entrada para este exemplo
+
+    return {
+        'setpoint_nivel': params.setpoint_nivel_func(t),
+        'setpoint_temperatura': params.setpoint_temperatura_func(t),
+        'Q_entrada_base': params.Q_entrada_base_func(t),
+        'T_entrada': T_entrada,
+        'CA_entrada': CA_entrada,
+        'Q_entrada': Q_entrada,
+        'Q_aquecedor': Q_aquecedor,
+        'k_arrhenius': k_arrhenius,
+        **sinais_intermediarios(h, CA, k_arrhenius, params), # Q_saida, V_liquido, r_A, Q_reacao
+    }
+
+def reactor_odes(Y, t, params, entradas=None):
+    """
+    Define o sistema de Equações Diferenciais Ordinárias (EDOs) acopladas
+    para o reator químico, incluindo a lógica de controle e perfis de entrada.
+    O argumento opcional entradas tem o mesmo papel que em calcular_entradas.
+
+    Caminho rápido do solver: só aritmética escalar do Python (núcleo
+    balancos_reator de modelo_reator), sem o custo do NumPy em escalares.
+    """
+    h, T, CA = estado_escalar(Y) # Desempacotar as variáveis de estado
+
+    # --- Lógica de Controle e Perfis de Entrada ---
+    Q_entrada, _, Q_aquecedor, _, T_entrada, CA_entrada = calcular_entradas(h, T, t, params, entradas)
+    k_arrhenius = arrhenius(params.k0, params.Ea_R, T_entrada) # k depende da T_entrada para este exemplo
+
+    # --- EDOs ---
+    return balancos_reator(h, T, CA, Q_entrada, Q_aquecedor, T_entrada, CA_entrada, k_arrhenius, params)
+
+def reactor_jacobiano(Y, t, params, entradas=None):
+    """
+    Calcula o Jacobiano analítico J[i, j] = d(dY_i/dt)/dY_j das EDOs do reator,
+    com as linhas na ordem de retorno de reactor_odes (dh/dt, dT/dt, dCA/dt) e
+    as colunas na ordem do estado (h, T, CA).
+
+    Nas regiões em que os controladores P saturam, ou quando a ação vem de
+    fora (entradas, como em calcular_entradas), a derivada da ação de
+    controle em relação ao estado é nula.
+    """
+    h, T, CA = estado_escalar(Y)
+    Q_entrada, dQe_dh, Q_aquecedor, dQa_dT, T_entrada, CA_entrada = \
+        calcular_entradas(h, T, t, params, entradas)
+    k_arrhenius = arrhenius(params.k0, params.Ea_R, T_entrada) # Não depende do estado neste exemplo
+    return jacobiano_balancos(h, T, CA, Q_entrada, Q_aquecedor, T_entrada, CA_entrada, k_arrhenius,
+                              0.0, dQe_dh, dQa_dT, params)
+
+# --- Integração por Segmentos entre Descontinuidades ---
+# Tolerâncias padrão do odeint (LSODA do ODEPACK), repassadas também ao
+# solve_ivp para que todos os métodos sejam comparados com a mesma precisão
+# (o padrão do solve_ivp, rtol=1e-3, é grosseiro demais para o reator).
+RTOL_PADRAO = 1.49012e-8
+ATOL_PADRAO = 1.49012e-8
+
+def obter_pontos_de_quebra(*perfis):
+    """Reúne, em ordem crescente e sem repetição, os pontos de quebra dos perfis."""
+    return sorted({float(tq) for perfil in perfis for tq in getattr(perfil, 'pontos_de_quebra', ())})
+
+def integrar_por_segmentos(funcao_edo, Y0, t_span, args=(), pontos_de_quebra=(),
+                           metodo=None, jacobiano=None, **opcoes_solver):
+    """
+    Integra as EDOs segmento a segmento, reiniciando o solver em cada ponto
+    de quebra dos perfis de entrada.
+
+    Dentro de cada segmento as entradas são suaves, então o solver não precisa
+    descobrir os degraus por tentativa e erro (passos rejeitados).
+
+    Args:
+        funcao_edo (callable): Função f(Y, t, *args) no formato do odeint.
+        Y0 (array_like): Condição inicial.
+        t_span (array_like): Pontos de tempo (crescentes) da solução.
+        args (tuple, opcional): Argumentos adicionais da função das EDOs.
+        pontos_de_quebra (iterable, opcional): Instantes das descontinuidades.
+        metodo (str, opcional): None usa o odeint (LSODA do ODEPACK); 'BDF',
+            'Radau' ou 'LSODA' usam o solve_ivp com o método indicado.
+        jacobiano (callable, opcional): Jacobiano analítico J(Y, t, *args).
+            Sem ele, o solver aproxima o Jacobiano por diferenças finitas.
+        **opcoes_solver: Opções repassadas ao solver (ex.: ml, mu, rtol, atol).
+            Sem rtol e atol, o solve_ivp usa as mesmas tolerâncias do odeint
+            (RTOL_PADRAO e ATOL_PADRAO).
+
+    Returns:
+        tuple: (solucao, estatisticas), onde solucao tem o mesmo formato do
+        retorno do odeint e estatisticas é um dicionário com o total de
+        avaliações da função (nfe), de Jacobianos (nje), de passos e de
+        trocas entre Adams e BDF (nst e trocas_metodo, apenas no odeint) ou
+        de fatorações LU (nlu, apenas no solve_ivp) e o número de segmentos
+        integrados.
+    """
+    t_span = np.asarray(t_span, dtype=float)
+    Y0 = np.atleast_1d(np.asarray(Y0, dtype=float))
+    quebras = [tq for tq in sorted(set(pontos_de_quebra)) if t_span[0] < tq < t_span[-1]]
+    limites = [t_span[0]] + quebras + [t_span[-1]]
+
+    solucao = np.empty((len(t_span), len(Y0)))
+    solucao[0] = Y0
+    estatisticas = {'nfe': 0, 'nje': 0, 'segmentos': 0}
+    if metodo is None:
+        estatisticas.update(nst=0, trocas_metodo=0)
+    else:
+        estatisticas['nlu'] = 0
+        opcoes_solver.setdefault('rtol', RTOL_PADRAO)
+        opcoes_solver.setdefault('atol', ATOL_PADRAO)
+
+    Y_atual = Y0
+    for t_inicio, t_fim in zip(limites[:-1], limites[1:]):
+        mascara = (t_span > t_inicio) & (t_span <= t_fim)
+        t_segmento = np.concatenate(([t_inicio], t_span[mascara]))
+        if t_segmento[-1] < t_fim:
+            t_segmento = np.append(t_segmento, t_fim)
+
+        # O segmento termina um ulp antes da quebra, para que o perfil nunca seja
+        # avaliado do lado de lá do degrau
+        if t_fim in quebras:
+            t_segmento[-1] = np.nextafter(t_fim, t_inicio)
+
+        if metodo is None:
+            # tcrit impede o odeint de ultrapassar o fim do segmento
+            solucao_segmento, info = odeint(funcao_edo, Y_atual, t_segmento, args=args, Dfun=jacobiano,
+                                            tcrit=[t_segmento[-1]], full_output=True, **opcoes_solver)
+            estatisticas['nfe'] += int(info['nfe'][-1])
+            estatisticas['nje'] += int(info['nje'][-1])
+            estatisticas['nst'] += int(info['nst'][-1])
+            estatisticas['trocas_metodo'] += int(np.count_nonzero(np.diff(info['mused'])))
+        else:
+            # O solve_ivp espera f(t, Y) e J(t, Y): adaptamos a ordem dos argumentos
+            if jacobiano is not None:
+                opcoes_solver['jac'] = lambda t, Y: jacobiano(Y, t, *args)
+            resultado = solve_ivp(lambda t, Y: funcao_edo(Y, t, *args),
+                                  (t_segmento[0], t_segmento[-1]), Y_atual, method=metodo,
+                                  t_eval=t_segmento, **opcoes_solver)
+            if not resultado.success:
+                raise RuntimeError(f"Falha do solver {metodo} em t = {t_inicio:.2f} min: {resultado.message}")
+            solucao_segmento = resultado.y.T
+            estatisticas['nfe'] += int(resultado.nfev)
+            estatisticas['nje'] += int(resultado.njev)
+            estatisticas['nlu'] += int(resultado.nlu)
+
+        solucao[mascara] = solucao_segmento[1:1 + np.count_nonzero(mascara)]
+        Y_atual = solucao_segmento[-1]
+        estatisticas['segmentos'] += 1
+
+    return solucao, estatisticas
+
+def montar_parametros(**alteracoes):
+    """
+    Empacota os parâmetros globais do reator no ParametrosReator esperado por
+    reactor_odes, substituindo os valores informados por nome (ex.: k0=1e13,
+    Cp_J_kg_C=400.0). Nomes desconhecidos geram ValueError.
+    """
+    return ParametrosReator(
+        AT, Ao, Cd, g, rho, Cp_J_kg_C, k0, Ea_R, delta_H_reacao,
+        Q_entrada_max, Q_aquecedor_max, Q_resfriador_max, Kp_nivel, Kp_temp,
+        setpoint_nivel_profile, setpoint_temperatura_profile,
+        Q_entrada_disturbance_profile, T_entrada_disturbance_profile, CA_entrada_disturbance_profile,
+    ).substituir(**alteracoes)
+
+# --- Simulação sem Impressão nem Gráficos ---
+def executar_simulacao(params=None, Y0=(0.5, 25.0, 0.0), tempo_max=150, n_pontos=500, metodo=None,
+                       relatorio=None):
+    """
+    Integra as EDOs do reator e calcula os sinais derivados, sem imprimir
+    nada nem gerar gráficos (pode ser usada em lote, em nós de cálculo).
+
+    Args:
+        params (ParametrosReator, opcional): Parâmetros de reactor_odes. Padrão: montar_parametros().
+        Y0 (array_like, opcional): Condições iniciais (h0, T0, CA0).
+        tempo_max (float, opcional): Tempo máximo de simulação (min).
+        n_pontos (int, opcional): Número de pontos de tempo da solução.
+        metodo (str, opcional): None usa o odeint; 'BDF', 'Radau' ou 'LSODA'
+            usam o solve_ivp. Em ambos os casos o solver recebe o Jacobiano
+            analítico (reactor_jacobiano).
+        relatorio (RelatorioSimulacao, opcional): Se informado, recebe as
+            estatísticas do solver, as chamadas efetivas de reactor_odes e os
+            tempos das fases 'integrar' e 'derivar'.
+
+    Returns:
+        tuple: (t_span, solucao, sinais, estatisticas).
+    """
+    if params is None:
+        params = montar_parametros()
+    Y0 = np.asarray(Y0, dtype=float)
+    t_span = np.linspace(0, tempo_max, n_pontos)
+    funcao_edo = reactor_odes
+    if relatorio is None:
+        relatorio = RelatorioSimulacao('executar_simulacao') # Só cronometra; é descartado
+    else:
+        funcao_edo = relatorio.contar_chamadas(reactor_odes)
+
+    # Integra cada trecho suave separadamente, reiniciando o solver nos degraus dos perfis
+    with relatorio.fase('integrar'):
+        pontos_de_quebra = obter_pontos_de_quebra(*params.perfis())
+        solucao, estatisticas = integrar_por_segmentos(funcao_edo, Y0, t_span, args=(params,),
+                                                       pontos_de_quebra=pontos_de_quebra,
+                                                       metodo=metodo, jacobiano=reactor_jacobiano)
+    relatorio.registrar_estatisticas(estatisticas)
+
+    with relatorio.fase('derivar'):
+        # Garantir que altura e concentração não sejam negativas
+        solucao[:, [0, 2]] = np.maximum(solucao[:, [0, 2]], 0.0)
+
+        # As mesmas fórmulas de reactor_odes, aplicadas de uma vez a toda a trajetória
+        sinais = calcular_sinais_reator(solucao[:, 0], solucao[:, 1], solucao[:, 2], t_span, params)
+    return t_span, solucao, sinais, estatisticas
+
+def montar_dataframe(t_span, solucao, sinais):
+    """Organiza a solução e os sinais derivados em um DataFrame (para fácil análise e plotagem)."""
+    return pd.DataFrame({
+        'Tempo (min)': t_span,
+        'Altura (m)': solucao[:, 0],
+        'Temperatura (°C)': solucao[:, 1],
+        'Concentração (mol/L)': solucao[:, 2],
+        'Setpoint Nível (m)': sinais['setpoint_nivel'],
+        'Setpoint Temperatura (°C)': sinais['setpoint_temperatura'],
+        'Vazão de Entrada Controlada (m³/min)': sinais['Q_entrada'],
+        'Potência Aquecedor Controlada (J/min)': sinais['Q_aquecedor'],
+        'Vazão de Entrada Base (Distúrbio) (m³/min)': sinais['Q_entrada_base'],
+        'Temperatura de Entrada (Distúrbio) (°C)': sinais['T_entrada'],
+        'Vazão de Saída (m³/min)': sinais['Q_saida'],
+        'Constante de Velocidade (1/min)': sinais['k_arrhenius'],
+        'Taxa de Reação (mol/L.min)': sinais['r_A'],
+        'Calor de Reação (J/min)': sinais['Q_reacao']
+    })
+
+def reduzir_serie_min_max(x, y, n_baldes):
+    """
+    Reduz uma série longa para o desenho preservando a forma: divide os
+    pontos em n_baldes grupos consecutivos (tipicamente um por pixel da
+    largura do gráfico) e mantém apenas o mínimo e o máximo de cada grupo,
+    na ordem em que ocorrem. Picos e vales aparecem exatamente como na
+    série completa. Séries curtas são devolvidas sem alteração.
+
+    Returns:
+        tuple: (x_reduzido, y_reduzido), com no máximo 2 * n_baldes pontos.
+    """
+    x = np.asarray(x)
+    y = np.asarray(y)
+    if len(y) <= 2 * n_baldes:
+        return x, y
+
+    # Grupos de tamanho igual (visão do array, sem cópia) e um último grupo com o resto
+    tamanho = -(-len(y) // n_baldes)
+    n_grupos = len(y) // tamanho
+    grupos = y[:n_grupos * tamanho].reshape(n_grupos, tamanho)
+    indices = np.column_stack((grupos.argmin(axis=1), grupos.argmax(axis=1)))
+    indices += np.arange(n_grupos)[:, None] * tamanho
+    resto = y[n_grupos * tamanho:]
+    if len(resto):
+        inicio_resto = n_grupos * tamanho
+        indices = np.vstack((indices, [inicio_resto + resto.argmin(), inicio_resto + resto.argmax()]))
+    indices = np.sort(indices, axis=1).ravel()
+    return x[indices], y[indices]
+
+def plotar_resultados(df_simulacao, nome_arquivo=None, pontos_por_serie=None):
+    """
+    Gera os gráficos de desempenho do reator. Se nome_arquivo for informado,
+    salva a figura nesse arquivo em vez de exibi-la.
+
+    Cada série é reduzida por reduzir_serie_min_max antes do desenho e
+    traçada com Axes.plot (Line2D do matplotlib), de modo que trajetórias
+    com milhões de pontos são desenhadas rapidamente e com os mesmos picos.
+    pontos_por_serie define o número de grupos (padrão: um por pixel da
+    largura da figura).
+    """
+    sns.set_style("whitegrid")
+    fig, (eixo_nivel, eixo_temp, eixo_conc) = plt.subplots(3, 1, figsize=(14, 12)) # Figura maior para múltiplos gráficos
+    if pontos_por_serie is None:
+        pontos_por_serie = int(fig.get_figwidth() * fig.dpi)
+    tempo = np.asarray(df_simulacao['Tempo (min)'])
+
+    def tracar(eixo, coluna, **estilo):
+        eixo.plot(*reduzir_serie_min_max(tempo, df_simulacao[coluna], pontos_por_serie), **estilo)
+
+    # Gráfico 1: Altura do Nível
+    tracar(eixo_nivel, 'Altura (m)', label='Altura Real', color='blue', linewidth=2)
+    tracar(eixo_nivel, 'Setpoint Nível (m)', label='Setpoint Nível', color='red', linestyle='--', linewidth=1.5)
+    eixo_nivel.set_ylabel('Altura (m)')
+    eixo_nivel.set_title('Desempenho do Reator Químico')
+    eixo_nivel.legend(loc='upper right')
+    eixo_nivel.grid(True)
+
+    # Gráfico 2: Temperatura
+    tracar(eixo_temp, 'Temperatura (°C)', label='Temperatura Real', color='green', linewidth=2)
+    tracar(eixo_temp, 'Setpoint Temperatura (°C)', label='Setpoint Temperatura', color='purple', linestyle='--', linewidth=1.5)
+    tracar(eixo_temp, 'Temperatura de Entrada (Distúrbio) (°C)', label='Temp. Entrada (Distúrbio)', color='orange', linestyle=':', linewidth=1)
+    eixo_temp.set_ylabel('Temperatura (°C)')
+    eixo_temp.legend(loc='upper right')
+    eixo_temp.grid(True)
+
+    # Gráfico 3: Concentração e Vazão de Entrada
+    tracar(eixo_conc, 'Concentração (mol/L)', label='Concentração de A', color='brown', linewidth=2)
+
+    # Segundo eixo Y para Vazão de Entrada
+    eixo_vazao = eixo_conc.twinx()
+    tracar(eixo_vazao, 'Vazão de Entrada Controlada (m³/min)', label='Vazão Entrada Controlada', color='cyan', linestyle='-', linewidth=1.5)
+    tracar(eixo_vazao, 'Vazão de Entrada Base (Distúrbio) (m³/min)', label='Vazão Entrada Base (Distúrbio)', color='darkblue', linestyle=':', linewidth=1)
+
+    eixo_vazao.set_ylabel('Vazão (m³/min)', color='cyan')
+    eixo_vazao.tick_params(axis='y', labelcolor='cyan')
+    eixo_conc.set_xlabel('Tempo (min)')
+    eixo_conc.set_ylabel('Concentração (mol/L)', color='brown')
+    eixo_conc.tick_params(axis='y', labelcolor='brown')
+    eixo_vazao.legend(loc='upper left')
+    eixo_conc.legend(loc='upper right')
+    eixo_conc.grid(True)
+
+    plt.tight_layout() # Ajusta o layout para evitar sobreposição
+    if nome_arquivo:
+        plt.savefig(nome_arquivo, dpi=100)
+        plt.close()
+    else:
+        plt.show()
+
+# --- Identidade do Modelo (chaves de cache e checkpoints) ---
+# Funções e classes cujo código-fonte define o modelo: qualquer alteração nelas invalida o cache.
+FUNCOES_DO_MODELO = ('PerfilPorPartes', 'calcular_sinais_reator', 'calcular_entradas', 'reactor_odes',
+                     'reactor_jacobiano', 'obter_pontos_de_quebra', 'integrar_por_segmentos', 'executar_simulacao')
+
+@functools.lru_cache(maxsize=None)
+def assinatura_modelo():
+    """Resumo (SHA-256) do código-fonte de FUNCOES_DO_MODELO e do módulo modelo_reator."""
+    codigo = inspect.getsource(modelo_reator)
+    codigo += ''.join(inspect.getsource(globals()[nome]) for nome in FUNCOES_DO_MODELO)
+    return hashlib.sha256(codigo.encode('utf-8')).hexdigest()
+
+def descrever_parametros(params):
+    """
+    Descreve params em uma lista serializável em JSON (valores numéricos e
+    tabelas dos perfis), usada nas chaves de cache e nos checkpoints.
+    """
+    descricao = []
+    for valor in params:
+        if isinstance(valor, PerfilPorPartes):
+            descricao.append([valor.instantes.tolist(), valor.valores.tolist(), valor.rampas.tolist()])
+        elif callable(valor):
+            descricao.append(inspect.getsource(valor)) # Perfil escrito como função Python
+        else:
+            descricao.append(float(valor))
+    return descricao
@@ -0,0 +1,153 @@
+"""
+Sintonia dos ganhos dos controladores do reator da Tarefa 4: varredura
+paralela de Kp_nivel x Kp_temp com cache em disco (um .npz por ponto, com o
+nome da chave do cenário) e busca do grosso para o fino.
+"""
+import hashlib # Chaves do cache de resultados
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+from scipy.integrate import trapezoid
+import pandas as pd
+from lote_reator import executar_cenario, montar_parametros_cenario
+from simulacao_reator import assinatura_modelo, descrever_parametros
+
+# --- Sintonia dos Ganhos dos Controladores com Cache em Disco ---
+def chave_cenario(cenario):
+    """
+    Calcula a chave de cache de um cenário: um hash dos valores efetivos dos
+    parâmetros (incluindo os padrões globais), das tabelas dos perfis, das
+    condições iniciais, do horizonte, do método e do código-fonte do modelo.
+    """
+    descricao = descrever_parametros(montar_parametros_cenario(cenario))
+    descricao += [list(map(float, cenario.get('condicoes_iniciais', (0.5, 25.0, 0.0)))),
+                  float(cenario.get('tempo_max', 150)), int(cenario.get('n_pontos', 500)),
+                  cenario.get('metodo'), assinatura_modelo()]
+    return hashlib.sha256(json.dumps(descricao).encode('utf-8')).hexdigest()[:32]
+
+def calcular_metricas_desempenho(resultado):
+    """
+    Calcula as métricas de desempenho dos controladores a partir das colunas
+    de um resultado (.npz de executar_cenario): a integral do erro absoluto
+    (IAE) e o sobressinal máximo acima do setpoint, para nível e temperatura.
+    """
+    tempo = resultado['tempo']
+    erro_nivel = resultado['h'] - resultado['setpoint_nivel']
+    erro_temp = resultado['T'] - resultado['setpoint_temperatura']
+    return {
+        'IAE Nível (m.min)': trapezoid(np.abs(erro_nivel), tempo),
+        'IAE Temperatura (°C.min)': trapezoid(np.abs(erro_temp), tempo),
+        'Sobressinal Nível (m)': max(float(erro_nivel.max()), 0.0),
+        'Sobressinal Temperatura (°C)': max(float(erro_temp.max()), 0.0),
+    }
+
+def cenario_com_ganhos(cenario_base, Kp_nivel, Kp_temp):
+    """Cria uma cópia do cenário com os ganhos informados; o nome é a chave de cache."""
+    cenario = dict(cenario_base)
+    cenario['parametros'] = dict(cenario_base.get('parametros', {}), Kp_nivel=float(Kp_nivel), Kp_temp=float(Kp_temp))
+    cenario['nome'] = chave_cenario(cenario)
+    return cenario
+
+def varrer_ganhos(valores_Kp_nivel, valores_Kp_temp, cenario_base=None, pasta_cache='cache_reator', processos=None):
+    """
+    Avalia em paralelo a grade de ganhos (Kp_nivel x Kp_temp). Cada simulação
+    concluída fica gravada em pasta_cache com o nome da sua chave; ao repetir
+    uma varredura, só os pontos ainda não simulados são calculados. Como em
+    executar_lote, um ponto com erro não interrompe a varredura: ele é
+    informado e fica de fora do resultado (e será tentado de novo na próxima).
+
+    Returns:
+        pd.DataFrame: Uma linha por par de ganhos simulado com sucesso, com as
+        métricas de calcular_metricas_desempenho e se o resultado veio do cache.
+    """
+    cenario_base = cenario_base or {}
+    os.makedirs(pasta_cache, exist_ok=True)
+    cenarios = {}
+    for Kp_n in valores_Kp_nivel:
+        for Kp_t in valores_Kp_temp:
+            cenario = cenario_com_ganhos(cenario_base, Kp_n, Kp_t)
+            cenarios[(float(Kp_n), float(Kp_t))] = cenario
+
+    caminhos = {ganhos: os.path.join(pasta_cache, f"{cenario['nome']}.npz") for ganhos, cenario in cenarios.items()}
+    pendentes = {cenario['nome']: cenario for ganhos, cenario in cenarios.items() if not os.path.exists(caminhos[ganhos])}
+    print(f"Varredura de ganhos: {len(cenarios)} pontos, {len(cenarios) - len(pendentes)} no cache, "
+          f"{len(pendentes)} a simular.")
+
+    if pendentes:
+        with ProcessPoolExecutor(max_workers=processos) as executor:
+            futuros = {executor.submit(executar_cenario, cenario, pasta_cache): cenario['parametros']
+                       for cenario in pendentes.values()}
+            for futuro in as_completed(futuros): # Os resultados ficam gravados no cache
+                try:
+                    futuro.result()
+                except Exception as e: # Um ponto com erro não interrompe a varredura
+                    ganhos = futuros[futuro]
+                    print(f"Erro no ponto Kp_nivel = {ganhos['Kp_nivel']:.4g}, Kp_temp = {ganhos['Kp_temp']:.4g}: {e}")
+
+    linhas = []
+    for (Kp_n, Kp_t), caminho in caminhos.items():
+        if not os.path.exists(caminho):
+            continue
+        with np.load(caminho) as resultado:
+            metricas = calcular_metricas_desempenho(resultado)
+        linhas.append({'Kp_nivel': Kp_n, 'Kp_temp': Kp_t, **metricas,
+                       'Do Cache': cenarios[(Kp_n, Kp_t)]['nome'] not in pendentes})
+    return pd.DataFrame(linhas)
+
+def selecionar_ganhos(df_varredura, sobressinal_max_nivel=None, sobressinal_max_temp=None):
+    """
+    Escolhe o melhor par de ganhos entre os que respeitam os limites de
+    sobressinal, minimizando a soma dos IAEs de nível e de temperatura, cada
+    um normalizado pelo seu menor valor na varredura (ou pelo maior, se o
+    menor for zero).
+    """
+    if df_varredura.empty:
+        return None
+    candidatos = df_varredura
+    if sobressinal_max_nivel is not None:
+        candidatos = candidatos[candidatos['Sobressinal Nível (m)'] <= sobressinal_max_nivel]
+    if sobressinal_max_temp is not None:
+        candidatos = candidatos[candidatos['Sobressinal Temperatura (°C)'] <= sobressinal_max_temp]
+    if candidatos.empty:
+        return None
+    custo = 0.0
+    for coluna in ('IAE Nível (m.min)', 'IAE Temperatura (°C.min)'):
+        escala = df_varredura[coluna].min()
+        if not escala > 0: # IAE nulo: a divisão pelo mínimo não teria escala
+            escala = df_varredura[coluna].max() or 1.0
+        custo = custo + candidatos[coluna] / escala
+    return candidatos.loc[custo.idxmin()]
+
+def refinar_ganhos(faixa_Kp_nivel=(0.05, 5.0), faixa_Kp_temp=(10.0, 10000.0), n_pontos=5, n_niveis=3,
+                   cenario_base=None, pasta_cache='cache_reator', processos=None, **limites):
+    """
+    Busca de ganhos do grosso para o fino: a cada nível, varre uma grade
+    logarítmica de n_pontos x n_pontos e estreita as faixas em torno do melhor
+    par (entre os pontos vizinhos da grade). Os limites de sobressinal são
+    repassados a selecionar_ganhos.
+
+    Returns:
+        tuple: (melhor, df_todos), com a melhor linha e todas as avaliações.
+    """
+    faixa_n = np.log10(faixa_Kp_nivel)
+    faixa_t = np.log10(faixa_Kp_temp)
+    avaliacoes = []
+    melhor = None
+    for nivel in range(n_niveis):
+        grade_n = np.logspace(faixa_n[0], faixa_n[1], n_pontos)
+        grade_t = np.logspace(faixa_t[0], faixa_t[1], n_pontos)
+        df_nivel = varrer_ganhos(grade_n, grade_t, cenario_base, pasta_cache, processos)
+        avaliacoes.append(df_nivel)
+        melhor = selecionar_ganhos(pd.concat(avaliacoes, ignore_index=True), **limites)
+        if melhor is None:
+            print("Nenhum par de ganhos respeita os limites de sobressinal.")
+            break
+        print(f"Nível {nivel + 1}: Kp_nivel = {melhor['Kp_nivel']:.4g}, Kp_temp = {melhor['Kp_temp']:.4g}")
+
+        # Nova faixa: um passo da grade (em escala log) para cada lado do melhor ponto
+        passo_n = (faixa_n[1] - faixa_n[0]) / (n_pontos - 1)
+        passo_t = (faixa_t[1] - faixa_t[0]) / (n_pontos - 1)
+        faixa_n = np.log10(melhor['Kp_nivel']) + np.array([-passo_n, passo_n])
+        faixa_t = np.log10(melhor['Kp_temp']) + np.array([-passo_t, passo_t])
+    return melhor, pd.concat(avaliacoes, ignore_index=True)
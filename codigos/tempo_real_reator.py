@@ -0,0 +1,137 @@
+"""
+Reator da Tarefa 4 com estado próprio, avançado passo a passo para
+simulação em tempo real (hardware-in-the-loop), e a medição da latência de
+cada passo.
+"""
+import bisect
+import time
+import numpy as np
+from scipy.integrate import LSODA
+from simulacao_reator import (ATOL_PADRAO, Kp_nivel, Kp_temp, Q_entrada_disturbance_profile, RTOL_PADRAO,
+                              calcular_sinais_reator, montar_parametros, obter_pontos_de_quebra,
+                              reactor_jacobiano, reactor_odes, setpoint_nivel_profile,
+                              setpoint_temperatura_profile)
+
+# --- Reator com Estado para Simulação em Tempo Real (Hardware-in-the-Loop) ---
+class Reator:
+    """
+    Reator com estado próprio, avançado passo a passo (ex.: a cada ciclo de
+    um CLP ou emulador), sem reiniciar a integração a partir de t = 0.
+
+    O solver (LSODA, o mesmo do odeint) é mantido entre as chamadas de
+    avancar(): o tamanho de passo e o histórico são reaproveitados, e um
+    passo do solver que cobre vários ciclos é apenas interpolado. Ele só é
+    reiniciado nos pontos de quebra dos perfis e quando as entradas
+    externas mudam (descontinuidades).
+
+    Ações externas passadas a avancar() ('Q_entrada', 'Q_aquecedor') e
+    distúrbios ('T_entrada', 'CA_entrada') substituem os controladores P e
+    os perfis internos e ficam retidas (segurador de ordem zero) até a
+    próxima alteração ou até liberar_entradas(). Com controle_interno=False,
+    as duas ações devem ser fornecidas pelo controlador externo.
+    """
+
+    def __init__(self, params=None, Y0=(0.5, 25.0, 0.0), t0=0.0, controle_interno=True):
+        self.params = montar_parametros() if params is None else params
+        self.estado = np.array(Y0, dtype=float)
+        self.t = float(t0)
+        self.controle_interno = controle_interno
+        self.entradas = {}
+        self.pontos_de_quebra = obter_pontos_de_quebra(*self.params.perfis())
+        self._solver = None
+
+    def _iniciar_solver(self, t0, Y0):
+        """Cria o solver a partir de (t0, Y0), limitado ao próximo ponto de quebra."""
+        indice = bisect.bisect_right(self.pontos_de_quebra, t0)
+        self._quebra = self.pontos_de_quebra[indice] if indice < len(self.pontos_de_quebra) else np.inf
+        # Como em integrar_por_segmentos: o trecho termina um ulp antes da quebra
+        t_limite = np.nextafter(self._quebra, t0) if np.isfinite(self._quebra) else np.inf
+        args = (self.params, dict(self.entradas))
+        self._solver = LSODA(lambda t, Y: reactor_odes(Y, t, *args), t0, Y0, t_limite,
+                             jac=lambda t, Y: reactor_jacobiano(Y, t, *args), rtol=RTOL_PADRAO, atol=ATOL_PADRAO)
+
+    def avancar(self, dt, entradas=None):
+        """
+        Avança o reator de t até t + dt (min) e retorna o novo estado (h, T, CA).
+
+        Args:
+            dt (float): Passo de tempo (min). Um ciclo de 100 ms é 0.1 / 60 min.
+            entradas (dict, opcional): Novos valores externos (ver a classe).
+        """
+        if entradas and any(self.entradas.get(nome) != valor for nome, valor in entradas.items()):
+            self.entradas.update(entradas)
+            self._solver = None # Degrau nas entradas: o solver recomeça do estado atual
+        if not self.controle_interno and not {'Q_entrada', 'Q_aquecedor'} <= self.entradas.keys():
+            raise ValueError("Sem controle interno, 'Q_entrada' e 'Q_aquecedor' devem ser fornecidas.")
+        if self._solver is None:
+            self._iniciar_solver(self.t, self.estado)
+
+        t_final = self.t + dt
+        solver = self._solver
+        while solver.t < t_final:
+            if solver.status == 'finished':
+                # Chegou ao ponto de quebra: o solver recomeça do outro lado do degrau
+                self._iniciar_solver(self._quebra, solver.y)
+                solver = self._solver
+                continue
+            mensagem = solver.step()
+            if solver.status == 'failed':
+                raise RuntimeError(f"Falha do solver em t = {solver.t:.4f} min: {mensagem}")
+
+        # O último passo do solver pode ir além de t + dt: o estado é interpolado
+        self.estado = solver.y.copy() if solver.t == t_final else solver.dense_output()(t_final)
+        self.estado[[0, 2]] = np.maximum(self.estado[[0, 2]], 0.0) # Altura e concentração não negativas
+        self.t = t_final
+        return self.estado.copy()
+
+    def liberar_entradas(self, *nomes):
+        """
+        Remove as entradas externas indicadas (todas, sem argumentos): os
+        controladores P e os perfis internos voltam a valer no próximo passo.
+        """
+        removidas = [nome for nome in (nomes or list(self.entradas)) if nome in self.entradas]
+        for nome in removidas:
+            del self.entradas[nome]
+        if removidas:
+            self._solver = None # As entradas mudaram: o solver recomeça do estado atual
+
+    def sinais(self):
+        """Retorna as ações de controle e os sinais derivados no estado atual."""
+        h, T, CA = self.estado
+        return calcular_sinais_reator(h, T, CA, self.t, self.params, self.entradas)
+
+def medir_latencia_passos(n_passos=5000, dt=0.1 / 60, orcamento_ms=100.0, controle_externo=False):
+    """
+    Mede a latência de Reator.avancar() em um laço de tempo real simulado e
+    compara os percentis p50/p99 com o orçamento de tempo de cada ciclo.
+
+    Args:
+        n_passos (int, opcional): Número de ciclos medidos.
+        dt (float, opcional): Passo de tempo do modelo (min). Padrão: 100 ms.
+        orcamento_ms (float, opcional): Tempo máximo de cálculo por ciclo (ms).
+        controle_externo (bool, opcional): Se True, um controlador P externo
+            (como o de um CLP) calcula as ações a cada ciclo.
+
+    Returns:
+        dict: Latências p50, p99 e máxima (ms) e a fração de ciclos acima do orçamento.
+    """
+    print("--- Latência do Passo em Tempo Real ---")
+    reator = Reator(controle_interno=not controle_externo)
+    latencias = np.empty(n_passos)
+    for i in range(n_passos):
+        entradas = None
+        if controle_externo:
+            h, T, _ = reator.estado
+            entradas = {'Q_entrada': Q_entrada_disturbance_profile(reator.t) + Kp_nivel * (setpoint_nivel_profile(reator.t) - h),
+                        'Q_aquecedor': Kp_temp * (setpoint_temperatura_profile(reator.t) - T)}
+        inicio = time.perf_counter()
+        reator.avancar(dt, entradas)
+        latencias[i] = (time.perf_counter() - inicio) * 1000
+
+    relatorio = {'p50 (ms)': np.percentile(latencias, 50), 'p99 (ms)': np.percentile(latencias, 99),
+                 'máxima (ms)': latencias.max(), 'acima do orçamento': np.mean(latencias > orcamento_ms)}
+    print(f"Ciclos: {n_passos} de {dt * 60 * 1000:.0f} ms (tempo de modelo: {reator.t:.2f} min)")
+    print(f"Latência p50: {relatorio['p50 (ms)']:.3f} ms | p99: {relatorio['p99 (ms)']:.3f} ms | "
+          f"máxima: {relatorio['máxima (ms)']:.3f} ms")
+    print(f"Orçamento de {orcamento_ms:.1f} ms excedido em {relatorio['acima do orçamento']:.2%} dos ciclos.")
+    return relatorio
@@ -0,0 +1,32 @@
+"""
+Configuração comum dos testes: os códigos ficam em codigos/ (fora de um
+pacote) e os gráficos são gerados sem janela (backend Agg).
+"""
+import importlib.util
+import os
+import sys
+
+import matplotlib
+import pytest
+
+matplotlib.use('Agg')
+
+PASTA_CODIGOS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'codigos')
+sys.path.insert(0, PASTA_CODIGOS)
+
+@pytest.fixture(scope='session')
+def carregar_codigo():
+    """
+    Importa um código numerado da pasta codigos/ (ex.: '14_codigo_analise_vazao'),
+    cujo nome começa com dígito e não pode ser usado em um import.
+    """
+    carregados = {}
+
+    def carregar(nome):
+        if nome not in carregados:
+            especificacao = importlib.util.spec_from_file_location(nome, os.path.join(PASTA_CODIGOS, f"{nome}.py"))
+            modulo = importlib.util.module_from_spec(especificacao)
+            especificacao.loader.exec_module(modulo)
+            carregados[nome] = modulo
+        return carregados[nome]
+    return carregar
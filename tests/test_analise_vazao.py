@@ -0,0 +1,92 @@
+"""Leitura vetorizada do CSV de vazão (14_codigo_analise_vazao) em casos de borda."""
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+CABECALHO = b'timestamp,vazao\n'
+
+@pytest.fixture(scope='module')
+def analise_vazao(carregar_codigo):
+    return carregar_codigo('14_codigo_analise_vazao')
+
+def gerar_linhas(n, semente=0):
+    """Linhas 'AAAA-MM-DD HH:MM:SS,vazao' com vazões de formatos variados."""
+    rng = np.random.default_rng(semente)
+    inicio = datetime(2023, 12, 31, 22, 0, 0)
+    formatos = ['{:.2f}', '{:.6g}', '{:e}', '{:.0f}', '{:.3f}']
+    linhas = []
+    for i in range(n):
+        vazao = formatos[i % len(formatos)].format(rng.uniform(-5.0, 500.0))
+        linhas.append(f"{inicio + timedelta(seconds=37 * i):%Y-%m-%d %H:%M:%S},{vazao}".encode())
+    return linhas
+
+def referencia(linhas):
+    """Leitura linha a linha com datetime.strptime e float, para comparação."""
+    campos = [linha.decode().split(',') for linha in linhas if linha.strip()]
+    timestamps = np.array([datetime.strptime(c[0], '%Y-%m-%d %H:%M:%S') for c in campos], dtype='datetime64[s]')
+    return timestamps, np.array([float(c[1]) for c in campos])
+
+def escrever(caminho, conteudo):
+    caminho.write_bytes(conteudo)
+    return str(caminho)
+
+@pytest.mark.parametrize('tamanho_bloco', [1, 7, 31, 64, 1000, 2**23])
+def test_blocos_de_qualquer_tamanho_dao_o_mesmo_resultado(analise_vazao, tmp_path, tamanho_bloco):
+    linhas = gerar_linhas(200)
+    arquivo = escrever(tmp_path / 'vazao.csv', CABECALHO + b'\n'.join(linhas) + b'\n')
+    timestamps, vazoes = analise_vazao.ler_dados_vazao(arquivo, tamanho_bloco=tamanho_bloco)
+    timestamps_esperados, vazoes_esperadas = referencia(linhas)
+    np.testing.assert_array_equal(timestamps, timestamps_esperados)
+    np.testing.assert_array_equal(vazoes, vazoes_esperadas)
+    assert timestamps.dtype == np.dtype('datetime64[s]') and vazoes.dtype == np.float64
+
+@pytest.mark.parametrize('conteudo', [b'', CABECALHO, CABECALHO + b'\n\n', CABECALHO + b'\r\n\r\n'])
+def test_arquivo_sem_dados_retorna_arrays_vazios(analise_vazao, tmp_path, conteudo):
+    timestamps, vazoes = analise_vazao.ler_dados_vazao(escrever(tmp_path / 'vazao.csv', conteudo))
+    assert len(timestamps) == len(vazoes) == 0
+    assert timestamps.dtype == np.dtype('datetime64[s]') and vazoes.dtype == np.float64
+
+@pytest.mark.parametrize('tamanho_bloco', [5, 2**23])
+def test_linhas_em_branco_crlf_colunas_extras_e_ultima_linha_sem_quebra(analise_vazao, tmp_path, tamanho_bloco):
+    conteudo = (CABECALHO + b'2024-02-29 23:59:59,1.5\r\n\n'
+                b'2024-03-01 00:00:00,  -2e3 ,extra,colunas\n\r\n'
+                b'2024-03-01 00:00:01,7')
+    timestamps, vazoes = analise_vazao.ler_dados_vazao(escrever(tmp_path / 'vazao.csv', conteudo), tamanho_bloco)
+    np.testing.assert_array_equal(timestamps, np.array(['2024-02-29T23:59:59', '2024-03-01T00:00:00',
+                                                        '2024-03-01T00:00:01'], dtype='datetime64[s]'))
+    np.testing.assert_array_equal(vazoes, [1.5, -2000.0, 7.0])
+
+def test_bloco_sem_linhas(analise_vazao):
+    timestamps, vazoes = analise_vazao.interpretar_bloco_vazao(b'\n\r\n\n')
+    assert len(timestamps) == len(vazoes) == 0
+
+@pytest.mark.parametrize('linha_invalida, motivo', [
+    (b'2024-01-01 10:00:00', 'linha incompleta'),
+    (b'2024-01-01 10:00,3.0', 'linha incompleta'),
+    (b'2024/01/01 10:00:00,3.0', 'timestamp fora do formato'),
+    (b'2024-01-01T10:00:00,3.0', 'timestamp fora do formato'),
+    (b'2024-0a-01 10:00:00,3.0', 'timestamp fora do formato'),
+    (b'2023-02-29 10:00:00,3.0', 'data ou hora inexistente'),
+    (b'2024-13-01 10:00:00,3.0', 'data ou hora inexistente'),
+    (b'2024-01-01 24:00:00,3.0', 'data ou hora inexistente'),
+    (b'2024-01-01 10:00:00,abc', "vazão inválida: 'abc'"),
+    (b'2024-01-01 10:00:00,1.2.3', "vazão inválida: '1.2.3'"),
+    (b'2024-01-01 10:00:00,', 'linha incompleta'),
+    (b'   ', 'linha incompleta'),
+    (b'2024-01-01 10:00:00,' + b'1' * 40, 'campo de vazão muito longo'),
+])
+@pytest.mark.parametrize('tamanho_bloco', [16, 2**23])
+def test_linha_invalida_informa_numero_da_linha(analise_vazao, tmp_path, capsys, linha_invalida, motivo,
+                                                 tamanho_bloco):
+    linhas = gerar_linhas(40)
+    linhas.insert(30, b'')
+    linhas.insert(35, linha_invalida) # Linha 37 do arquivo: cabeçalho + 35 linhas antes dela
+    arquivo = escrever(tmp_path / 'vazao.csv', CABECALHO + b'\n'.join(linhas) + b'\n')
+    assert analise_vazao.ler_dados_vazao(arquivo, tamanho_bloco) == (None, None)
+    mensagem = capsys.readouterr().out
+    assert 'linha 37:' in mensagem and motivo in mensagem
+
+def test_arquivo_inexistente(analise_vazao, tmp_path, capsys):
+    assert analise_vazao.ler_dados_vazao(str(tmp_path / 'nao_existe.csv')) == (None, None)
+    assert 'Arquivo não encontrado' in capsys.readouterr().out
@@ -0,0 +1,25 @@
+"""Suíte de benchmarks (benchmarks_simulacao): métodos medidos e comparação com o histórico."""
+import pytest
+
+import benchmarks_simulacao
+
+@pytest.mark.parametrize('nome, usa_solver', [('descarga_tanque', True), ('descarga_tanque_analitico', False),
+                                              ('cstr', True), ('cstr_analitico', False)])
+def test_benchmarks_dos_codigos_29_e_30_medem_o_metodo_do_nome(tmp_path, nome, usa_solver):
+    preparar, _, tamanhos = benchmarks_simulacao.BENCHMARKS[nome]
+    with benchmarks_simulacao.modo_silencioso():
+        relatorio = preparar(tamanhos[0], str(tmp_path))()
+    assert (relatorio.solver.get('nfe', 0) > 0) == usa_solver
+
+@pytest.mark.parametrize('commit, modificado, rotulo', [('abc1234', False, 'abc1234 de'),
+                                                        ('abc1234', True, 'abc1234 (modificado) de'),
+                                                        (None, None, 'commit desconhecido de')])
+def test_comparacao_com_referencia(capsys, commit, modificado, rotulo):
+    referencia = {'commit': commit, 'modificado': modificado, 'data': '2024-01-01T00:00:00',
+                  'resultados': {'a[n=1]': {'minimo': 2.0}}}
+    execucao = {'commit': 'def5678', 'modificado': False,
+                'resultados': {'a[n=1]': {'minimo': 1.0}, 'b[n=1]': {'minimo': 1.0}}}
+    benchmarks_simulacao.comparar_execucoes(execucao, referencia)
+    saida = capsys.readouterr().out
+    assert f"Comparação com {rotulo} 2024-01-01" in saida
+    assert '2.00x mais rápido' in saida and 'novo' in saida
@@ -0,0 +1,51 @@
+"""Controle amostrado (controle_amostrado): PI com segurador de ordem zero e RK4 de passo fixo."""
+import numpy as np
+import pytest
+
+from controle_amostrado import comparar_controle_amostrado, controle_pi_amostrado, simular_controle_amostrado
+from modelo_reator import OPERACOES_ESCALARES
+from simulacao_reator import executar_simulacao
+
+def test_p_amostrado_acompanha_o_p_continuo():
+    resultado = comparar_controle_amostrado(tempo_max=150, periodo_amostragem=1 / 60)
+    np.testing.assert_array_less(resultado['diferenca_P'], [1e-3, 1e-4, 1e-3])
+
+def test_diferenca_para_o_continuo_cai_com_o_periodo():
+    # Segurador de ordem zero: diferença proporcional ao período de amostragem
+    _, solucao, _, _ = executar_simulacao(tempo_max=60, n_pontos=61)
+    diferencas = []
+    for periodo in (1 / 6, 1 / 60):
+        _, estados, _ = simular_controle_amostrado(tempo_max=60, periodo_amostragem=periodo,
+                                                   decimacao=int(round(1 / periodo)))
+        diferencas.append(np.abs(estados[0] - solucao).max(axis=0))
+    assert np.all(diferencas[1] < diferencas[0] / 5)
+
+@pytest.mark.parametrize('opcoes', [{}, {'Ki_nivel': 0.05, 'Ki_temp': 50.0, 'subpassos': 3, 'decimacao': 7},
+                                    {'Ki_temp': np.linspace(0.0, 10.0, 4), 'Y0': (0.2, 30.0, 0.1),
+                                     'tamanho_bloco': 333}])
+def test_nucleo_compilado_igual_ao_laco_em_python(opcoes):
+    # Sem o numba, compilado=True roda o mesmo núcleo em Python
+    esperado = simular_controle_amostrado(tempo_max=30, compilado=False, **opcoes)
+    obtido = simular_controle_amostrado(tempo_max=30, compilado=True, **opcoes)
+    for a, b in zip(esperado, obtido):
+        np.testing.assert_allclose(b, a, rtol=1e-12, atol=1e-12)
+
+@pytest.mark.parametrize('compilado', [False, True])
+def test_lote_igual_aos_cenarios_individuais(compilado):
+    Ki_temp = np.array([0.0, 5.0, 20.0])
+    _, estados, acoes = simular_controle_amostrado(tempo_max=20, Ki_temp=Ki_temp, compilado=compilado)
+    for i, ganho in enumerate(Ki_temp):
+        _, estados_i, acoes_i = simular_controle_amostrado(tempo_max=20, Ki_temp=ganho, compilado=compilado)
+        np.testing.assert_allclose(estados[i], estados_i[0], rtol=1e-12, atol=1e-12)
+        np.testing.assert_allclose(acoes[i], acoes_i[0], rtol=1e-12, atol=1e-12)
+
+@pytest.mark.parametrize('xp', [np, OPERACOES_ESCALARES])
+def test_anti_windup_do_pi(xp):
+    # Saturado no máximo com erro positivo: a integral para; com erro negativo, volta a integrar
+    acao, integral = controle_pi_amostrado(0.0, 10.0, 1.0, 2.0, 5.0, 0.1, -1.0, 1.0, xp)
+    assert (float(acao), float(integral)) == (1.0, 5.0)
+    acao, integral = controle_pi_amostrado(0.0, 10.0, 1.0, -0.05, 5.0, 0.1, -1.0, 1.0, xp)
+    assert float(acao) == 1.0 and float(integral) == pytest.approx(5.0 - 0.005)
+    # Dentro dos limites: ação PI sem saturação
+    acao, integral = controle_pi_amostrado(0.2, 0.5, 0.1, 0.4, 1.0, 0.1, -1.0, 1.0, xp)
+    assert (float(acao), float(integral)) == (pytest.approx(0.5), pytest.approx(1.04))
@@ -0,0 +1,57 @@
+"""Ensemble vetorizado (ensemble_reator) contra simulações individuais (simulacao_reator)."""
+import numpy as np
+import pytest
+
+from ensemble_reator import PARAMETROS_ENSEMBLE, reactor_odes_ensemble, simular_ensemble_reator
+from simulacao_reator import executar_simulacao, montar_parametros, reactor_odes
+
+PADRAO = {'k0': 1.0e10, 'Ea_R': 8000.0, 'delta_H_reacao': -50000.0, 'Cd': 0.6, 'h0': 0.5, 'T0': 25.0, 'CA0': 0.0}
+
+def linha_ensemble(**alteracoes):
+    """Uma linha da matriz de parâmetros do ensemble, com os valores padrão do reator."""
+    valores = {**PADRAO, **alteracoes}
+    return [valores[nome] for nome in PARAMETROS_ENSEMBLE]
+
+def simulacao_individual(linha, tempo_max, n_pontos):
+    valores = dict(zip(PARAMETROS_ENSEMBLE, linha))
+    params = montar_parametros(k0=valores['k0'], Ea_R=valores['Ea_R'],
+                               delta_H_reacao=valores['delta_H_reacao'], Cd=valores['Cd'])
+    Y0 = (valores['h0'], valores['T0'], valores['CA0'])
+    _, solucao, _, _ = executar_simulacao(params, Y0, tempo_max, n_pontos)
+    return solucao
+
+def test_edos_do_ensemble_iguais_as_do_reator_individual():
+    linhas = np.array([linha_ensemble(), linha_ensemble(k0=2.0e10, Cd=0.5), linha_ensemble(delta_H_reacao=-70000.0)])
+    estados = np.array([[0.5, 25.0, 0.0], [1.2, 48.0, 0.3], [2.0, 61.0, 0.05]])
+    k0, Ea_R, delta_H, Cd = linhas[:, :4].T
+    params = montar_parametros(k0=k0, Ea_R=Ea_R, delta_H_reacao=delta_H, Cd=Cd)
+    for t in (0.0, 35.0, 120.0):
+        derivadas = reactor_odes_ensemble(estados.ravel(), t, params).reshape(-1, 3)
+        for linha, estado, derivada in zip(linhas, estados, derivadas):
+            valores = dict(zip(PARAMETROS_ENSEMBLE, linha))
+            individual = montar_parametros(k0=valores['k0'], Ea_R=valores['Ea_R'],
+                                           delta_H_reacao=valores['delta_H_reacao'], Cd=valores['Cd'])
+            np.testing.assert_allclose(derivada, reactor_odes(estado, t, individual), rtol=1e-12, atol=1e-14)
+
+def test_ensemble_de_um_reator_reproduz_simulacao_individual():
+    tempo_max, n_pontos = 150, 151
+    t_span = np.linspace(0, tempo_max, n_pontos)
+    trajetorias, _ = simular_ensemble_reator([linha_ensemble()], t_span)
+    np.testing.assert_allclose(trajetorias[0], simulacao_individual(linha_ensemble(), tempo_max, n_pontos),
+                               rtol=1e-10, atol=1e-10)
+
+def test_ensemble_perturbado_reproduz_cada_reator():
+    tempo_max, n_pontos = 150, 151
+    t_span = np.linspace(0, tempo_max, n_pontos)
+    linhas = [linha_ensemble(), linha_ensemble(k0=3.0e10, T0=30.0), linha_ensemble(Cd=0.45, h0=1.0),
+              linha_ensemble(Ea_R=7800.0, delta_H_reacao=-65000.0, CA0=0.2)]
+    trajetorias, bandas = simular_ensemble_reator(linhas, t_span)
+    assert trajetorias.shape == (len(linhas), n_pontos, 3)
+    for linha, trajetoria in zip(linhas, trajetorias):
+        np.testing.assert_allclose(trajetoria, simulacao_individual(linha, tempo_max, n_pontos),
+                                   rtol=1e-6, atol=1e-6)
+    np.testing.assert_array_equal(bandas[50], np.percentile(trajetorias, 50, axis=0))
+
+def test_ensemble_rejeita_matriz_com_colunas_erradas():
+    with pytest.raises(ValueError):
+        simular_ensemble_reator(np.ones((2, len(PARAMETROS_ENSEMBLE) - 1)), np.linspace(0, 1, 3))
@@ -0,0 +1,60 @@
+"""Estados estacionários (estado_estacionario_reator): Newton e continuação com pontos de virada."""
+import numpy as np
+import pytest
+
+from estado_estacionario_reator import (continuar_estado_estacionario, modelo_estacionario,
+                                        resolver_estado_estacionario)
+from simulacao_reator import montar_parametros
+
+# Cenário bem exotérmico, sem controle de temperatura e com k na temperatura do reator: curva em S em k0
+EXOTERMICO = {'Kp_temp': 0.0, 'Cp_J_kg_C': 41.86, 'delta_H_reacao': -5.0e6}
+
+@pytest.fixture(scope='module')
+def curva_em_s():
+    return continuar_estado_estacionario('k0', 1.0e6, 1.0e14, params=montar_parametros(**EXOTERMICO),
+                                         cinetica_no_reator=True)
+
+def test_curva_em_s_tem_ignicao_e_extincao(curva_em_s):
+    df_ramo, pontos_de_virada = curva_em_s
+    assert len(pontos_de_virada) == 2
+    ignicao, extincao = (df_ramo['k0'].iloc[i] for i in pontos_de_virada)
+    assert ignicao == pytest.approx(1.82e10, rel=0.02)
+    assert extincao == pytest.approx(2.72e9, rel=0.02)
+
+    # Ramo inferior (frio) e superior (ignição) estáveis; ramo intermediário instável
+    i, j = pontos_de_virada
+    assert df_ramo['Estável'].iloc[:i + 1].all()
+    assert not df_ramo['Estável'].iloc[i + 1:j + 1].any()
+    assert df_ramo['Estável'].iloc[j + 2:].all()
+    assert df_ramo['T (°C)'].is_monotonic_increasing # O ramo é percorrido do frio para o quente
+
+def test_ramo_satisfaz_as_edos(curva_em_s):
+    df_ramo, _ = curva_em_s
+    odes, _ = modelo_estacionario(cinetica_no_reator=True)
+    for _, linha in df_ramo.iloc[::10].iterrows():
+        params = montar_parametros(**EXOTERMICO, k0=linha['k0'])
+        residuo = odes(linha[['h (m)', 'T (°C)', 'CA (mol/L)']].to_numpy(dtype=float), 0.0, params)
+        assert np.linalg.norm(residuo) < 1e-8
+
+def test_tres_estados_estacionarios_entre_os_pontos_de_virada():
+    params = montar_parametros(**EXOTERMICO, k0=1.0e10)
+    temperaturas = [resolver_estado_estacionario(params, (0.1, T0, CA0), cinetica_no_reator=True)[1]
+                    for T0, CA0 in ((26.0, 1.0), (60.0, 0.7), (140.0, 0.05))]
+    assert temperaturas[0] < 35.0 < temperaturas[1] < 100.0 < temperaturas[2]
+
+def test_jacobiano_com_cinetica_no_reator():
+    params = montar_parametros(**EXOTERMICO, k0=1.0e10)
+    odes, jacobiano = modelo_estacionario(cinetica_no_reator=True)
+    Y = np.array([0.3, 80.0, 0.5])
+    J_numerico = np.empty((3, 3))
+    for j in range(3):
+        passo = 1e-6 * max(abs(Y[j]), 1.0)
+        dY = np.zeros(3)
+        dY[j] = passo
+        J_numerico[:, j] = (np.array(odes(Y + dY, 0.0, params)) - np.array(odes(Y - dY, 0.0, params))) / (2 * passo)
+    np.testing.assert_allclose(jacobiano(Y, 0.0, params), J_numerico, rtol=1e-5, atol=1e-9)
+
+def test_cinetica_do_codigo_38_tem_ramo_unico():
+    df_ramo, pontos_de_virada = continuar_estado_estacionario('k0', 1.0e8, 1.0e14)
+    assert pontos_de_virada == []
+    assert df_ramo['Estável'].all()
@@ -0,0 +1,72 @@
+"""Gravação em fluxo com checkpoint (fluxo_reator): o reinício reproduz os mesmos bytes."""
+import json
+import os
+
+import numpy as np
+import pytest
+
+import fluxo_reator
+from fluxo_reator import gravar_simulacao_em_disco, ler_simulacao_em_disco
+
+OPCOES = {'tempo_max': 12.0, 'janela': 2.0}
+
+class Interrupcao(Exception):
+    """Simula a queda do processo durante a gravação."""
+
+def ler_arquivos(pasta):
+    return {nome: open(os.path.join(pasta, nome), 'rb').read() for nome in sorted(os.listdir(pasta))}
+
+def gravar_com_interrupcao(monkeypatch, pasta, checkpoint, n_checkpoints, **opcoes):
+    """Grava até o n-ésimo checkpoint e interrompe logo depois de salvá-lo."""
+    gravar_checkpoint = fluxo_reator.gravar_checkpoint
+    salvos = []
+
+    def gravar_e_interromper(*args):
+        gravar_checkpoint(*args)
+        salvos.append(args)
+        if len(salvos) == n_checkpoints:
+            raise Interrupcao()
+
+    with monkeypatch.context() as contexto:
+        contexto.setattr(fluxo_reator, 'gravar_checkpoint', gravar_e_interromper)
+        with pytest.raises(Interrupcao):
+            gravar_simulacao_em_disco(pasta, arquivo_checkpoint=checkpoint, **opcoes)
+
+@pytest.mark.parametrize('float32', [False, True])
+def test_reinicio_produz_os_mesmos_bytes(tmp_path, monkeypatch, float32):
+    continua = tmp_path / 'continua'
+    metadados = gravar_simulacao_em_disco(str(continua), float32=float32, **OPCOES)
+
+    interrompida, checkpoint = tmp_path / 'interrompida', str(tmp_path / 'checkpoint.npz')
+    gravar_com_interrupcao(monkeypatch, str(interrompida), checkpoint, 3, float32=float32, **OPCOES)
+    # Restos gravados depois do checkpoint também devem ser descartados no reinício
+    with open(interrompida / 'T.bin', 'ab') as arquivo:
+        arquivo.write(b'\x00' * 64)
+    assert gravar_simulacao_em_disco(str(interrompida), float32=float32, arquivo_checkpoint=checkpoint,
+                                     reiniciar=True, **OPCOES) == metadados
+
+    assert ler_arquivos(interrompida) == ler_arquivos(continua)
+    colunas = ler_simulacao_em_disco(str(interrompida))
+    assert len(colunas['tempo']) == metadados['n_linhas'] == int(round(OPCOES['tempo_max'] * 60)) + 1
+    np.testing.assert_allclose(np.diff(colunas['tempo']), 1 / 60)
+
+def test_reinicio_sem_metadados_restaura_as_colunas(tmp_path, monkeypatch):
+    continua = tmp_path / 'continua'
+    metadados = gravar_simulacao_em_disco(str(continua), **OPCOES)
+
+    # Interrompida depois do último checkpoint, antes de gravar metadados.json
+    interrompida, checkpoint = tmp_path / 'interrompida', str(tmp_path / 'checkpoint.npz')
+    gravar_com_interrupcao(monkeypatch, str(interrompida), checkpoint, 6, **OPCOES)
+    assert not (interrompida / 'metadados.json').exists()
+    assert gravar_simulacao_em_disco(str(interrompida), arquivo_checkpoint=checkpoint,
+                                     reiniciar=True, **OPCOES) == metadados
+    assert json.loads((interrompida / 'metadados.json').read_text(encoding='utf-8'))['colunas'] == \
+        metadados['colunas']
+    assert ler_arquivos(interrompida) == ler_arquivos(continua)
+
+def test_checkpoint_de_outra_simulacao_e_rejeitado(tmp_path, monkeypatch):
+    pasta, checkpoint = str(tmp_path / 'saida'), str(tmp_path / 'checkpoint.npz')
+    gravar_com_interrupcao(monkeypatch, pasta, checkpoint, 2, **OPCOES)
+    with pytest.raises(ValueError):
+        gravar_simulacao_em_disco(pasta, arquivo_checkpoint=checkpoint, reiniciar=True,
+                                  **{**OPCOES, 'Y0': (0.6, 25.0, 0.0)})
@@ -0,0 +1,98 @@
+"""Jacobianos analíticos contra diferenças finitas centrais das EDOs."""
+import numpy as np
+import pytest
+
+from reator_tubular import ReatorTubular
+from simulacao_reator import montar_parametros, reactor_jacobiano, reactor_odes
+
+def jacobiano_diferencas_finitas(funcao, Y, passo_relativo=1e-6):
+    """J[i, j] = d funcao_i / d Y_j por diferenças centrais, com passo proporcional a |Y_j|."""
+    Y = np.asarray(Y, dtype=float)
+    J = np.empty((len(funcao(Y)), len(Y)))
+    for j in range(len(Y)):
+        passo = passo_relativo * max(abs(Y[j]), 1.0)
+        acima, abaixo = Y.copy(), Y.copy()
+        acima[j] += passo
+        abaixo[j] -= passo
+        J[:, j] = (np.asarray(funcao(acima)) - np.asarray(funcao(abaixo))) / (2 * passo)
+    return J
+
+def banda_para_densa(J_banda, ml, mu):
+    """Converte o formato de banda do odeint (J_banda[i - j + mu, j]) em matriz densa."""
+    n = J_banda.shape[1]
+    J = np.zeros((n, n))
+    for i in range(n):
+        for j in range(max(0, i - ml), min(n, i + mu + 1)):
+            J[i, j] = J_banda[i - j + mu, j]
+    return J
+
+# Estados longe das saturações das válvulas e da resistência (onde as EDOs não são deriváveis)
+ESTADOS_REATOR = [(0.5, 25.0, 0.0), (1.0, 50.0, 0.5), (1.4, 62.0, 0.2), (0.8, 38.0, 0.9)]
+
+@pytest.mark.parametrize('Y', ESTADOS_REATOR)
+@pytest.mark.parametrize('t', [0.0, 30.0, 75.0, 140.0])
+def test_jacobiano_do_reator(Y, t):
+    params = montar_parametros()
+    J = reactor_jacobiano(np.array(Y), t, params)
+    J_numerico = jacobiano_diferencas_finitas(lambda Y: reactor_odes(Y, t, params), Y)
+    np.testing.assert_allclose(J, J_numerico, rtol=1e-5, atol=1e-7)
+
+def test_jacobiano_do_reator_em_cenario_rigido():
+    params = montar_parametros(k0=1.0e15, Cp_J_kg_C=41.86)
+    Y = np.array([1.0, 45.0, 0.3])
+    J = reactor_jacobiano(Y, 40.0, params)
+    J_numerico = jacobiano_diferencas_finitas(lambda Y: reactor_odes(Y, 40.0, params), Y)
+    np.testing.assert_allclose(J, J_numerico, rtol=1e-5, atol=1e-7 * np.abs(J).max())
+
+@pytest.mark.parametrize('U_parede', [0.0, 5.0e5])
+def test_jacobiano_em_banda_do_reator_tubular(U_parede):
+    pfr = ReatorTubular(n_celulas=12, U_parede=U_parede)
+    rng = np.random.default_rng(1)
+    Y = np.empty(2 * pfr.n_celulas)
+    Y[0::2] = rng.uniform(60.0, 90.0, pfr.n_celulas)
+    Y[1::2] = rng.uniform(0.1, 1.0, pfr.n_celulas)
+    J = banda_para_densa(pfr.jacobiano_banda(Y, 0.0), pfr.ml, pfr.mu)
+    J_numerico = jacobiano_diferencas_finitas(lambda Y: pfr.odes(Y, 0.0), Y)
+    np.testing.assert_allclose(J, J_numerico, rtol=1e-5, atol=1e-7 * np.abs(J).max())
+
+def test_odes_do_reator_tubular_iguais_por_celula_e_vetorizadas():
+    pfr = ReatorTubular(n_celulas=25, U_parede=5.0e5)
+    rng = np.random.default_rng(2)
+    Y = np.empty(2 * pfr.n_celulas)
+    Y[0::2] = rng.uniform(25.0, 95.0, pfr.n_celulas)
+    Y[1::2] = rng.uniform(0.0, 1.0, pfr.n_celulas)
+    np.testing.assert_allclose(pfr.odes(Y, 0.0), pfr.odes_por_celula(Y, 0.0), rtol=1e-12, atol=1e-12)
+
+def test_jacobiano_da_rede_de_reacoes(carregar_codigo):
+    codigo_30 = carregar_codigo('30_codigo_simulacao_reator_cstr_com_reacao')
+    rede = codigo_30.gerar_rede_aleatoria(20, semente=3)
+    C = np.random.default_rng(3).uniform(0.05, 1.0, rede.n_especies)
+    J = rede.jacobiano(0.0, C).toarray()
+    J_numerico = jacobiano_diferencas_finitas(lambda C: rede.odes(0.0, C), C)
+    np.testing.assert_allclose(J, J_numerico, rtol=1e-5, atol=1e-7 * np.abs(J).max())
+
+def test_jacobiano_da_rede_com_concentracao_negativa(carregar_codigo):
+    # Com C < 0 (oscilação numérica do solver) o fator max(C, 0) ** a é constante: derivada nula
+    codigo_30 = carregar_codigo('30_codigo_simulacao_reator_cstr_com_reacao')
+    rede = codigo_30.gerar_rede_aleatoria(20, semente=4)
+    C = np.random.default_rng(4).uniform(0.05, 1.0, rede.n_especies)
+    C[::3] = -0.01
+    J = rede.jacobiano(0.0, C).toarray()
+    J_numerico = jacobiano_diferencas_finitas(lambda C: rede.odes(0.0, C), C)
+    np.testing.assert_allclose(J, J_numerico, rtol=1e-5, atol=1e-7 * np.abs(J).max())
+
+def test_rede_com_ordem_fracionaria(carregar_codigo):
+    codigo_30 = carregar_codigo('30_codigo_simulacao_reator_cstr_com_reacao')
+    reacoes = [{'reagentes': {'A': 1}, 'produtos': {'B': 1}, 'k': 2.0, 'ordens': {'A': 0.5}},
+               {'reagentes': {'A': 1, 'B': 1}, 'produtos': {'C': 1}, 'k': 0.7, 'ordens': {'A': 1.5, 'B': 0.3}}]
+    rede = codigo_30.RedeReacoesCSTR.de_reacoes(['A', 'B', 'C'], reacoes, V=10.0, Q=1.0, C_entrada={'A': 1.0})
+
+    C = np.array([0.4, 0.2, 0.1])
+    J_numerico = jacobiano_diferencas_finitas(lambda C: rede.odes(0.0, C), C)
+    np.testing.assert_allclose(rede.jacobiano(0.0, C).toarray(), J_numerico, rtol=1e-5, atol=1e-9)
+
+    # Em C = 0 a derivada de C ** 0.5 é infinita: o Jacobiano analítico a zera e continua finito
+    assert np.all(np.isfinite(rede.jacobiano(0.0, np.zeros(3)).toarray()))
+    _, C_analitico, _ = rede.simular(tempo_max=20)
+    _, C_numerico, _ = rede.simular(tempo_max=20, jacobiano_analitico=False)
+    np.testing.assert_allclose(C_analitico, C_numerico, rtol=1e-4, atol=1e-6)
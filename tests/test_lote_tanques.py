@@ -0,0 +1,78 @@
+"""Lote de tanques (simular_lote_tanques, código 33) contra um solve_ivp com eventos por tanque."""
+import numpy as np
+import pytest
+from scipy.integrate import solve_ivp
+
+G, TOLERANCIA_REGIME, ALTURA_MAXIMA, TEMPO_MAX = 9.81, 1e-4, 2.5, 3000.0
+
+@pytest.fixture(scope='module')
+def codigo_33(carregar_codigo):
+    return carregar_codigo('33_codigo_estudo_tanque_entrada_e_saida')
+
+@pytest.fixture(scope='module')
+def lote_aleatorio():
+    """Tanques com parâmetros, altura inicial e programação de entrada (três degraus) sorteados."""
+    rng = np.random.default_rng(7)
+    n = 10
+    instantes = np.column_stack((np.zeros(n), np.sort(rng.uniform(10.0, 400.0, (n, 2)), axis=1)))
+    return {'A_T': rng.uniform(3.0, 7.0, n), 'A_o': rng.uniform(0.01, 0.04, n), 'C_d': rng.uniform(0.6, 0.7, n),
+            'h0': rng.uniform(0.2, 1.0, n), 'instantes': instantes, 'vazoes': rng.uniform(0.02, 0.15, (n, 3))}
+
+def referencia_um_tanque(codigo_33, A_T, A_o, C_d, h0, instantes, vazoes, t):
+    """
+    Integra um tanque com solve_ivp, reiniciando nas suas próprias mudanças de
+    vazão, e localiza o transbordamento e o regime com os eventos do código 33.
+    """
+    limites = np.concatenate(([t[0]], instantes[(instantes > t[0]) & (instantes < t[-1])], [t[-1]]))
+    alturas = np.empty_like(t)
+    tempo_transbordamento, tempo_regime = np.nan, np.nan
+    h_atual = h0
+    for i, (t_inicio, t_fim) in enumerate(zip(limites[:-1], limites[1:])):
+        argumentos = (A_T, A_o, C_d, G, vazoes[np.searchsorted(instantes, t_inicio, side='right') - 1])
+        eventos = [codigo_33.evento_nivel(ALTURA_MAXIMA, direcao=1)]
+        ultimo_trecho = i == len(limites) - 2
+        if ultimo_trecho:
+            eventos.append(codigo_33.evento_regime(codigo_33.dHdt_lote, argumentos, TOLERANCIA_REGIME))
+            if abs(codigo_33.dHdt_lote(h_atual, t_inicio, *argumentos)) < TOLERANCIA_REGIME:
+                tempo_regime = t_inicio
+        resultado = solve_ivp(lambda t_atual, y: codigo_33.dHdt_lote(y, t_atual, *argumentos), (t_inicio, t_fim),
+                              [h_atual], method='LSODA', events=eventos, dense_output=True, rtol=1e-12, atol=1e-13)
+        mascara = (t >= t_inicio) & (t <= t_fim)
+        alturas[mascara] = resultado.sol(t[mascara])[0]
+        if np.isnan(tempo_transbordamento) and len(resultado.t_events[0]):
+            tempo_transbordamento = resultado.t_events[0][0]
+        if ultimo_trecho and len(resultado.t_events[1]):
+            tempo_regime = resultado.t_events[1][-1]
+        h_atual = resultado.y[0, -1]
+    if abs(codigo_33.dHdt_lote(h_atual, t[-1], *argumentos)) >= TOLERANCIA_REGIME:
+        tempo_regime = np.nan # Ainda em transiente no fim da simulação
+    return alturas, tempo_transbordamento, tempo_regime
+
+def test_lote_igual_aos_tanques_individuais(codigo_33, lote_aleatorio):
+    p = lote_aleatorio
+    t = np.linspace(0.0, TEMPO_MAX, 301)
+    alturas, metricas = codigo_33.simular_lote_tanques(p['A_T'], p['A_o'], p['C_d'], p['h0'], p['instantes'],
+                                                       p['vazoes'], t, altura_maxima=ALTURA_MAXIMA,
+                                                       tolerancia_regime=TOLERANCIA_REGIME, rtol=1e-12, atol=1e-13)
+    transbordaram, em_regime = 0, 0
+    for i in range(len(p['A_T'])):
+        alturas_i, transbordamento_i, regime_i = referencia_um_tanque(
+            codigo_33, p['A_T'][i], p['A_o'][i], p['C_d'][i], p['h0'][i], p['instantes'][i], p['vazoes'][i], t)
+        np.testing.assert_allclose(alturas[i], alturas_i, rtol=1e-8)
+        np.testing.assert_allclose(metricas['tempo_transbordamento'][i], transbordamento_i, rtol=0, atol=1e-6)
+        np.testing.assert_allclose(metricas['tempo_regime'][i], regime_i, rtol=0, atol=1e-6)
+        transbordaram += not np.isnan(transbordamento_i)
+        em_regime += not np.isnan(regime_i)
+    # O sorteio cobre os dois casos de cada métrica
+    assert 0 < transbordaram < len(p['A_T']) and 0 < em_regime < len(p['A_T'])
+
+def test_programacao_comum_igual_a_programacao_por_tanque(codigo_33, lote_aleatorio):
+    p = lote_aleatorio
+    t = np.linspace(0.0, 500.0, 51)
+    comum = codigo_33.simular_lote_tanques(p['A_T'], p['A_o'], p['C_d'], p['h0'], [0.0, 50.0], [0.1, 0.05], t)
+    repetida = codigo_33.simular_lote_tanques(p['A_T'], p['A_o'], p['C_d'], p['h0'],
+                                              np.tile([0.0, 50.0], (len(p['A_T']), 1)),
+                                              np.tile([0.1, 0.05], (len(p['A_T']), 1)), t)
+    np.testing.assert_array_equal(comum[0], repetida[0])
+    for nome in comum[1]:
+        np.testing.assert_array_equal(comum[1][nome], repetida[1][nome])
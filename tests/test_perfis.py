@@ -0,0 +1,44 @@
+"""Perfis tabelados por partes (PerfilPorPartes): avaliação escalar e vetorizada."""
+import numpy as np
+import pytest
+
+from simulacao_reator import PerfilPorPartes
+
+@pytest.fixture
+def perfil():
+    # Degrau em 10 min, rampa de 5 min a partir de 20 min e degrau em 40 min
+    return PerfilPorPartes([0.0, 10.0, 20.0, 40.0], [1.0, 2.0, 4.0, 3.0], rampas=[0.0, 0.0, 5.0, 0.0])
+
+@pytest.mark.parametrize('t, esperado', [(-1.0, 1.0), (0.0, 1.0), (9.999, 1.0), (10.0, 2.0), (20.0, 2.0),
+                                         (21.0, 2.4), (22.5, 3.0), (25.0, 4.0), (39.0, 4.0), (40.0, 3.0),
+                                         (1e6, 3.0)])
+def test_valores_nos_degraus_e_rampas(perfil, t, esperado):
+    assert perfil(t) == pytest.approx(esperado)
+    assert perfil(np.array([t]))[0] == pytest.approx(esperado)
+
+@pytest.mark.parametrize('tipo', [int, float, np.float32, np.float64, np.int64, np.array])
+def test_qualquer_escalar_usa_o_caminho_escalar(perfil, tipo):
+    for t in (0, 12, 21, 22, 30, 41):
+        valor = perfil(tipo(t))
+        assert isinstance(valor, float)
+        assert valor == pytest.approx(perfil(float(t)))
+
+def test_rampa_com_tempo_float32():
+    assert PerfilPorPartes([0, 10], [1.0, 2.0], rampas=[0, 5])(np.float32(12.0)) == pytest.approx(1.4)
+
+def test_avaliacao_vetorizada_igual_a_escalar(perfil):
+    t = np.linspace(-5.0, 50.0, 1101)
+    np.testing.assert_allclose(perfil(t), [perfil(float(ti)) for ti in t], rtol=1e-15, atol=0.0)
+    assert perfil(t.reshape(-1, 3)).shape == (367, 3)
+
+def test_pontos_de_quebra(perfil):
+    assert perfil.pontos_de_quebra == (10.0, 20.0, 25.0, 40.0)
+    assert PerfilPorPartes.constante(7.0).pontos_de_quebra == ()
+
+@pytest.mark.parametrize('instantes, valores, rampas', [([], [], None), ([0.0, 1.0], [1.0], None),
+                                                        ([0.0, 0.0], [1.0, 2.0], None),
+                                                        ([0.0, 1.0], [1.0, 2.0], [2.0, 0.0]),
+                                                        ([0.0, 1.0], [1.0, 2.0], [0.0, -1.0])])
+def test_tabelas_invalidas(instantes, valores, rampas):
+    with pytest.raises(ValueError):
+        PerfilPorPartes(instantes, valores, rampas)
@@ -0,0 +1,52 @@
+"""Propagador exato por exponencial de matriz (PropagadorLinear, código 30) contra a solução analítica."""
+import numpy as np
+import pytest
+from scipy.integrate import solve_ivp
+
+V, Q, K = 10.0, 2.0, 0.15 # CSTR com reação de primeira ordem: a = Q/V + k
+
+@pytest.fixture(scope='module')
+def codigo_30(carregar_codigo):
+    return carregar_codigo('30_codigo_simulacao_reator_cstr_com_reacao')
+
+def propagar_um_tanque(codigo_30, passo, n_passos, instantes, valores, CA0=0.3, tamanho_bloco=None):
+    A, B = codigo_30.cstr_linear_em_serie(1, V, Q, K)
+    propagador = codigo_30.PropagadorLinear(A, B, passo, tamanho_bloco)
+    return propagador.propagar([CA0], n_passos, instantes, valores)
+
+def test_um_tanque_com_entradas_na_malha(codigo_30):
+    instantes, valores = (0.0, 5.0, 12.5), (1.0, 0.4, 2.0)
+    t, X = propagar_um_tanque(codigo_30, 0.5, 60, instantes, valores)
+    esperado = codigo_30.concentracao_cstr_analitica(t, 0.3, V, Q, K, instantes, valores)
+    np.testing.assert_allclose(X[:, 0], esperado, rtol=1e-12, atol=1e-14)
+
+@pytest.mark.parametrize('instantes, valores', [
+    ((0.0, 3.3), (1.0, 0.0)),                              # Uma mudança no meio de um passo
+    ((0.0, 3.1, 3.35, 3.45, 7.0), (1.0, 2.0, 0.5, 1.5, 0.2)), # Três mudanças no mesmo passo
+    ((0.0, 2.0, 2.05, 9.999999), (0.5, 1.0, 3.0, 0.0)),     # Mudança na malha seguida de outra no passo
+    ((0.0, 4.0 + 1e-12, 6.0 - 1e-12), (1.0, 2.0, 0.7)),     # Mudanças a um arredondamento da malha
+    ((0.0, 29.7, 45.0), (1.0, 0.25, 9.0)),                  # Última mudança depois do horizonte
+])
+@pytest.mark.parametrize('tamanho_bloco', [3, None])
+def test_um_tanque_com_entradas_fora_da_malha(codigo_30, instantes, valores, tamanho_bloco):
+    t, X = propagar_um_tanque(codigo_30, 0.25, 120, instantes, valores, tamanho_bloco=tamanho_bloco)
+    esperado = codigo_30.concentracao_cstr_analitica(t, 0.3, V, Q, K, instantes, valores)
+    np.testing.assert_allclose(X[:, 0], esperado, rtol=1e-11, atol=1e-13)
+
+def test_tanques_em_serie_contra_integracao_numerica(codigo_30):
+    A, B = codigo_30.cstr_linear_em_serie(3, V, Q, K)
+    instantes, valores = (0.0, 1.3, 4.71), (1.0, 0.2, 1.7)
+    t, X = codigo_30.PropagadorLinear(A, B, 0.1, tamanho_bloco=16).propagar(np.zeros(3), 100, instantes, valores)
+
+    def entrada(t):
+        return valores[np.searchsorted(instantes, t, side='right') - 1]
+
+    limites = list(instantes) + [t[-1]]
+    x, solucao = np.zeros(3), []
+    for t_inicio, t_fim in zip(limites[:-1], limites[1:]):
+        pontos = t[(t >= t_inicio) & (t < t_fim)] if t_fim < t[-1] else t[t >= t_inicio]
+        resultado = solve_ivp(lambda t, x, u=entrada(t_inicio): A @ x + B[:, 0] * u, (t_inicio, t_fim), x,
+                              method='DOP853', t_eval=pontos, rtol=1e-12, atol=1e-14, dense_output=True)
+        solucao.append(resultado.y.T)
+        x = resultado.sol(t_fim)
+    np.testing.assert_allclose(X, np.vstack(solucao), rtol=1e-9, atol=1e-12)
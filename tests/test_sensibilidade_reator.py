@@ -0,0 +1,49 @@
+"""Sensibilidades diretas e gradiente adjunto (sensibilidade_reator) contra diferenças finitas."""
+import numpy as np
+import pytest
+
+import sensibilidade_reator
+from sensibilidade_reator import gradiente_adjunto, simular_sensibilidades
+from estado_estacionario_reator import substituir_parametro
+from simulacao_reator import montar_parametros
+
+@pytest.fixture(scope='module')
+def adjunto():
+    return gradiente_adjunto(('Kp_temp', 'Kp_nivel', 'k0'), montar_parametros())
+
+def test_adjunto_igual_a_diferenca_central_em_Kp_temp(adjunto):
+    _, gradiente = adjunto
+    params = montar_parametros()
+    passo = 1e-3 * params.Kp_temp
+    G_mais, _ = gradiente_adjunto((), substituir_parametro(params, 'Kp_temp', params.Kp_temp + passo))
+    G_menos, _ = gradiente_adjunto((), substituir_parametro(params, 'Kp_temp', params.Kp_temp - passo))
+    assert gradiente['Kp_temp'] == pytest.approx((G_mais - G_menos) / (2 * passo), rel=4e-3)
+
+def test_adjunto_igual_as_sensibilidades_diretas(adjunto):
+    # dG/dp = ∫ 2·(T - T_setpoint)·dT/dp dt, com dT/dp da integração direta do sistema aumentado
+    G, gradiente = adjunto
+    params = montar_parametros()
+    nomes = tuple(gradiente)
+    t, solucao, sensibilidades = simular_sensibilidades(nomes, params, n_pontos=15001)
+    erro = solucao[:, 1] - params.setpoint_temperatura_func(t)
+    assert G == pytest.approx(np.trapezoid(erro**2, t), rel=1e-4)
+    for j, nome in enumerate(nomes):
+        assert gradiente[nome] == pytest.approx(np.trapezoid(2 * erro * sensibilidades[:, 1, j], t), rel=1e-4)
+
+def test_sensibilidades_sem_parametros():
+    t, solucao, sensibilidades = simular_sensibilidades((), n_pontos=51)
+    assert solucao.shape == (51, 3) and sensibilidades.shape == (51, 3, 0)
+
+@pytest.mark.parametrize('passo', ['direto', 'reverso'])
+def test_falha_do_solver_e_informada(monkeypatch, passo):
+    solve_ivp = sensibilidade_reator.solve_ivp
+
+    def solve_ivp_com_falha(funcao, intervalo, *args, **kwargs):
+        resultado = solve_ivp(funcao, intervalo, *args, **kwargs)
+        if (intervalo[1] > intervalo[0]) == (passo == 'direto'): # Passo direto: tempo crescente
+            resultado.success, resultado.message = False, 'falha simulada'
+        return resultado
+
+    monkeypatch.setattr(sensibilidade_reator, 'solve_ivp', solve_ivp_com_falha)
+    with pytest.raises(RuntimeError, match=f'passo {passo}.*falha simulada'):
+        gradiente_adjunto(('Kp_temp',), tempo_max=30)
@@ -0,0 +1,80 @@
+"""Soluções exatas da descarga do tanque (código 29) e do CSTR linear (código 30) contra as numéricas."""
+import re
+
+import numpy as np
+import pytest
+from scipy.integrate import solve_ivp
+
+@pytest.fixture(scope='module')
+def codigo_29(carregar_codigo):
+    return carregar_codigo('29_codigo_simulacao_descarga_tanque')
+
+@pytest.fixture(scope='module')
+def codigo_30(carregar_codigo):
+    return carregar_codigo('30_codigo_simulacao_reator_cstr_com_reacao')
+
+def desvios_impressos(saida, unidade):
+    """Números da linha 'Desvio máximo ...' impressa pela verificação."""
+    linha = next(linha for linha in saida.splitlines() if linha.startswith('Desvio máximo'))
+    return [float(valor) for valor in re.findall(rf"([0-9.]+e[+-][0-9]+) {unidade}", linha)]
+
+@pytest.mark.parametrize('metodo', ['analitico', 'numerico'])
+@pytest.mark.parametrize('tempo_max, parar_no_evento', [(200, True), (2000, True), (2000, False)])
+def test_verificacao_da_descarga(codigo_29, capsys, metodo, tempo_max, parar_no_evento):
+    codigo_29.simular_descarga_tanque(tempo_max=tempo_max, metodo=metodo, verificar=True,
+                                      parar_no_evento=parar_no_evento)
+    saida = capsys.readouterr().out
+    (desvio_altura,), (desvio_evento,) = desvios_impressos(saida, 'm'), desvios_impressos(saida, 's')
+    assert desvio_altura < 5e-12 and desvio_evento < 1e-9
+
+@pytest.mark.parametrize('metodo', ['analitico', 'numerico'])
+def test_verificacao_do_cstr(codigo_30, capsys, metodo):
+    codigo_30.simular_cstr(metodo=metodo, verificar=True)
+    (desvio,) = desvios_impressos(capsys.readouterr().out, 'mol/L')
+    assert desvio < 8e-8
+
+def test_metodo_desconhecido(codigo_29, codigo_30):
+    with pytest.raises(ValueError, match='odeint'):
+        codigo_29.simular_descarga_tanque(metodo='odeint')
+    with pytest.raises(ValueError, match='odeint'):
+        codigo_30.simular_cstr(metodo='odeint')
+
+def test_tempo_de_esvaziamento_em_grade_de_parametros(codigo_29):
+    h0, A_T, A_o, C_d, nivel = np.meshgrid([0.3, 2.0, 7.5], [0.5, 4.0], [0.005, 0.03], [0.6, 0.7], [0.01, 0.2],
+                                           indexing='ij')
+    tempos = codigo_29.tempo_esvaziamento_analitico(h0, A_T, A_o, C_d, nivel=nivel)
+    assert tempos.shape == h0.shape
+    for i in np.ndindex(h0.shape):
+        evento = codigo_29.evento_nivel(nivel[i])
+        resultado = solve_ivp(lambda t, y: -A_o[i] * C_d[i] * np.sqrt(2 * 9.81 * np.maximum(y, 0.0)) / A_T[i],
+                              (0, 2 * tempos[i]), [h0[i]], events=evento, rtol=1e-12, atol=1e-14)
+        assert resultado.t_events[0][0] == pytest.approx(tempos[i], rel=1e-8)
+
+def test_tempo_de_esvaziamento_ate_o_fundo_e_abaixo_do_nivel(codigo_29):
+    h0, A_T, A_o, C_d = np.array([0.3, 2.0, 7.5]), 4.0, np.array([[0.005], [0.03]]), 0.6
+    tempos = codigo_29.tempo_esvaziamento_analitico(h0, A_T, A_o, C_d)
+    assert tempos.shape == (2, 3)
+    # A altura exata chega a zero exatamente no tempo de esvaziamento (sqrt(h) linear em t)
+    for i, j in np.ndindex(tempos.shape):
+        antes, no_tempo = codigo_29.altura_descarga_analitica(tempos[i, j] * np.array([1 - 1e-6, 1.0]),
+                                                              h0[j], A_T, A_o[i, 0], C_d)
+        assert antes == pytest.approx(h0[j] * 1e-12, rel=1e-3) and no_tempo < 1e-24
+    # Já abaixo do nível: tempo zero
+    np.testing.assert_array_equal(codigo_29.tempo_esvaziamento_analitico(h0, A_T, A_o, C_d, nivel=8.0), 0.0)
+
+def test_cstr_analitico_em_grade_de_parametros(codigo_30):
+    V, Q, k = np.array([50.0, 100.0])[:, None, None], np.array([5.0, 10.0])[None, :, None], np.array([0.01, 0.2])
+    t = np.linspace(0.0, 60.0, 31)
+    instantes, valores = (0.0, 20.0, 33.3), (1.0, 5.0, 0.5)
+    CA = codigo_30.concentracao_cstr_analitica(t, 0.4, V, Q, k, instantes, valores)
+    assert CA.shape == (2, 2, 2, len(t))
+    for i, j, m in np.ndindex(2, 2, 2):
+        limites = list(instantes[1:]) + [t[-1]]
+        CA_atual, t_inicio, referencia = [0.4], 0.0, np.empty_like(t)
+        for valor, t_fim in zip(valores, limites):
+            mascara = (t >= t_inicio) & (t <= t_fim)
+            resultado = solve_ivp(lambda _, c: Q[0, j, 0] / V[i, 0, 0] * (valor - c) - k[m] * c, (t_inicio, t_fim),
+                                  CA_atual, dense_output=True, rtol=1e-12, atol=1e-14)
+            referencia[mascara] = resultado.sol(t[mascara])[0]
+            CA_atual, t_inicio = resultado.y[:, -1], t_fim
+        np.testing.assert_allclose(CA[i, j, m], referencia, rtol=1e-9, atol=1e-12)
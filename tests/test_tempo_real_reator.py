@@ -0,0 +1,68 @@
+"""Reator com estado (tempo_real_reator): passos contra a simulação completa e entradas externas."""
+import numpy as np
+import pytest
+
+from simulacao_reator import executar_simulacao
+from tempo_real_reator import Reator
+
+def avancar_por_minutos(reator, minutos, ciclos_por_minuto, entradas=None):
+    """Avança o reator em ciclos de 1/ciclos_por_minuto min e devolve o estado no fim de cada minuto."""
+    estados = []
+    for _ in range(minutos):
+        for _ in range(ciclos_por_minuto):
+            reator.avancar(1 / ciclos_por_minuto, entradas)
+        estados.append(reator.estado.copy())
+    return np.array(estados)
+
+@pytest.fixture(scope='module')
+def simulacao_completa():
+    _, solucao, _, _ = executar_simulacao(tempo_max=150, n_pontos=151)
+    return solucao
+
+@pytest.mark.parametrize('ciclos_por_minuto', [6, 600]) # Ciclos de 10 s e de 100 ms
+def test_passos_acompanham_a_simulacao_completa(simulacao_completa, ciclos_por_minuto):
+    reator = Reator()
+    estados = avancar_por_minutos(reator, 150, ciclos_por_minuto)
+    desvio = np.abs(estados - simulacao_completa[1:]).max(axis=0)
+    np.testing.assert_array_less(desvio, [1e-7, 2.5e-7, 1e-7]) # (m, °C, mol/L)
+    assert reator.t == pytest.approx(150.0, abs=1e-9)
+
+def test_resultado_nao_depende_do_tamanho_do_ciclo():
+    # O solver é mantido entre as chamadas: ciclos menores só interpolam mais vezes o mesmo passo
+    estados = [avancar_por_minutos(Reator(), 60, ciclos) for ciclos in (1, 6, 60)]
+    for outros in estados[1:]:
+        np.testing.assert_allclose(outros, estados[0], rtol=1e-9, atol=1e-12)
+
+def test_liberar_entradas_devolve_o_controle_aos_controladores_internos():
+    reator = Reator()
+    avancar_por_minutos(reator, 20, 6)
+    fechada = avancar_por_minutos(reator, 10, 6, {'Q_entrada': 0.0})
+    assert reator.sinais()['Q_entrada'] == 0.0
+
+    reator.liberar_entradas()
+    assert reator.entradas == {}
+    # Depois de liberar, o reator segue como um reator novo com controle interno a partir do mesmo estado
+    referencia = Reator(Y0=reator.estado, t0=reator.t)
+    np.testing.assert_allclose(avancar_por_minutos(reator, 30, 6), avancar_por_minutos(referencia, 30, 6),
+                               rtol=1e-12, atol=1e-14)
+    assert reator.sinais()['Q_entrada'] == referencia.sinais()['Q_entrada'] != 0.0
+
+    # Durante a retenção a entrada ficou fechada: o nível se afastou da simulação com controle
+    _, solucao, _, _ = executar_simulacao(tempo_max=30, n_pontos=31)
+    assert np.all(fechada[:, 0] < solucao[21:, 0] - 0.01)
+
+def test_liberar_entradas_por_nome():
+    reator = Reator()
+    reator.avancar(1.0, {'Q_aquecedor': 0.0, 'T_entrada': 40.0})
+    reator.liberar_entradas('Q_aquecedor', 'CA_entrada') # CA_entrada não estava retida
+    assert reator.entradas == {'T_entrada': 40.0}
+    assert reator.sinais()['T_entrada'] == 40.0 and reator.sinais()['Q_aquecedor'] != 0.0
+
+def test_sem_controle_interno_exige_as_duas_acoes():
+    reator = Reator(controle_interno=False)
+    with pytest.raises(ValueError, match='Q_aquecedor'):
+        reator.avancar(0.1, {'Q_entrada': 0.1})
+    reator.avancar(0.1, {'Q_aquecedor': 0.0})
+    reator.liberar_entradas('Q_entrada')
+    with pytest.raises(ValueError):
+        reator.avancar(0.1)